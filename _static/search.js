@@ -0,0 +1,48 @@
+// Client-side search over the sharded index written by PaginatedSiteBuilder.
+// Only the shard for the query's title prefix is fetched, and each shard is fetched once.
+(function () {
+    const input = document.querySelector('.movie-search input');
+    const results = document.querySelector('.movie-search-results');
+    if (!input || !results) {
+        return;
+    }
+    const shards = {};
+
+    function shardName(query) {
+        const prefixLength = parseInt(input.dataset.prefixLength, 10);
+        return query.slice(0, prefixLength).replace(/[^a-z0-9]/g, '_');
+    }
+
+    function loadShard(name) {
+        if (!shards[name]) {
+            shards[name] = fetch(`search/${name}.json`)
+                .then((response) => (response.ok ? response.json() : []))
+                .catch(() => []);
+        }
+        return shards[name];
+    }
+
+    input.addEventListener('input', () => {
+        const query = input.value.trim().toLowerCase();
+        results.innerHTML = '';
+        if (query.length < parseInt(input.dataset.prefixLength, 10)) {
+            return;
+        }
+        loadShard(shardName(query)).then((entries) => {
+            if (input.value.trim().toLowerCase() !== query) {
+                return;
+            }
+            entries
+                .filter((entry) => entry.k.startsWith(query))
+                .slice(0, 20)
+                .forEach((entry) => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.href = `${entry.u}#${entry.a}`;
+                    link.textContent = `${entry.t} (${entry.y}): ${entry.r}`;
+                    item.appendChild(link);
+                    results.appendChild(item);
+                });
+        });
+    });
+})();
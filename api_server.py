@@ -0,0 +1,393 @@
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from itertools import islice
+from urllib.parse import parse_qs, unquote, urlsplit
+from dotenv import load_dotenv
+from main import create_storage
+from movie_app import MovieApp
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    """
+    Error answered with an HTTP status and a JSON error body.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params, name, default, low=1, high=None):
+    """
+    Read an integer query parameter, clamped to [low, high].
+    """
+    try:
+        value = int(params.get(name, [default])[0])
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer")
+    value = max(low, value)
+    return min(value, high) if high else value
+
+
+class MovieApiServer:
+    """
+    Read-only JSON API over one shared storage instance, served with asyncio.
+
+    Endpoints (GET): /movies (paginated, or streamed whole with ?stream=1), /movies/<title>,
+    /search?q=, /stats, /random, /sorted. Responses carry an ETag derived from the catalog
+    generation and the storage mutation counter, so a matching If-None-Match on a valid request is
+    answered with 304 without running the query, and serialized bodies are cached until the catalog changes.
+    The ETag is shared by every endpoint, so any mutation invalidates every cached response.
+
+    Queries run synchronously on the event loop: a slow query (a full scan, a stats rebuild)
+    holds up every other connection until it returns. Only reloads run in a worker thread.
+
+    With watch_paths set, the files are polled when they change. A storage with refresh()
+    merges the changes in place; new requests wait for the merge, and streams already
+    running keep iterating the catalog they started with. Other storages are reopened, and
+    the replaced instance is closed once no request is using it.
+    """
+
+    def __init__(self, load_storage, watch_paths=(), reload_interval=1.0, per_page=100, max_per_page=1000,
+                 cache_size=1024):
+        """
+        Initialize with a callable that opens the storage, the files whose changes trigger a reload,
+        the polling interval in seconds, the page size limits and the number of cached responses.
+        """
+        self.load_storage = load_storage
+        self.watch_paths = list(watch_paths)
+        self.reload_interval = reload_interval
+        self.per_page = per_page
+        self.max_per_page = max_per_page
+        self.cache_size = cache_size
+        self.storage = load_storage()
+        self.app = MovieApp(self.storage, self.storage)
+        self.generation = 0
+        self.reloads = 0
+        self._signature = self._watch_signature()
+        self._responses = OrderedDict()
+        self._in_flight = {}  # id(storage): requests using it
+        self._retired = []  # Replaced storages, closed once no request uses them
+        self._refreshing = None  # Future done when the running refresh has finished
+        self._server = None
+        self._watcher = None
+
+    def _watch_signature(self):
+        """
+        (mtime, size) of every watched file, None for missing ones.
+        """
+        signature = []
+        for path in self.watch_paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def etag(self):
+        """
+        Validator for every cacheable response of the current catalog state.
+        """
+        version = getattr(self.storage, 'version', 0)
+        if isinstance(version, tuple):
+            version = '.'.join(map(str, version))
+        return f'"{self.generation}-{version}"'
+
+    async def reload_if_changed(self):
+        """
+        If a watched file changed, merge the changes with storage.refresh() or reopen the
+        storage, in a worker thread. Returns True if the catalog changed.
+        """
+        signature = self._watch_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        loop = asyncio.get_running_loop()
+        refresh = getattr(self.storage, 'refresh', None)
+        if refresh is not None:
+            self._refreshing = loop.create_future()
+            try:
+                changed = await loop.run_in_executor(None, refresh)
+            finally:
+                self._refreshing.set_result(None)
+                self._refreshing = None
+            if not changed:
+                return False
+        else:
+            storage = await loop.run_in_executor(None, self.load_storage)
+            self._retired.append(self.storage)
+            self.storage = storage
+            self.app = MovieApp(storage, storage)
+            self._close_retired()
+        self.generation += 1
+        self.reloads += 1
+        self._responses.clear()
+        return True
+
+    def _close_retired(self):
+        """
+        Close the replaced storages no request is using anymore.
+        """
+        for storage in [storage for storage in self._retired if not self._in_flight.get(id(storage))]:
+            self._retired.remove(storage)
+            storage.close()
+
+    async def _watch(self):
+        """
+        Poll the watched files until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                print(f"Error reloading the catalog: {e}")
+
+    async def start(self, host='127.0.0.1', port=8000):
+        """
+        Start listening (port 0 picks a free port) and watching; returns the bound port.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.watch_paths:
+            self._watcher = asyncio.create_task(self._watch())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Stop watching and listening, and close the storage.
+        """
+        if self._watcher:
+            self._watcher.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for storage in self._retired + [self.storage]:
+            storage.close()
+        self._retired = []
+
+    async def serve_forever(self, host='127.0.0.1', port=8000):
+        """
+        Serve until cancelled.
+        """
+        port = await self.start(host, port)
+        print(f"Serving the movie API on http://{host}:{port}/")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Answer requests on one keep-alive connection until the client closes it.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ')
+                except ValueError:
+                    await self._send(writer, 400, self._error_body("Malformed request line"), keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                await self._respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _error_body(message):
+        return json.dumps({'error': message}).encode('utf-8')
+
+    async def _send(self, writer, status, body, etag=None, cacheable=True, keep_alive=True):
+        """
+        Write a complete response.
+        """
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                 f"Content-Length: {len(body)}", "Connection: " + ("keep-alive" if keep_alive else "close")]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        lines.append("Cache-Control: " + ("no-cache" if cacheable else "no-store"))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def _respond(self, writer, method, target, headers, keep_alive):
+        """
+        Route one request, answering from the response cache when possible.
+        """
+        if method != 'GET':
+            await self._send(writer, 405, self._error_body("Only GET is supported"), keep_alive=keep_alive)
+            return
+        if self._refreshing is not None:
+            await asyncio.shield(self._refreshing)
+        storage, app = self.storage, self.app
+        self._in_flight[id(storage)] = self._in_flight.get(id(storage), 0) + 1
+        try:
+            await self._route(writer, app, target, headers, keep_alive)
+        finally:
+            self._in_flight[id(storage)] -= 1
+            if not self._in_flight[id(storage)]:
+                del self._in_flight[id(storage)]
+                self._close_retired()
+
+    async def _route(self, writer, app, target, headers, keep_alive):
+        """
+        Answer one GET request from app.
+        """
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        params = parse_qs(url.query)
+        etag = self.etag()
+        try:
+            if path == '/random':
+                weighted = params.get('weighted', ['0'])[0] not in ('0', 'false', '')
+                body = json.dumps(app.random_movie(weighted), default=str).encode('utf-8')
+                await self._send(writer, 200, body, cacheable=False, keep_alive=keep_alive)
+                return
+            self._check_route(app, path, params)
+            if headers.get('if-none-match') == etag:
+                await self._send(writer, 304, b'', etag=etag, keep_alive=keep_alive)
+                return
+            if path == '/movies' and params.get('stream', ['0'])[0] not in ('0', 'false', ''):
+                await self._stream_movies(writer, app, etag, keep_alive)
+                return
+            cached = self._responses.get(target)
+            if cached is not None and cached[0] == etag:
+                self._responses.move_to_end(target)
+                body = cached[1]
+            else:
+                body = json.dumps(self._query(app, path, params), default=str).encode('utf-8')
+                self._responses[target] = (etag, body)
+                if len(self._responses) > self.cache_size:
+                    self._responses.popitem(last=False)
+            await self._send(writer, 200, body, etag=etag, keep_alive=keep_alive)
+        except HttpError as e:
+            await self._send(writer, e.status, self._error_body(str(e)), keep_alive=keep_alive)
+        except Exception as e:
+            await self._send(writer, 500, self._error_body(str(e)), keep_alive=keep_alive)
+
+    def _page(self, params):
+        """
+        (page, per_page, offset) from the query parameters.
+        """
+        page = _int_param(params, 'page', 1)
+        per_page = _int_param(params, 'per_page', self.per_page, high=self.max_per_page)
+        return page, per_page, (page - 1) * per_page
+
+    def _check_route(self, app, path, params):
+        """
+        Raise the HttpError a request would fail with (unknown endpoint or movie, bad parameters),
+        so that errors are never answered with 304.
+        """
+        if path in ('/movies', '/sorted'):
+            self._page(params)
+        elif path.startswith('/movies/'):
+            if app.get_movie(unquote(path[len('/movies/'):])) is None:
+                raise HttpError(404, "Movie not found")
+        elif path == '/search':
+            if not params.get('q', [''])[0].strip():
+                raise HttpError(400, "q is required")
+            _int_param(params, 'limit', app.SEARCH_LIMIT)
+        elif path != '/stats':
+            raise HttpError(404, f"Unknown endpoint: {path}")
+
+    def _query(self, app, path, params):
+        """
+        Run the query for one cacheable endpoint and return its JSON-serializable result.
+        """
+        if path == '/movies':
+            page, per_page, offset = self._page(params)
+            return {'page': page, 'per_page': per_page, 'total': app.count_movies(),
+                    'movies': app.list_movies(offset, per_page)}
+        if path.startswith('/movies/'):
+            movie = app.get_movie(unquote(path[len('/movies/'):]))
+            if movie is None:
+                raise HttpError(404, "Movie not found")
+            return movie
+        if path == '/search':
+            query = params.get('q', [''])[0].strip()
+            if not query:
+                raise HttpError(400, "q is required")
+            return app.search_movies(query, _int_param(params, 'limit', app.SEARCH_LIMIT, high=self.max_per_page))
+        if path == '/stats':
+            return app.movie_stats()
+        if path == '/sorted':
+            page, per_page, offset = self._page(params)
+            return {'page': page, 'per_page': per_page,
+                    'movies': app.movies_sorted_by_rating(offset + per_page)[offset:]}
+        raise HttpError(404, f"Unknown endpoint: {path}")
+
+    async def _stream_movies(self, writer, app, etag, keep_alive):
+        """
+        Stream every movie as one JSON array with chunked encoding, a page of records per chunk.
+        """
+        head = ["HTTP/1.1 200 OK", "Content-Type: application/json", "Transfer-Encoding: chunked",
+                f"ETag: {etag}", "Cache-Control: no-cache",
+                "Connection: " + ("keep-alive" if keep_alive else "close")]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+
+        def chunk(data):
+            return f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n'
+
+        separator = b'['
+        movies = app.iter_movies()  # One pass: re-slicing from the start for every chunk would be quadratic
+        while True:
+            page = list(islice(movies, self.max_per_page))
+            if not page:
+                break
+            data = b','.join(json.dumps(movie, default=str).encode('utf-8') for movie in page)
+            writer.write(chunk(separator + data))
+            separator = b','
+            await writer.drain()
+        writer.write(chunk(b'[]' if separator == b'[' else b']') + b'0\r\n\r\n')
+        await writer.drain()
+
+
+def main():
+    """
+    Serve the movie catalog as a read-only JSON API.
+    """
+    parser = argparse.ArgumentParser(description="Serve the movie database as a read-only JSON API.")
+    parser.add_argument('--file', default=None, help="Movie database file (defaults to MOVIES_FILE or data/movies.json).")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on.")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on.")
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help="Seconds between checks of the catalog file for changes.")
+    args = parser.parse_args()
+
+    load_dotenv()  # Load environment variables from .env file
+    file_path = args.file or os.getenv('MOVIES_FILE', 'data/movies.json')
+    api_key = os.getenv('API_KEY')
+
+    def load_storage():
+        return create_storage('https://www.omdbapi.com/', api_key, file_path)
+
+    watch_paths = [] if file_path.endswith(('.sqlite', '.db')) else [file_path, f"{file_path}.journal"]
+    server = MovieApiServer(load_storage, watch_paths, args.reload_interval)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import random
+from storage.snapshot import write_snapshot
+from storage.storage_csv import StorageCsv
+
+WORDS = ('Dark', 'Night', 'Return', 'Lost', 'City', 'Star', 'Dream', 'River', 'Ghost', 'King', 'Last', 'Road',
+         'Silent', 'Empire', 'Secret', 'Summer', 'Iron', 'Broken', 'Golden', 'Shadow', 'Wild', 'Blue', 'Storm',
+         'Garden', 'Machine', 'Heart', 'Winter', 'Island', 'Fire', 'Memory')
+
+
+def generate_catalog(count, seed=0):
+    """
+    Return a synthetic movies dict of count movies in the data/movies.json schema.
+    Titles are unique; about 2% of the movies have no rating and a few have a year range.
+    """
+    rng = random.Random(seed)
+    movies = {}
+    for number in range(count):
+        title = f"{' '.join(rng.sample(WORDS, rng.randint(1, 3)))} {number}"
+        year = rng.randint(1920, 2024)
+        imdb_id = f"tt{number:07d}"
+        movies[title] = {
+            'title': title,
+            'year': f"{year}–{year + rng.randint(1, 5)}" if rng.random() < 0.01 else str(year),
+            'rating': 'N/A' if rng.random() < 0.02 else round(rng.uniform(1.0, 9.8), 1),
+            'poster': f"https://posters.example/{imdb_id}.jpg",
+            'imdb_id': imdb_id,
+            'description': ' '.join(rng.choices(WORDS, k=12)).lower() + '.',
+        }
+    return movies
+
+
+def write_catalog(movies, path):
+    """
+    Write movies to path: CSV for '.csv' files, otherwise a snapshot in the format of the extension.
+    """
+    if path.endswith('.csv'):
+        StorageCsv(path)._save_movies(movies)
+    else:
+        write_snapshot(path, movies)
+
+
+def main():
+    """
+    Generate a synthetic catalog file.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic movie catalog.")
+    parser.add_argument('count', type=int, help="Number of movies.")
+    parser.add_argument('output', help="Output file ('.json', '.msgpack.zst' or '.csv').")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+    write_catalog(generate_catalog(args.count, args.seed), args.output)
+    print(f"Wrote {args.count} movies to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def stub_details(title=None, imdb_id=None):
+    """
+    Deterministic OMDb-style details for a title or IMDb ID, or None for titles starting with "Missing".
+    """
+    if title and title.startswith('Missing'):
+        return None
+    seed = int(hashlib.sha1((title or imdb_id).lower().encode('utf-8')).hexdigest()[:8], 16)
+    imdb_id = imdb_id or f"tt{seed % 10 ** 7:07d}"
+    return {
+        "Title": title or f"Movie {imdb_id}",
+        "Year": str(1950 + seed % 75),
+        "imdbRating": f"{1 + seed % 90 / 10:.1f}",
+        "Poster": f"https://posters.example/{imdb_id}.jpg",
+        "imdbID": imdb_id,
+        "Plot": f"Synthetic plot number {seed}.",
+        "Response": "True",
+    }
+
+
+class OmdbStubHandler(BaseHTTPRequestHandler):
+    """
+    Answers OMDb queries (?t= or ?i=) with stub_details, like the real API answers a found or missing movie.
+    """
+
+    def do_GET(self):
+        params = parse_qs(urlsplit(self.path).query)
+        details = stub_details(params.get('t', [None])[0], params.get('i', [None])[0])
+        if details is None:
+            details = {"Response": "False", "Error": "Movie not found!"}
+        body = json.dumps(details).encode('utf-8')
+        self.server.requests += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class OmdbStubServer:
+    """
+    Local stand-in for the OMDb API, served from a background thread.
+    Use as a context manager; url is the API URL to pass to the storage classes.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Initialize with the address to listen on (port 0 picks a free port).
+        """
+        self._server = ThreadingHTTPServer((host, port), OmdbStubHandler)
+        self._server.requests = 0
+        self._thread = None
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+
+    @property
+    def requests(self):
+        """
+        Number of requests answered so far.
+        """
+        return self._server.requests
+
+    def start(self):
+        """
+        Start serving in a daemon thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
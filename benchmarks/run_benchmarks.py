@@ -0,0 +1,226 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from benchmarks.generate_catalog import WORDS, generate_catalog, write_catalog
+from benchmarks.omdb_stub import OmdbStubServer
+from storage.omdb_client import OmdbClient
+from storage.storage_csv import StorageCsv
+from storage.storage_json import StorageJson
+from website.site_builder import SiteBuilder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(ROOT, '_static', 'index_template.html')
+BACKENDS = ('json', 'json-journal', 'csv')
+
+
+def timed(fn, *args):
+    """
+    Run fn(*args) and return the elapsed seconds.
+    """
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def timed_each(fn, arguments):
+    """
+    Run fn once per argument tuple and return the total elapsed seconds.
+    """
+    start = time.perf_counter()
+    for args in arguments:
+        fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_site(movies_fn, workdir):
+    """
+    Time a cold site build (empty fragment cache) and a warm rebuild with nothing changed.
+    """
+    output_path = os.path.join(workdir, 'index.html')
+    for path in (output_path, os.path.join(workdir, '.site_cache.json')):
+        if os.path.exists(path):
+            os.remove(path)
+    cold = timed(SiteBuilder(TEMPLATE_PATH, output_path).build, movies_fn())
+    warm = timed(SiteBuilder(TEMPLATE_PATH, output_path).build, movies_fn())
+    return cold, warm
+
+
+def bench_storage_json(path, journal, operations, rng, omdb_url, workdir):
+    """
+    Time one round of every operation on StorageJson. Returns {operation: (seconds, op count)}.
+    """
+    timings = {}
+    storage = None
+
+    def load():
+        nonlocal storage
+        storage = StorageJson(omdb_url, 'key', path, journal=journal,
+                              omdb_client=OmdbClient(omdb_url, 'key', max_retries=0))
+
+    timings['load'] = (timed(load), 1)
+    titles = [f"Benchmark Movie {rng.random()}" for _ in range(operations)]
+    timings['add'] = (timed_each(storage.add_movie, [(title, "2000", "7.5", "N/A", "A benchmark.")
+                                                     for title in titles]), operations)
+    timings['update'] = (timed_each(storage.update_movie, [(title, "8.5") for title in titles]), operations)
+    timings['delete'] = (timed_each(storage.delete_movie, [(title,) for title in titles]), operations)
+    queries = [(' '.join(rng.sample(WORDS, 2)).lower(),) for _ in range(operations)]
+    timings['search'] = (timed_each(storage.search_movies, queries), operations)
+    keys = list(storage.movies)
+    stats = 0.0
+    for _ in range(operations):
+        storage.update_movie(rng.choice(keys), f"{rng.uniform(1, 9):.1f}")
+        stats += timed(storage.movie_stats)
+    timings['stats'] = (stats, operations)
+    timings['random'] = (timed_each(storage.random_movie, [()] * operations), operations)
+    timings['fetch'] = (timed_each(storage._fetch_movie_details, [(f"Stub {number}",)
+                                                                  for number in range(operations)]), operations)
+    cold, warm = bench_site(storage.iter_movies, workdir)
+    timings['site_cold'], timings['site_warm'] = (cold, 1), (warm, 1)
+    # Saved last: a write behind the storage's back makes its next commit reload the catalog
+    timings['save'] = (timed(storage._save_movies), 1)
+    storage.close()
+    return timings
+
+
+def bench_storage_csv(path, operations, rng, workdir):
+    """
+    Time one round of every operation StorageCsv supports. Returns {operation: (seconds, op count)}.
+    """
+    timings = {}
+    storage = StorageCsv(path)
+    timings['load'] = (timed(lambda: storage.movies), 1)
+    movies = storage.movies
+    timings['save'] = (timed(storage._save_movies, movies), 1)
+    titles = [f"Benchmark Movie {rng.random()}" for _ in range(operations)]
+    timings['add'] = (timed_each(storage.add_movie, [(title, "2000", "7.5", "N/A") for title in titles]),
+                      operations)
+    timings['update'] = (timed_each(storage.update_movie, [(title, "8.5") for title in titles]), operations)
+    timings['delete'] = (timed_each(storage.delete_movie, [(title,) for title in titles]), operations)
+    keys = list(storage.movies)
+    stats = 0.0
+    for _ in range(operations):
+        storage.update_movie(rng.choice(keys), f"{rng.uniform(1, 9):.1f}")
+        stats += timed(storage.movie_stats)
+    timings['stats'] = (stats, operations)
+    timings['random'] = (timed_each(lambda: rng.choice(list(storage.movies)), [()] * operations), operations)
+    cold, warm = bench_site(storage.iter_movies, workdir)
+    timings['site_cold'], timings['site_warm'] = (cold, 1), (warm, 1)
+    storage.close()
+    return timings
+
+
+def run(sizes, backends, repeat, operations, seed=0):
+    """
+    Run every backend on a fresh synthetic catalog of each size, repeat times.
+    Returns one result dict per (backend, size, operation) with per-operation times in seconds.
+    """
+    results = []
+    rng = random.Random(seed)
+    with OmdbStubServer() as omdb, tempfile.TemporaryDirectory() as workdir, redirect_stdout(io.StringIO()):
+        for size in sizes:
+            catalog = generate_catalog(size, seed)
+            for backend in backends:
+                samples = {}
+                for _ in range(repeat):
+                    path = os.path.join(workdir, 'movies.csv' if backend == 'csv' else 'movies.json')
+                    for suffix in ('', '.journal', '.tombstones'):
+                        if os.path.exists(path + suffix):
+                            os.remove(path + suffix)
+                    write_catalog(catalog, path)
+                    if backend == 'csv':
+                        timings = bench_storage_csv(path, operations, rng, workdir)
+                    else:
+                        timings = bench_storage_json(path, backend == 'json-journal', operations, rng, omdb.url,
+                                                     workdir)
+                    for operation, (seconds, count) in timings.items():
+                        samples.setdefault(operation, []).append(seconds / count)
+                for operation, per_op in samples.items():
+                    results.append({
+                        'backend': backend,
+                        'size': size,
+                        'operation': operation,
+                        'repeat': repeat,
+                        'median': statistics.median(per_op),
+                        'min': min(per_op),
+                        'mean': statistics.fmean(per_op),
+                    })
+    return results
+
+
+def environment():
+    """
+    Where the results were measured: commit, Python, platform and time.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def compare(baseline, results, threshold=1.2):
+    """
+    Return (key, baseline median, new median) for every result slower than the baseline by threshold or more.
+    """
+    previous = {(entry['backend'], entry['size'], entry['operation']): entry['median']
+                for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        key = (entry['backend'], entry['size'], entry['operation'])
+        if key in previous and previous[key] > 0 and entry['median'] / previous[key] >= threshold:
+            regressions.append((key, previous[key], entry['median']))
+    return regressions
+
+
+def main():
+    """
+    Run the benchmarks and write the results as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the storage backends, search, stats and site build.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Catalog sizes.")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS), help="Backends to run.")
+    parser.add_argument('--repeat', type=int, default=3, help="Rounds per backend and size.")
+    parser.add_argument('--operations', type=int, default=20, help="Operations per round for per-call timings.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for catalogs and operations.")
+    parser.add_argument('--output', default='-', help="Results file ('-' for stdout).")
+    parser.add_argument('--compare', metavar='BASELINE', help="Earlier results file to check for regressions.")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Slowdown ratio against the baseline reported as a regression.")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.backends, args.repeat, args.operations, args.seed)
+    report = json.dumps({'environment': environment(), 'results': results}, indent=2)
+    if args.output == '-':
+        print(report)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report + '\n')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            regressions = compare(json.load(file), results, args.threshold)
+        for (backend, size, operation), before, after in regressions:
+            print(f"Regression: {backend} {size} {operation}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms",
+                  file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import nullcontext
+from dotenv import load_dotenv
+from main import create_storage
+from storage.omdb_async import AsyncOmdbClient
+from storage.omdb_cache import OmdbCache
+
+
+def read_titles(source):
+    """
+    Read one title per line from an open file, skipping blanks, '#' comments and duplicates.
+    """
+    titles = []
+    seen = set()
+    for line in source:
+        title = line.strip()
+        if title and not title.startswith('#') and title.lower() not in seen:
+            seen.add(title.lower())
+            titles.append(title)
+    return titles
+
+
+async def fetch_titles(api_url, api_key, titles, concurrency, rate, cache):
+    """
+    Fetch every title concurrently over one pooled OMDb client.
+    """
+    async with AsyncOmdbClient(api_url, api_key, concurrency=concurrency, rate=rate, cache=cache) as client:
+        return await client.fetch_titles(titles)
+
+
+def import_movies(storage, titles, concurrency=8, rate=10.0):
+    """
+    Fetch titles from OMDb concurrently and add them to storage, with a single write when the
+    backend supports batches.
+    Returns (added titles, {title: error}) without aborting on individual failures.
+    """
+    failures = {}
+    pending = []
+    for title in titles:
+        if storage.find_movie(title) is not None:
+            failures[title] = "Movie already exists."
+        else:
+            pending.append(title)
+
+    results = asyncio.run(fetch_titles(storage.api_url, storage.api_key, pending, concurrency, rate, storage.cache))
+
+    added = []
+    batch = getattr(storage, 'batch', None)
+    with batch() if batch else nullcontext():
+        for result in results:
+            if not result.ok:
+                failures[result.query] = result.error
+                continue
+            try:
+                added.append(storage.add_movie_details(result.details))
+            except Exception as e:
+                failures[result.query] = str(e)
+    return added, failures
+
+
+def main():
+    """
+    Import movies listed in a file (or stdin) into the movie database.
+    """
+    parser = argparse.ArgumentParser(description="Bulk import movies from a list of titles.")
+    parser.add_argument('titles', nargs='?', default='-', help="File with one title per line ('-' for stdin).")
+    parser.add_argument('--file', default=None,
+                        help="Movie database file ('.json', '.jsonl' or '.sqlite'; defaults to MOVIES_FILE).")
+    parser.add_argument('--concurrency', type=int, default=8, help="Maximum number of concurrent OMDb requests.")
+    parser.add_argument('--rate', type=float, default=10.0, help="Maximum OMDb requests per second.")
+    args = parser.parse_args()
+
+    load_dotenv()  # Load environment variables from .env file
+    api_key = os.getenv('API_KEY')
+    if not api_key:
+        parser.error("API_KEY not found in environment variables.")
+
+    if args.titles == '-':
+        titles = read_titles(sys.stdin)
+    else:
+        with open(args.titles, 'r', encoding='utf-8') as file:
+            titles = read_titles(file)
+
+    file_path = args.file or os.getenv('MOVIES_FILE', 'data/movies.json')
+    storage = create_storage('https://www.omdbapi.com/', api_key, file_path, OmdbCache('data/omdb_cache.sqlite'))
+    try:
+        added, failures = import_movies(storage, titles, args.concurrency, args.rate)
+    finally:
+        storage.close()
+
+    print(f"Imported {len(added)} of {len(titles)} movies.")
+    for title, error in failures.items():
+        print(f"Failed: {title}: {error}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
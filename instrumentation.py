@@ -0,0 +1,246 @@
+import bisect
+import cProfile
+import functools
+import inspect
+import json
+import math
+import os
+import time
+import tracemalloc
+from movie_app import MovieApp
+from storage.journal import Journal
+from storage.snapshot import write_atomic
+from storage.storage_json import StorageJson
+from website.site_builder import SiteBuilder
+
+# Upper bounds of the latency buckets, in milliseconds
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+
+APP_METHODS = ('list_movies', 'iter_movies', 'add_movie', 'delete_movie', 'update_movie', 'movie_stats', 'random_movie',
+               'search_movies', 'movies_sorted_by_rating', 'build_website')
+
+
+def _file_size(path):
+    """
+    Size of path in bytes, 0 if it does not exist.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class LatencyHistogram:
+    """
+    Call count, total, min, max and a fixed-bucket histogram of latencies for one operation.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def record(self, seconds):
+        """
+        Add one latency sample.
+        """
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile(self, percent):
+        """
+        Upper bound in milliseconds of the bucket holding the given percentile (capped at the maximum).
+        """
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+    def to_dict(self):
+        """
+        JSON-serializable summary, times in milliseconds.
+        """
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total * 1000 / self.count if self.count else 0.0,
+            'min_ms': self.min * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': {('inf' if bound == math.inf else str(bound)): count
+                        for bound, count in zip(BUCKETS_MS, self.buckets) if count},
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in latency, I/O and API call accounting for the app's hot paths.
+
+    Methods are wrapped on their class, so every instance is covered, including calls made
+    while it is being constructed; uninstall() puts the originals back. Operations listed in
+    profile are also run under cProfile and tracemalloc.
+    """
+
+    def __init__(self, profile=()):
+        """
+        Initialize with the names of the operations to profile ('all' for every instrumented one).
+        """
+        self.profile = set(profile)
+        self.histograms = {}
+        self.bytes_read = {}
+        self.bytes_written = {}
+        self.sources = {}
+        self.allocations = {}
+        self._profilers = {}
+        self._profiling = False
+        self._patched = []
+
+    def _histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def wrap(self, cls, method_name, name=None, read_size=None, write_size=None, append=False):
+        """
+        Time every call of cls.method_name under name (default 'Class.method').
+        read_size(instance) and write_size(instance) report file sizes after a successful call,
+        counted as bytes read or written; with append=True the growth during the call is counted
+        instead. Calls returning False count as having written nothing.
+        A generator method is timed from the call until it is exhausted or closed.
+        """
+        name = name or f"{cls.__name__}.{method_name}"
+        original = cls.__dict__[method_name]
+        histogram = self._histogram(name)
+        instrumentation = self
+
+        @functools.wraps(original)
+        def wrapper(instance, *args, **kwargs):
+            before = write_size(instance) if write_size and append else 0
+            start = time.perf_counter()
+            try:
+                if name in instrumentation.profile or 'all' in instrumentation.profile:
+                    result = instrumentation._profiled(name, original, instance, *args, **kwargs)
+                else:
+                    result = original(instance, *args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - start)
+            if read_size:
+                instrumentation.bytes_read[name] = instrumentation.bytes_read.get(name, 0) + read_size(instance)
+            if write_size and result is not False:  # SiteBuilder.build returns False when it wrote nothing
+                written = write_size(instance) - before
+                instrumentation.bytes_written[name] = instrumentation.bytes_written.get(name, 0) + written
+            return result
+
+        @functools.wraps(original)
+        def generator_wrapper(instance, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from original(instance, *args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - start)
+
+        setattr(cls, method_name, generator_wrapper if inspect.isgeneratorfunction(original) else wrapper)
+        self._patched.append((cls, method_name, original))
+
+    def _profiled(self, name, function, *args, **kwargs):
+        """
+        Run one call under cProfile and tracemalloc, unless an enclosing call is already profiled.
+        """
+        if self._profiling:
+            return function(*args, **kwargs)
+        self._profiling = True
+        profiler = self._profilers.setdefault(name, cProfile.Profile())
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        before = tracemalloc.take_snapshot()
+        profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            top = tracemalloc.take_snapshot().compare_to(before, 'lineno')[:10]
+            if started_tracing:
+                tracemalloc.stop()
+            entry = self.allocations.setdefault(name, {'calls': 0, 'peak_bytes': 0})
+            entry['calls'] += 1
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+            entry['top_allocations'] = [str(stat) for stat in top]
+            self._profiling = False
+
+    def add_source(self, name, collect):
+        """
+        Include collect() (a dict of counters, e.g. OmdbClient.stats) in the report under name.
+        """
+        self.sources[name] = collect
+
+    def uninstall(self):
+        """
+        Restore every wrapped method.
+        """
+        for cls, method_name, original in reversed(self._patched):
+            setattr(cls, method_name, original)
+        self._patched = []
+
+    def report(self):
+        """
+        Everything measured so far as a JSON-serializable dict.
+        """
+        return {
+            'operations': {name: histogram.to_dict() for name, histogram in self.histograms.items()
+                           if histogram.count},
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'sources': {name: collect() for name, collect in self.sources.items()},
+            'allocations': self.allocations,
+        }
+
+    def dump(self, path):
+        """
+        Write the report to path, and each CPU profile to '<path>.<operation>.prof' (pstats format).
+        """
+        write_atomic(path, json.dumps(self.report(), indent=2, default=str).encode('utf-8'))
+        for name, profiler in self._profilers.items():
+            profiler.dump_stats(f"{path}.{name}.prof")
+
+
+def install(profile=()):
+    """
+    Instrument the MovieApp commands, StorageJson I/O and OMDb fetches, and the site builder.
+    Returns the Instrumentation collecting the measurements.
+    """
+    instrumentation = Instrumentation(profile)
+    for method_name in APP_METHODS:
+        instrumentation.wrap(MovieApp, method_name, f"command.{method_name}")
+    instrumentation.wrap(StorageJson, '_load_movies', read_size=lambda storage: _file_size(storage.file_path) + (
+        _file_size(storage._journal.path) if storage._journal else 0))
+    instrumentation.wrap(StorageJson, '_save_movies', write_size=lambda storage: _file_size(storage.file_path))
+    instrumentation.wrap(StorageJson, '_fetch_movie_details')
+    instrumentation.wrap(Journal, 'append', write_size=lambda journal: _file_size(journal.path), append=True)
+    instrumentation.wrap(SiteBuilder, 'build', write_size=lambda builder: _file_size(builder.output_path))
+    return instrumentation
+
+
+def add_storage_sources(instrumentation, storage):
+    """
+    Report the OMDb client's request counters and the response cache's hits and misses.
+    """
+    if getattr(storage, 'omdb', None) is not None:
+        instrumentation.add_source('omdb', storage.omdb.stats)
+    if getattr(storage, 'cache', None) is not None:
+        cache = storage.cache
+        instrumentation.add_source('omdb_cache', lambda: {'hits': cache.hits, 'misses': cache.misses})
@@ -1,13 +1,62 @@
+from instrumentation import add_storage_sources, install
 from movie_app import MovieApp
+from storage.omdb_cache import OmdbCache
 from storage.storage_json import StorageJson
+from storage.storage_lazy import LazyStorageJson
+from storage.storage_sqlite import StorageSqlite
+from website.posters import PosterCache
+from contextlib import redirect_stdout
 from dotenv import load_dotenv
+import argparse
+import json
 import os
+import sys
+
+
+def run_batch(movie_app, path):
+    """
+    Run the commands in path ('-' for stdin) and print one JSON result per line.
+    Messages printed by the commands go to stderr so stdout stays machine-readable.
+    Returns the number of failed commands.
+    """
+    output = sys.stdout
+    failures = 0
+    with (sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')) as source, redirect_stdout(sys.stderr):
+        for outcome in movie_app.run_batch(source):
+            failures += not outcome['ok']
+            print(json.dumps(outcome, default=str), file=output)
+    return failures
+
+
+def create_storage(api_url, api_key, file_path, cache=None):
+    """
+    Open the storage backend matching the extension of file_path.
+    """
+    if file_path.endswith(('.sqlite', '.db')):
+        return StorageSqlite(api_url, api_key, file_path, cache=cache)
+    if file_path.endswith('.jsonl'):
+        # Line-delimited records are indexed at startup and decoded on demand
+        return LazyStorageJson(api_url, api_key, file_path, cache=cache)
+    return StorageJson(api_url, api_key, file_path, journal=True, cache=cache)  # Combined storage class
 
 
 def main():
     """
-    Main function to run the MovieApp.
+    Main function to run the MovieApp, interactively or on a batch file of commands.
     """
+    parser = argparse.ArgumentParser(description="Manage the movie database.")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Run the commands in FILE ('-' for stdin) instead of the interactive menu.")
+    parser.add_argument('--stats', metavar='FILE', default=os.getenv('MOVIE_APP_STATS'),
+                        help="Record latencies, I/O and OMDb calls and write them to FILE on exit.")
+    parser.add_argument('--profile', metavar='OPS', default=os.getenv('MOVIE_APP_PROFILE'),
+                        help="Comma-separated operations (e.g. command.build_website) or 'all' to run under "
+                             "cProfile and tracemalloc; implies --stats.")
+    args = parser.parse_args()
+    instrumentation = None
+    if args.stats or args.profile:
+        # Installed before the storage is opened so the initial load is measured too
+        instrumentation = install(args.profile.split(',') if args.profile else ())
     try:
         load_dotenv()  # Load environment variables from .env file
         api_url = 'https://www.omdbapi.com/'  # API URL
@@ -15,12 +64,31 @@ def main():
         if not api_key:
             raise ValueError("API_KEY not found in environment variables.")
 
-        file_path = 'data/movies.json'  # Path to the JSON file
-        storage_api_json = StorageJson(api_url, api_key, file_path)  # Combined storage class
-        movie_app = MovieApp(storage_api_json, storage_api_json)  # Use the same instance for both parameters
-        movie_app.run()
+        file_path = os.getenv('MOVIES_FILE', 'data/movies.json')  # Path to the movie database file
+        cache = OmdbCache('data/omdb_cache.sqlite')  # Persistent cache of OMDb responses
+        storage_api_json = create_storage(api_url, api_key, file_path, cache)
+        if instrumentation:
+            add_storage_sources(instrumentation, storage_api_json)
+        per_page = int(os.getenv('SITE_PER_PAGE', '0')) or None  # Paginate the website for large catalogs
+        poster_workers = int(os.getenv('SITE_POSTER_WORKERS', '8'))  # 0 links the remote posters instead
+        poster_cache = PosterCache(workers=poster_workers) if poster_workers else None
+        # Use the same instance for both storage parameters
+        movie_app = MovieApp(storage_api_json, storage_api_json, per_page, poster_cache)
+        try:
+            if args.batch:
+                if run_batch(movie_app, args.batch):
+                    sys.exit(1)
+            else:
+                movie_app.run()
+        finally:
+            storage_api_json.close()  # Fold the mutation journal back into the JSON file
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        if instrumentation:
+            stats_path = args.stats or 'data/stats.json'
+            instrumentation.dump(stats_path)
+            print(f"Instrumentation stats written to {stats_path}.", file=sys.stderr)
 
 
 if __name__ == "__main__":
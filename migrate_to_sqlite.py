@@ -0,0 +1,38 @@
+import argparse
+import os
+from storage.journal import Journal
+from storage.snapshot import read_snapshot
+from storage.storage_sqlite import StorageSqlite
+
+
+def migrate(source, target):
+    """
+    Copy every movie from a StorageJson snapshot (and its pending journal, if any)
+    into a SQLite database in one transaction. Returns the number of movies migrated.
+    """
+    movies = read_snapshot(source)
+    Journal(f"{source}.journal").replay(movies)
+    storage = StorageSqlite(api_url=None, api_key=None, file_path=target)
+    try:
+        return storage.import_movies(movies.items())
+    finally:
+        storage.close()
+
+
+def main():
+    """
+    Migrate the JSON movie database to SQLite.
+    """
+    parser = argparse.ArgumentParser(description="Migrate the movie database from JSON to SQLite.")
+    parser.add_argument('source', nargs='?', default='data/movies.json', help="StorageJson snapshot file.")
+    parser.add_argument('target', nargs='?', default='data/movies.sqlite', help="SQLite database to create.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        parser.error(f"File not found: {args.source}")
+    count = migrate(args.source, args.target)
+    print(f"Migrated {count} movies from {args.source} to {args.target}.")
+
+
+if __name__ == "__main__":
+    main()
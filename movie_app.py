@@ -1,25 +1,197 @@
 import random
-import statistics
 import os
+import shlex
+from contextlib import nullcontext
+from itertools import islice
+from website.paginated_site import PaginatedSiteBuilder
+from website.site_builder import SiteBuilder
 
 class MovieApp:
     """
     Movie application to manage movie data.
     """
 
-    def __init__(self, storage_api, storage_json):
+    SEARCH_LIMIT = 20
+
+    def __init__(self, storage_api, storage_json, per_page=None, poster_cache=None):
         """
         Initialize with storage API and JSON storage objects.
+        With per_page set, the website is generated as paginated pages under 'site/'
+        instead of a single index.html. With a PosterCache, posters are downloaded before
+        each build and the pages show the local thumbnails.
         """
         self._storage_api = storage_api
         self._storage_json = storage_json
+        template_path = os.path.join('_static', 'index_template.html')
+        self._site_builder = SiteBuilder(template_path, 'index.html')
+        self._paginated_site_builder = PaginatedSiteBuilder(template_path, 'site', per_page) if per_page else None
+        self._poster_cache = poster_cache
+
+    @staticmethod
+    def _record(title, details):
+        """
+        Plain dict for one movie, with its title, as returned by the command methods.
+        """
+        record = details.to_dict() if hasattr(details, 'to_dict') else dict(details)
+        record['title'] = title
+        return record
+
+    def list_movies(self, offset=0, limit=None):
+        """
+        Return movies as dicts in storage order, optionally only limit of them starting at offset.
+        """
+        movies = islice(self._storage_json.iter_movies(), offset, None if limit is None else offset + limit)
+        return [self._record(title, details) for title, details in movies]
+
+    def iter_movies(self):
+        """
+        Yield every movie as a dict in storage order, in one pass over the storage.
+        """
+        for title, details in self._storage_json.iter_movies():
+            yield self._record(title, details)
+
+    def count_movies(self):
+        """
+        Return the number of stored movies.
+        """
+        return len(self._storage_json.movies)
+
+    def get_movie(self, title):
+        """
+        Return the movie matching title case-insensitively as a dict, or None.
+        """
+        key = self._storage_json.find_movie(title)
+        return None if key is None else self._record(key, self._storage_json.movies[key])
+
+    def add_movie(self, title):
+        """
+        Fetch a movie from OMDb by title, add it and return its stored title.
+        """
+        movie_details = self._storage_api._fetch_movie_details(title)
+        if not movie_details:
+            raise Exception("Error: Movie not found.")
+        return self._storage_json.add_movie_details(movie_details)
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title.
+        """
+        self._storage_json.delete_movie(title)
+
+    def update_movie(self, title, rating):
+        """
+        Update the rating of a movie.
+        """
+        self._storage_json.update_movie(title, rating)
+
+    def movie_stats(self):
+        """
+        Return the rating statistics of the storage backend, or None if no movie is rated.
+        """
+        return self._storage_json.movie_stats()
+
+    def random_movie(self, weighted=False):
+        """
+        Return a random movie as a dict, or None if there are no movies.
+        With weighted=True, higher rated movies are proportionally more likely.
+        """
+        if hasattr(self._storage_json, 'random_movie'):
+            picked = self._storage_json.random_movie(weighted=True) if weighted else self._storage_json.random_movie()
+        else:
+            movies = self._storage_json.movies
+            if not movies:
+                return None
+            title = random.choice(list(movies))
+            picked = (title, movies[title])
+        return self._record(*picked) if picked else None
+
+    def search_movies(self, query, limit=None):
+        """
+        Return the movies best matching query as dicts, best match first.
+        """
+        matches = self._storage_json.search_movies(query, limit=limit or self.SEARCH_LIMIT)
+        return [self._record(title, details) for title, details in matches]
+
+    def movies_sorted_by_rating(self, limit=None):
+        """
+        Return movies as dicts ordered by rating, highest first.
+        """
+        ordered = self._storage_json.movies_sorted_by_rating(limit)
+        return [self._record(title, details) for title, details in ordered]
+
+    def build_website(self):
+        """
+        Build the website and return the number of pages written (0 if it was already up to date).
+        """
+        template_path = self._site_builder.template_path
+        if not os.path.exists(template_path):
+            raise Exception(f"Template file not found: {template_path}")
+        movies = self._storage_json.iter_movies()
+        if self._poster_cache:
+            self._poster_cache.prefetch(details.get('poster') for _, details in self._storage_json.iter_movies())
+            movies = self._poster_cache.localize(movies)
+        if self._paginated_site_builder:
+            return self._paginated_site_builder.build(movies, total=len(self._storage_json.movies))
+        return 1 if self._site_builder.build(movies) else 0
+
+    BATCH_COMMANDS = {
+        'list': ('list_movies', ()),
+        'add': ('add_movie', (str,)),
+        'delete': ('delete_movie', (str,)),
+        'update': ('update_movie', (str, float)),
+        'stats': ('movie_stats', ()),
+        'random': ('random_movie', (lambda arg: arg == 'weighted',)),
+        'search': ('search_movies', (str, int)),
+        'sorted': ('movies_sorted_by_rating', (int,)),
+        'build-site': ('build_website', ()),
+    }
+
+    def run_command(self, line):
+        """
+        Run one command line such as 'add "The Matrix"' or 'update Inception 9.1' and return its result.
+        Arguments are split like a shell command line; trailing optional arguments may be left out.
+        """
+        name, *args = shlex.split(line)
+        if name not in self.BATCH_COMMANDS:
+            raise Exception(f"Unknown command: {name}")
+        method_name, converters = self.BATCH_COMMANDS[name]
+        if len(args) > len(converters):
+            raise Exception(f"Too many arguments for {name}: expected at most {len(converters)}")
+        return getattr(self, method_name)(*(convert(arg) for convert, arg in zip(converters, args)))
+
+    def run_batch(self, lines):
+        """
+        Run command lines in order, skipping blank lines and '#' comments, and yield one result dict
+        per command: {'line', 'command', 'ok', 'result' or 'error'}. A failing command does not stop
+        the batch. Storage writes are coalesced into one commit at the end when the backend supports it.
+        """
+        batch = getattr(self._storage_json, 'batch', None)
+        with batch() if batch else nullcontext():
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                outcome = {'line': number, 'command': line}
+                try:
+                    outcome['result'] = self.run_command(line)
+                    outcome['ok'] = True
+                except Exception as e:
+                    outcome['error'] = str(e)
+                    outcome['ok'] = False
+                yield outcome
 
     def _command_list_movies(self):
         """
         Command to list all movies.
         """
         try:
-            self._storage_json.list_movies()
+            count = self.count_movies()
+            if not count:
+                print("No movies available.")
+            else:
+                print(f"{count} movies in total:\n")
+                for movie in self.iter_movies():
+                    print(f"{movie['title']} ({movie['year']}): {movie['rating']}")
         except Exception as e:
             print(f"An error occurred while listing movies: {e}")
         input("Press Enter to continue...")
@@ -29,19 +201,20 @@ class MovieApp:
         Command to display movie statistics.
         """
         try:
-            movies = self._storage_json.movies
-            if not movies:
+            stats = self.movie_stats()
+            if not stats:
                 print("No movies available.")
             else:
-                ratings = [float(movie['rating']) for movie in movies.values()]
-                avg_rating = sum(ratings) / len(ratings) if ratings else 0
-                median_rating = statistics.median(ratings)
-                best_movie = max(movies.items(), key=lambda x: float(x[1]['rating']))
-                worst_movie = min(movies.items(), key=lambda x: float(x[1]['rating']))
-                print(f"Average rating: {avg_rating:.2f}")
-                print(f"Median rating: {median_rating:.2f}")
-                print(f"Best movie rating: {best_movie[0]} with rating {best_movie[1]['rating']}")
-                print(f"Worst movie rating: {worst_movie[0]} with rating {worst_movie[1]['rating']}")
+                best_title, best_rating = stats['best']
+                worst_title, worst_rating = stats['worst']
+                print(f"Average rating: {stats['mean']:.2f}")
+                print(f"Median rating: {stats['median']:.2f}")
+                print(f"Best movie rating: {best_title} with rating {best_rating}")
+                print(f"Worst movie rating: {worst_title} with rating {worst_rating}")
+                if 'percentiles' in stats:
+                    print("Percentiles: " + ", ".join(f"p{p}={value:.2f}" for p, value in stats['percentiles'].items()))
+                    for decade, decade_stats in stats['decades'].items():
+                        print(f"{decade}s: {decade_stats['count']} movies, average rating {decade_stats['mean']:.2f}")
         except Exception as e:
             print(f"An error occurred while calculating movie statistics: {e}")
         input("Press Enter to continue...")
@@ -51,12 +224,11 @@ class MovieApp:
         Command to display a random movie and its rating.
         """
         try:
-            movies = self._storage_json.movies
-            if not movies:
+            movie = self.random_movie()
+            if not movie:
                 print("No movies available.")
             else:
-                title, details = random.choice(list(movies.items()))
-                print(f"Random movie: {title} with rating {details['rating']}")
+                print(f"Random movie: {movie['title']} with rating {movie['rating']}")
         except Exception as e:
             print(f"An error occurred while selecting a random movie: {e}")
         input("Press Enter to continue...")
@@ -66,12 +238,8 @@ class MovieApp:
         Command to search for movies by part of the title.
         """
         try:
-            query = input("Enter part of movie name to search: ").lower()
-            matched_movies = [
-                f"{title}, {details['rating']}"
-                for title, details in self._storage_json.movies.items()
-                if query in title.lower()
-            ]
+            query = input("Enter part of movie name to search: ")
+            matched_movies = [f"{movie['title']}, {movie['rating']}" for movie in self.search_movies(query)]
             if matched_movies:
                 print("\n".join(matched_movies))
             else:
@@ -85,10 +253,8 @@ class MovieApp:
         Command to display movies sorted by rating.
         """
         try:
-            movies = self._storage_json.movies
-            sorted_movies = sorted(movies.items(), key=lambda x: x[1]['rating'], reverse=True)
-            for title, details in sorted_movies:
-                print(f"{title}: {details['rating']}")
+            for movie in self.movies_sorted_by_rating():
+                print(f"{movie['title']}: {movie['rating']}")
         except Exception as e:
             print(f"An error occurred while sorting movies by rating: {e}")
         input("Press Enter to continue...")
@@ -96,40 +262,17 @@ class MovieApp:
     def _generate_website_file(self):
         """
         Generate the website file (index.html) with the movie data.
+        Only movies that changed since the last build are re-rendered.
         """
         try:
-            movies = self._storage_json.movies
-            template_path = os.path.join('_static', 'index_template.html')
-            if not os.path.exists(template_path):
-                print(f"Template file not found: {template_path}")
-                return
-
-            with open(template_path, 'r') as file:
-                template = file.read()
-
-            movie_items = "\n".join(
-                f"""
-                <li style="list-style-type: none; margin-bottom: 20px;">
-                    <h2 style="text-align: center;">{title}</h2>
-                    <div style="display: flex; align-items: center;">
-                        <a href="https://www.imdb.com/title/{details['imdb_id']}" target="_blank">
-                            <img src="{details['poster']}" alt="{title} poster" style="width: 150px; height: auto; margin-right: 20px;">
-                        </a>                        <div>
-                            <p><strong>Description:</strong> {details['description']}</p>
-                            <p><strong>Year:</strong> {details['year']}</p>
-                            <p><strong>Rating:</strong> {details['rating']}</p>
-                        </div>
-                    </div>
-                </li>
-                """
-                for title, details in movies.items()
-            )
-
-            html_content = template.replace("__TEMPLATE_MOVIE_GRID__", movie_items)
-
-            with open('index.html', 'w') as file:
-                file.write(html_content)
-            print("Website was generated successfully.")
+            page_count = self.build_website()
+            if self._paginated_site_builder:
+                print(f"Website was generated successfully: {page_count} pages in "
+                      f"{self._paginated_site_builder.output_dir}/.")
+            elif page_count:
+                print("Website was generated successfully.")
+            else:
+                print("Website is already up to date.")
         except Exception as e:
             print(f"An error occurred while generating the website: {e}")
         input("Press Enter to continue...")
@@ -160,23 +303,15 @@ class MovieApp:
             elif choice == '2':
                 try:
                     title = input("Enter movie title: ")
-                    movie_details = self._storage_api._fetch_movie_details(title)
-                    if movie_details:
-                        self._storage_json.add_movie(
-                            title=movie_details['Title'],
-                            year=movie_details['Year'],
-                            rating=movie_details['imdbRating'],
-                            poster=movie_details['Poster']
-                        )
-                    else:
-                        print("Error: Movie not found.")
+                    self.add_movie(title)
+                    print("Movie added successfully!")
                 except Exception as e:
                     print(f"An error occurred while adding the movie: {e}")
                 input("Press Enter to continue...")
             elif choice == '3':
                 try:
                     title = input("Enter movie title to delete: ")
-                    self._storage_json.delete_movie(title)
+                    self.delete_movie(title)
                 except Exception as e:
                     print(f"An error occurred while deleting the movie: {e}")
                 input("Press Enter to continue...")
@@ -184,7 +319,7 @@ class MovieApp:
                 try:
                     title = input("Enter movie title to update: ")
                     rating = input("Enter new movie rating: ")
-                    self._storage_json.update_movie(title, rating)
+                    self.update_movie(title, rating)
                 except Exception as e:
                     print(f"An error occurred while updating the movie: {e}")
                 input("Press Enter to continue...")
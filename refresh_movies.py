@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from main import create_storage
+from storage.movie import Movie
+from storage.omdb_async import AsyncOmdbClient
+from storage.omdb_cache import OmdbCache
+from storage.omdb_client import movie_from_details
+from storage.snapshot import write_atomic
+
+REFRESHED_FIELDS = ('year', 'rating', 'poster', 'description')
+
+
+def refreshed_path(storage):
+    """
+    Sidecar file holding the last refresh time of every movie, next to the movie database.
+    """
+    return f"{storage.file_path}.refreshed.json"
+
+
+def load_refreshed(path):
+    """
+    Read the {imdb_id: unix time of the last refresh} map, empty if there is none yet.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_refreshed(path, refreshed):
+    write_atomic(path, json.dumps(refreshed, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def stalest_movies(storage, refreshed, budget, min_age, now):
+    """
+    Return up to budget (title, imdb_id) pairs of the movies refreshed longest ago (never refreshed
+    first, then in storage order), leaving out those refreshed less than min_age seconds ago and
+    those without an IMDb ID.
+    """
+    candidates = []
+    for position, (title, movie) in enumerate(storage.iter_movies()):
+        imdb_id = movie.get('imdb_id')
+        if not imdb_id:
+            continue
+        last = refreshed.get(imdb_id)
+        if last is None or now - last >= min_age:
+            candidates.append((last or 0, position, title, imdb_id))
+    return [(title, imdb_id) for _, _, title, imdb_id in heapq.nsmallest(budget, candidates)]
+
+
+def changed_fields(movie, details):
+    """
+    Return the fields of a stored movie that differ in a fresh OMDb response.
+    Values OMDb no longer has ('N/A') do not overwrite stored ones. Years are compared as
+    stored, so a series whose year range grew ("2010–" to "2010–2012") is updated.
+    """
+    current = Movie.from_dict(movie)
+    fresh = Movie.from_dict(movie_from_details(details))
+    changes = {}
+    for field in REFRESHED_FIELDS:
+        value = fresh[field] if field == 'year' else getattr(fresh, field)
+        stored = current[field] if field == 'year' else getattr(current, field)
+        if value is not None and value != 'N/A' and value != stored:
+            changes[field] = value
+    return changes
+
+
+async def fetch_imdb_ids(api_url, api_key, imdb_ids, concurrency, rate):
+    """
+    Fetch every IMDb ID concurrently over one pooled OMDb client, bypassing the response cache.
+    """
+    async with AsyncOmdbClient(api_url, api_key, concurrency=concurrency, rate=rate) as client:
+        return await client.fetch_imdb_ids(imdb_ids)
+
+
+def refresh_movies(storage, budget=100, min_age=7 * 24 * 3600, concurrency=8, rate=10.0, now=None):
+    """
+    Re-fetch up to budget of the stalest movies from OMDb by IMDb ID and apply the changed fields
+    with a single write. The refresh times are kept in a sidecar file, so the next run carries on
+    with the movies this one did not reach.
+    Returns ({title: changed fields}, {title: error}) without aborting on individual failures.
+    Only backends with update_movie_details (StorageJson) can be refreshed.
+    """
+    if not hasattr(storage, 'update_movie_details'):
+        raise Exception(f"Refreshing is not supported for {storage.file_path}; use a .json movie file.")
+    now = time.time() if now is None else now
+    path = refreshed_path(storage)
+    refreshed = load_refreshed(path)
+    selected = stalest_movies(storage, refreshed, budget, min_age, now)
+    results = asyncio.run(fetch_imdb_ids(storage.api_url, storage.api_key, [imdb_id for _, imdb_id in selected],
+                                         concurrency, rate))
+
+    updated = {}
+    failures = {}
+    with storage.batch():
+        for (title, imdb_id), result in zip(selected, results):
+            if not result.ok:
+                failures[title] = result.error
+                continue
+            if storage.cache:
+                storage.cache.put(result.details, imdb_id=imdb_id)
+            try:
+                changes = changed_fields(storage.movies[title], result.details)
+                if changes:
+                    storage.update_movie_details(title, changes)
+                    updated[title] = changes
+            except Exception as e:
+                failures[title] = str(e)
+                continue
+            refreshed[imdb_id] = now
+
+    # Forget movies that were deleted since their last refresh
+    live = {movie.get('imdb_id') for _, movie in storage.iter_movies()}
+    save_refreshed(path, {imdb_id: stamp for imdb_id, stamp in refreshed.items() if imdb_id in live})
+    return updated, failures
+
+
+def main():
+    """
+    Refresh the stalest movies in the database from OMDb.
+    """
+    parser = argparse.ArgumentParser(description="Re-sync ratings and details of stored movies from OMDb.")
+    parser.add_argument('--file', default=None,
+                        help="Movie database file ('.json' or '.msgpack.zst'; defaults to MOVIES_FILE).")
+    parser.add_argument('--budget', type=int, default=100, help="Maximum number of OMDb requests in this run.")
+    parser.add_argument('--min-age', type=float, default=7.0,
+                        help="Skip movies refreshed less than this many days ago.")
+    parser.add_argument('--concurrency', type=int, default=8, help="Maximum number of concurrent OMDb requests.")
+    parser.add_argument('--rate', type=float, default=10.0, help="Maximum OMDb requests per second.")
+    args = parser.parse_args()
+
+    load_dotenv()  # Load environment variables from .env file
+    api_key = os.getenv('API_KEY')
+    if not api_key:
+        parser.error("API_KEY not found in environment variables.")
+
+    file_path = args.file or os.getenv('MOVIES_FILE', 'data/movies.json')
+    storage = create_storage('https://www.omdbapi.com/', api_key, file_path, OmdbCache('data/omdb_cache.sqlite'))
+    try:
+        updated, failures = refresh_movies(storage, args.budget, args.min_age * 24 * 3600, args.concurrency,
+                                           args.rate)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return 1
+    finally:
+        storage.close()
+
+    print(f"Updated {len(updated)} movies.")
+    for title, changes in updated.items():
+        print(f"Updated: {title}: " + ", ".join(f"{field}={value}" for field, value in changes.items()))
+    for title, error in failures.items():
+        print(f"Failed: {title}: {error}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+
+class FileLock:
+    """
+    Re-entrant advisory lock on a '.lock' file shared by every process using the same catalog.
+
+    Writers hold it exclusively while they check for and commit changes; readers hold it
+    shared while they load, so they never see a snapshot and journal from different commits.
+    Nested acquisitions in one process reuse the outer lock. Where fcntl is not available
+    the lock does nothing.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize with the path of the lock file, created on first use.
+        """
+        self.path = path
+        self._file = None
+        self._depth = 0
+
+    @contextmanager
+    def _hold(self, mode):
+        """
+        Hold the lock in mode (fcntl.LOCK_SH or fcntl.LOCK_EX) unless this process already holds it.
+        """
+        if fcntl is None:
+            yield
+            return
+        if not self._depth:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file.fileno(), mode)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                self._file.close()
+                self._file = None
+
+    def shared(self):
+        """
+        Context manager holding the lock shared, for reading.
+        """
+        return self._hold(fcntl.LOCK_SH if fcntl else None)
+
+    def exclusive(self):
+        """
+        Context manager holding the lock exclusively, for writing.
+        """
+        return self._hold(fcntl.LOCK_EX if fcntl else None)
@@ -0,0 +1,95 @@
+import bisect
+import math
+from storage.movie import movie_rating, movie_year
+
+
+class MovieIndex:
+    """
+    Secondary indexes over the movies dict, maintained incrementally on every mutation:
+    case-folded title -> key, year -> keys, and keys ordered by rating (highest first).
+    """
+
+    def __init__(self):
+        """
+        Initialize empty indexes.
+        """
+        self._by_title = {}
+        self._by_year = {}
+        self._years = []
+        self._by_rating = []
+
+    @staticmethod
+    def _rating_entry(key, movie):
+        """
+        Sort entry for the rating order; unrated movies sort after every rated one.
+        """
+        rating = movie_rating(movie)
+        return (-rating if rating is not None else math.inf, key)
+
+    def rebuild(self, movies):
+        """
+        Rebuild every index from scratch.
+        """
+        self.__init__()
+        for key, movie in movies.items():
+            self._by_title[key.lower()] = key
+            year = movie_year(movie)
+            self._by_year.setdefault(year, set()).add(key)
+        self._years = sorted(year for year in self._by_year if year is not None)
+        self._by_rating = sorted(self._rating_entry(key, movie) for key, movie in movies.items())
+
+    def add(self, key, movie):
+        """
+        Index a newly stored movie.
+        """
+        self._by_title[key.lower()] = key
+        year = movie_year(movie)
+        bucket = self._by_year.get(year)
+        if bucket is None:
+            bucket = self._by_year[year] = set()
+            if year is not None:
+                bisect.insort(self._years, year)
+        bucket.add(key)
+        bisect.insort(self._by_rating, self._rating_entry(key, movie))
+
+    def remove(self, key, movie):
+        """
+        Drop a movie from every index. The movie must be the record that was indexed.
+        """
+        self._by_title.pop(key.lower(), None)
+        year = movie_year(movie)
+        bucket = self._by_year.get(year)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._by_year[year]
+                if year is not None:
+                    del self._years[bisect.bisect_left(self._years, year)]
+        entry = self._rating_entry(key, movie)
+        position = bisect.bisect_left(self._by_rating, entry)
+        if position < len(self._by_rating) and self._by_rating[position] == entry:
+            del self._by_rating[position]
+
+    def find(self, title):
+        """
+        Return the stored key matching title case-insensitively, or None.
+        """
+        return self._by_title.get(title.lower())
+
+    def top_rated(self, limit=None):
+        """
+        Return keys ordered by rating, highest first, optionally only the first limit.
+        """
+        entries = self._by_rating if limit is None else self._by_rating[:limit]
+        return [key for _, key in entries]
+
+    def in_years(self, start=None, end=None):
+        """
+        Return keys of movies released between start and end (inclusive), ordered by year.
+        """
+        low = 0 if start is None else bisect.bisect_left(self._years, start)
+        high = len(self._years) if end is None else bisect.bisect_right(self._years, end)
+        keys = []
+        for year in self._years[low:high]:
+            keys.extend(sorted(self._by_year[year]))
+        return keys
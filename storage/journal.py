@@ -0,0 +1,112 @@
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only journal of movie mutations stored next to the snapshot file.
+
+    Each line is one compact JSON record: ``{"op": "put", "key": ..., "movie": {...}}``
+    or ``{"op": "del", "key": ...}``. Records are flushed on every append and
+    fsynced once every ``fsync_every`` appends (or on ``sync``/``close``).
+    """
+
+    def __init__(self, path, fsync_every=32):
+        """
+        Initialize with the journal path and the fsync batch size.
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.record_count = 0
+        self.appended = 0  # Records appended by this instance since the last truncate
+        self._unsynced = 0
+        self._file = None
+        self._valid_size = None
+
+    def replay(self, movies):
+        """
+        Apply every journal record on top of the given movies dict.
+        Returns the number of records applied.
+        """
+        self.record_count = 0
+        self._valid_size = 0
+        try:
+            with open(self.path, 'rb') as file:
+                for line in file:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("missing newline")
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append; everything before it is valid.
+                        print(f"Ignoring truncated record in journal: {self.path}")
+                        break
+                    if record['op'] == 'put':
+                        movies[record['key']] = record['movie']
+                    elif record['op'] == 'del':
+                        movies.pop(record['key'], None)
+                    self.record_count += 1
+                    self._valid_size += len(line)
+        except FileNotFoundError:
+            pass
+        return self.record_count
+
+    def _open(self):
+        """
+        Open the journal file for appending if it is not already open, first cutting off
+        a torn record left by a crash so new records do not run into it.
+        """
+        if self._file is None:
+            if self._valid_size is not None and os.path.exists(self.path) \
+                    and os.path.getsize(self.path) > self._valid_size:
+                os.truncate(self.path, self._valid_size)
+            self._valid_size = None
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def append(self, op, key, movie=None):
+        """
+        Append one mutation record to the journal.
+        """
+        record = {'op': op, 'key': key}
+        if movie is not None:
+            record['movie'] = movie
+        file = self._open()
+        file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        file.flush()
+        self.record_count += 1
+        self.appended += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """
+        Force all appended records to disk.
+        """
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def truncate(self):
+        """
+        Discard all journal records once they have been folded into the snapshot.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.record_count = 0
+        self.appended = 0
+        self._valid_size = None
+
+    def close(self):
+        """
+        Sync and close the journal file.
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,148 @@
+import math
+import re
+import sys
+
+_YEAR_PATTERN = re.compile(r'\d{4}')
+_FIELDS = ('title', 'year', 'rating', 'poster', 'imdb_id', 'description')
+
+
+def parse_rating(value):
+    """
+    Convert a stored rating ("7.1", 7.1 or "N/A") to a float, or None if it is not numeric.
+    """
+    if value is None:
+        return None
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(rating) else rating
+
+
+def parse_year(value):
+    """
+    Convert a stored year ("1995", 1995 or "2010–2012") to the first four-digit year, or None.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    match = _YEAR_PATTERN.search(str(value))
+    return int(match.group()) if match else None
+
+
+def _format_year(year):
+    return str(year) if year is not None else 'N/A'
+
+
+def _year_text(value, year):
+    """
+    The stored year string when the parsed year does not reproduce it (a range such as
+    "2010–2012"), otherwise None so plain years cost no extra string.
+    """
+    return value if isinstance(value, str) and value != _format_year(year) else None
+
+
+class Movie:
+    """
+    Compact movie record with normalized fields: integer year and float rating
+    (None when OMDb has none), and an interned IMDb ID.
+
+    Attribute access returns the normalized values. Item access (movie['rating'],
+    movie.get('year')) returns the values in the on-disk schema, so code written
+    against the dict records keeps working. A year the integer cannot represent
+    (a series' "2010–2012") is kept verbatim in year_text and written back as is.
+    Records are never changed in place; replace() returns a changed copy.
+    """
+
+    __slots__ = _FIELDS + ('year_text',)
+
+    def __init__(self, title, year=None, rating=None, poster=None, imdb_id=None, description=None,
+                 year_text=None):
+        self.title = title
+        self.year = year
+        self.year_text = year_text
+        self.rating = rating
+        self.poster = poster
+        self.imdb_id = sys.intern(imdb_id) if imdb_id else None
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Movie from a stored or freshly built movie dict, parsing year and rating once.
+        A Movie is returned unchanged.
+        """
+        if isinstance(data, cls):
+            return data
+        year = parse_year(data.get('year'))
+        return cls(data.get('title'), year, parse_rating(data.get('rating')), data.get('poster'),
+                   data.get('imdb_id'), data.get('description'), _year_text(data.get('year'), year))
+
+    def to_dict(self):
+        """
+        Convert back to the on-disk schema: year as a string, rating as a float, "N/A" when missing.
+        """
+        data = {
+            'title': self.title,
+            'year': self['year'],
+            'rating': self.rating if self.rating is not None else 'N/A',
+            'poster': self.poster,
+        }
+        if self.imdb_id is not None:
+            data['imdb_id'] = self.imdb_id
+        data['description'] = self.description
+        return data
+
+    def replace(self, **changes):
+        """
+        Return a copy with some fields changed; year and rating are normalized.
+        """
+        values = {field: getattr(self, field) for field in _FIELDS}
+        values['year_text'] = self.year_text
+        values.update(changes)
+        if 'year' in changes:
+            values['year'] = parse_year(changes['year'])
+            values['year_text'] = _year_text(changes['year'], values['year'])
+        values['rating'] = parse_rating(values['rating'])
+        return Movie(**values)
+
+    def __getitem__(self, field):
+        if field == 'year':
+            return self.year_text if self.year_text is not None else _format_year(self.year)
+        if field == 'rating':
+            return self.rating if self.rating is not None else 'N/A'
+        if field not in _FIELDS or (field == 'imdb_id' and self.imdb_id is None):
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if not isinstance(other, Movie):
+            return NotImplemented
+        return (all(getattr(self, field) == getattr(other, field) for field in _FIELDS)
+                and self.year_text == other.year_text)
+
+    def __repr__(self):
+        return f"Movie(title={self.title!r}, year={self.year!r}, rating={self.rating!r})"
+
+
+def movie_rating(movie):
+    """
+    Numeric rating of a Movie or a movie dict, or None.
+    """
+    if isinstance(movie, Movie):
+        return movie.rating
+    return parse_rating(movie.get('rating'))
+
+
+def movie_year(movie):
+    """
+    Numeric year of a Movie or a movie dict, or None.
+    """
+    if isinstance(movie, Movie):
+        return movie.year
+    return parse_year(movie.get('year'))
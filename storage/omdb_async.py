@@ -0,0 +1,122 @@
+import asyncio
+import time
+import httpx
+
+
+class RateLimiter:
+    """
+    Asyncio token bucket allowing rate requests per second with bursts of up to burst requests.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Initialize with the sustained rate (requests per second) and the burst size.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Wait until a request may be sent.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class FetchResult:
+    """
+    Outcome of one OMDb lookup: the response details on success, an error message otherwise.
+    """
+
+    __slots__ = ('query', 'details', 'error')
+
+    def __init__(self, query, details=None, error=None):
+        self.query = query
+        self.details = details
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.details is not None
+
+
+class AsyncOmdbClient:
+    """
+    Concurrent OMDb client sharing one pooled httpx connection pool across lookups,
+    with a concurrency cap and a rate limiter for the API quota.
+    """
+
+    def __init__(self, api_url, api_key, concurrency=8, rate=10.0, timeout=10.0, cache=None, transport=None):
+        """
+        Initialize with the API URL and key, the maximum number of in-flight requests,
+        the request rate per second, the per-request timeout and an optional OmdbCache.
+        A custom httpx transport can be passed to serve requests locally.
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self.transport = transport
+        self._rate_limiter = RateLimiter(rate, burst=concurrency) if rate else None
+        self._semaphore = None
+        self._client = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=self.transport,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, title=None, imdb_id=None):
+        """
+        Look up one movie by title or IMDb ID. Never raises; failures are reported in the result.
+        """
+        query = imdb_id or title
+        details = self.cache.get(title, imdb_id) if self.cache else None
+        if details is None:
+            params = {'i': imdb_id} if imdb_id else {'t': title}
+            params['apikey'] = self.api_key
+            async with self._semaphore:
+                if self._rate_limiter:
+                    await self._rate_limiter.acquire()
+                try:
+                    response = await self._client.get(self.api_url, params=params)
+                    response.raise_for_status()
+                    details = response.json()
+                except (httpx.HTTPError, ValueError) as e:
+                    return FetchResult(query, error=f"Unable to fetch movie details. {e}")
+            if self.cache:
+                self.cache.put(details, title, imdb_id)
+        if details.get('Response') == 'False':
+            return FetchResult(query, error=details.get('Error', 'Movie not found!'))
+        return FetchResult(query, details=details)
+
+    async def fetch_titles(self, titles):
+        """
+        Look up many titles concurrently, returning results in input order.
+        """
+        return await asyncio.gather(*(self.fetch(title=title) for title in titles))
+
+    async def fetch_imdb_ids(self, imdb_ids):
+        """
+        Look up many IMDb IDs concurrently, returning results in input order.
+        """
+        return await asyncio.gather(*(self.fetch(imdb_id=imdb_id) for imdb_id in imdb_ids))
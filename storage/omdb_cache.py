@@ -0,0 +1,129 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+def normalize_title(title):
+    """
+    Normalize a title for use as a cache key: case-folded with collapsed whitespace.
+    """
+    return ' '.join(title.casefold().split())
+
+
+class OmdbCache:
+    """
+    Persistent SQLite cache of raw OMDb responses, keyed by normalized title and by IMDb ID.
+
+    Found movies are kept for ttl seconds, "movie not found" answers for the shorter
+    negative_ttl. max_entries caps the number of cache keys, checked on every put: the
+    least recently used keys beyond it are evicted. A found movie takes up to three keys
+    (the requested title, its canonical title and its IMDb ID), so the cache holds
+    between max_entries / 3 and max_entries responses.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600, negative_ttl=24 * 3600, max_entries=50000):
+        """
+        Initialize with the SQLite file path, TTLs in seconds and the cap on cache keys.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._evict()
+
+    @staticmethod
+    def _key(title=None, imdb_id=None):
+        """
+        Build the cache key for a title or IMDb ID lookup.
+        """
+        if imdb_id:
+            return f"i:{imdb_id.strip().lower()}"
+        return f"t:{normalize_title(title)}"
+
+    def get(self, title=None, imdb_id=None):
+        """
+        Return the cached OMDb response for a title or IMDb ID, or None if absent or expired.
+        Negative entries are returned as the cached {'Response': 'False', ...} payload.
+        """
+        key = self._key(title, imdb_id)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._connection:
+                self._connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, details, title=None, imdb_id=None):
+        """
+        Cache an OMDb response under the requested title or IMDb ID. Found movies are
+        also cached under their canonical title and IMDb ID.
+        """
+        now = time.time()
+        found = details.get('Response') != 'False'
+        expires_at = now + (self.ttl if found else self.negative_ttl)
+        keys = {self._key(title, imdb_id)}
+        if found:
+            if details.get('Title'):
+                keys.add(self._key(title=details['Title']))
+            if details.get('imdbID'):
+                keys.add(self._key(imdb_id=details['imdbID']))
+        payload = json.dumps(details, separators=(',', ':'))
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO responses (key, payload, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                [(key, payload, expires_at, now) for key in keys]
+            )
+            self._evict_locked()
+
+    def _evict(self):
+        """
+        Drop expired entries if the cache is over max_entries, then the least recently used ones beyond it.
+        """
+        with self._lock, self._connection:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """
+        _evict for callers holding the lock and a transaction. The count is read from the
+        last_used index, so a cache under its cap costs one small index scan per put.
+        """
+        count = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        count -= self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+        if count > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used, rowid LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        """
+        Remove every cached response.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """
+        Close the underlying SQLite connection.
+        """
+        self._connection.close()
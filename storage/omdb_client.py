@@ -0,0 +1,236 @@
+import email.utils
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fails fast after failure_threshold consecutive failures. After reset_timeout seconds
+    one trial request is let through: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Initialize with the consecutive failure count that opens the circuit and the cool-down in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """
+        'closed', 'open' or 'half-open'.
+        """
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """
+        Return whether a request may be sent now.
+        In the half-open state only one trial is allowed until it reports back.
+        """
+        with self._lock:
+            state = self.state
+            if state == 'half-open':
+                self.opened_at = time.monotonic()  # Hold further requests until the trial reports back
+            return state != 'open'
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class OmdbClient:
+    """
+    Blocking OMDb client with a pooled keep-alive session, connect/read timeouts,
+    jittered exponential backoff that honours Retry-After, and a circuit breaker.
+    A Retry-After longer than backoff_max is not waited out: the request fails instead.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, api_url, api_key, connect_timeout=3.05, read_timeout=10.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=10.0, pool_size=10, circuit_breaker=None):
+        """
+        Initialize with the API URL and key, timeouts in seconds, the number of retries
+        after the first attempt, the backoff parameters and the connection pool size.
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.counters = {
+            'requests': 0,
+            'retries': 0,
+            'errors': 0,
+            'rejected': 0,
+            'latency_total': 0.0,
+            'latency_max': 0.0,
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _record_latency(self, seconds):
+        with self._lock:
+            self.counters['requests'] += 1
+            self.counters['latency_total'] += seconds
+            self.counters['latency_max'] = max(self.counters['latency_max'], seconds)
+
+    def stats(self):
+        """
+        Return a snapshot of the request, retry, error and latency counters.
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        stats['latency_avg'] = stats['latency_total'] / stats['requests'] if stats['requests'] else 0.0
+        stats['circuit'] = self.circuit_breaker.state
+        return stats
+
+    @staticmethod
+    def _retry_after(response):
+        """
+        Parse a Retry-After header given in seconds or as an HTTP date, or return None.
+        """
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt: full-jitter exponential backoff,
+        or the server's Retry-After if that is longer. Returns None when Retry-After
+        exceeds backoff_max, since retrying any earlier would ignore the server.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    def get(self, **params):
+        """
+        Send one OMDb request and return the decoded JSON response.
+        Raises a requests RequestException once retries are exhausted or the circuit is open.
+        """
+        if not self.circuit_breaker.allow():
+            self._count('rejected')
+            raise CircuitOpenError("OMDb is unavailable; not sending requests for now.")
+        params['apikey'] = self.api_key
+        attempt = 0
+        while True:
+            response = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+                self._record_latency(time.perf_counter() - start)
+                if response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    details = response.json()
+                    self.circuit_breaker.record_success()
+                    return details
+                error = requests.exceptions.HTTPError(f"{response.status_code} error from OMDb", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record_latency(time.perf_counter() - start)
+                error = e
+            except (requests.exceptions.RequestException, ValueError):
+                self._count('errors')
+                self.circuit_breaker.record_failure()
+                raise
+            delay = self._backoff(attempt, response) if attempt < self.max_retries else None
+            if delay is None:
+                self._count('errors')
+                self.circuit_breaker.record_failure()
+                raise error
+            self._count('retries')
+            time.sleep(delay)
+            attempt += 1
+
+    def fetch(self, title=None, imdb_id=None):
+        """
+        Look up a movie by title or IMDb ID and return the raw OMDb response.
+        """
+        if imdb_id:
+            return self.get(i=imdb_id)
+        return self.get(t=title)
+
+    def close(self):
+        """
+        Close the pooled session.
+        """
+        self.session.close()
+
+
+def fetch_movie_details(omdb, cache, title=None, imdb_id=None):
+    """
+    Look up a movie by title or IMDb ID through an optional OmdbCache and an OmdbClient.
+    Returns the OMDb response, or None (after printing why) if it is unavailable.
+    """
+    try:
+        movie_details = cache.get(title, imdb_id) if cache else None
+        if movie_details is None:
+            movie_details = omdb.fetch(title, imdb_id)
+            if cache:
+                cache.put(movie_details, title, imdb_id)
+        if movie_details.get('Response') == 'False':
+            print(f"Error: {movie_details.get('Error')}")
+            return None
+        return movie_details
+    except requests.exceptions.RequestException as e:
+        print(f"Error: Unable to fetch movie details. {e}")
+        return None
+
+
+def movie_from_details(movie_details):
+    """
+    Build a stored movie record from an OMDb response.
+    """
+    return {
+        "title": movie_details['Title'],
+        "year": movie_details['Year'],
+        "rating": movie_details['imdbRating'],
+        "poster": movie_details['Poster'],
+        "imdb_id": movie_details['imdbID'],
+        "description": movie_details.get('Plot', 'No description available')
+    }
@@ -0,0 +1,186 @@
+import random
+from storage.movie import movie_rating
+
+
+class MovieSampler:
+    """
+    Random picks over a movie catalog, kept in sync on every mutation.
+
+    Keys live in a dense list with swap-remove on delete, so a uniform pick is one
+    index into the list. Rating weights live in a Fenwick tree over the same slots,
+    so a rating-weighted pick and a weight update are both O(log n). Movies without
+    a numeric rating have weight 0 and are never picked by the weighted modes.
+    """
+
+    def __init__(self, capacity=1024, rng=None):
+        """
+        Initialize an empty sampler with room for capacity movies.
+        rng is the random.Random to draw from (the module-level one by default).
+        """
+        self._rng = rng or random
+        self._keys = []
+        self._slots = {}
+        self._weights = [0.0] * capacity
+        self._tree = [0.0] * (capacity + 1)
+        self._weighted = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self, movies):
+        """
+        Rebuild from (title, details) pairs.
+        """
+        self.__init__(rng=self._rng)
+        weights = []
+        for key, movie in movies:
+            if key in self._slots:
+                weights[self._slots[key]] = self._weight(movie)
+            else:
+                self._slots[key] = len(self._keys)
+                self._keys.append(key)
+                weights.append(self._weight(movie))
+        self._weights = weights + [0.0] * max(len(self._weights) - len(weights), len(weights) // 2)
+        self._weighted = sum(weight > 0 for weight in weights)
+        self._build_tree()
+
+    @staticmethod
+    def _weight(movie):
+        """
+        Sampling weight of a movie: its rating, or 0 if it has none.
+        """
+        rating = movie_rating(movie)
+        return max(rating, 0.0) if rating is not None else 0.0
+
+    def _update(self, slot, delta):
+        """
+        Add delta to the Fenwick tree entry of slot.
+        """
+        tree = self._tree
+        index = slot + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _set_weight(self, slot, weight):
+        """
+        Set the weight of slot, keeping the tree and the weighted count in sync.
+        """
+        previous = self._weights[slot]
+        if weight == previous:
+            return
+        self._weighted += (weight > 0) - (previous > 0)
+        self._weights[slot] = weight
+        self._update(slot, weight - previous)
+
+    def _build_tree(self):
+        """
+        Build the Fenwick tree from the weights in O(n).
+        """
+        tree = [0.0] + self._weights
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _grow(self):
+        """
+        Double the capacity.
+        """
+        self._weights.extend([0.0] * len(self._weights))
+        self._build_tree()
+
+    def add(self, key, movie):
+        """
+        Store or replace the weight of one movie.
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            if slot == len(self._weights):
+                self._grow()
+            self._slots[key] = slot
+            self._keys.append(key)
+        self._set_weight(slot, self._weight(movie))
+
+    def remove(self, key):
+        """
+        Drop one movie, moving the last slot into its place.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        last = len(self._keys) - 1
+        if slot != last:
+            moved = self._keys[last]
+            self._keys[slot] = moved
+            self._slots[moved] = slot
+            self._set_weight(slot, self._weights[last])
+        self._set_weight(last, 0.0)
+        self._keys.pop()
+
+    def _total_weight(self):
+        """
+        Sum of all weights.
+        """
+        total = 0.0
+        index = len(self._tree) - 1
+        while index:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def _find(self, target):
+        """
+        Slot whose cumulative weight range contains target.
+        """
+        tree = self._tree
+        slot = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = slot + step
+            if following < len(tree) and tree[following] <= target:
+                slot = following
+                target -= tree[following]
+            step >>= 1
+        # Rounding in the running sums can land one past the last weighted slot
+        while slot and (slot >= len(self._keys) or not self._weights[slot]):
+            slot -= 1
+        return slot
+
+    def choice(self):
+        """
+        Return a uniformly random key, or None if the sampler is empty.
+        """
+        if not self._keys:
+            return None
+        return self._keys[self._rng.randrange(len(self._keys))]
+
+    def sample(self, k):
+        """
+        Return up to k distinct keys picked uniformly at random.
+        """
+        return self._rng.sample(self._keys, min(k, len(self._keys)))
+
+    def weighted_choice(self):
+        """
+        Return a random key with probability proportional to its rating, or None if no movie is rated.
+        """
+        if not self._weighted:
+            return None
+        return self._keys[self._find(self._rng.random() * self._total_weight())]
+
+    def weighted_sample(self, k):
+        """
+        Return up to k distinct keys picked with probability proportional to their rating.
+        Each pick is zeroed out for the following draws and restored afterwards.
+        """
+        picked = []
+        for _ in range(min(k, self._weighted)):
+            slot = self._find(self._rng.random() * self._total_weight())
+            picked.append((slot, self._weights[slot]))
+            self._set_weight(slot, 0.0)
+        for slot, weight in picked:
+            self._set_weight(slot, weight)
+        return [self._keys[slot] for slot, _ in picked]
@@ -0,0 +1,205 @@
+import bisect
+import heapq
+import re
+from collections import Counter
+from rapidfuzz import fuzz
+
+_WORD = re.compile(r'\w+')
+
+
+def trigrams(text):
+    """
+    Return the set of character trigrams of an already lowercased text, padded with
+    one space on each side so word boundaries and two-letter queries produce grams.
+    """
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def words(text):
+    """
+    Return the set of words of an already lowercased text.
+    """
+    return set(_WORD.findall(text))
+
+
+class SearchIndex:
+    """
+    Inverted index over movie titles (by trigram) and descriptions (by word).
+
+    Titles and descriptions are lowercased once when a movie is indexed; queries only
+    lowercase the query itself. Candidates are gathered by overlap with the query's
+    title trigrams and description words and ranked with RapidFuzz, so typos in titles
+    still match and only the top results are scored in full.
+
+    Posting lists longer than common_limit count as common. The rarer lists are walked
+    first; the common ones are then only intersected with the candidates found so far,
+    except the least common of them, which is also walked whenever the rarer lists yield
+    fewer than candidate_limit candidates (always, when every gram is common), so that
+    typos in the rare grams do not hide a title. A query therefore costs the size of its
+    rare posting lists plus, for short or rare queries, one common list, which can hold
+    a large part of the catalog; only the remaining common lists are never walked.
+    """
+
+    DESCRIPTION_WEIGHT = 0.8
+    TITLE_GRAM_OVERLAP = 2
+    DESCRIPTION_WORD_OVERLAP = 3
+
+    def __init__(self, index_descriptions=True, candidate_limit=500, min_score=60, common_limit=2000):
+        """
+        Initialize an empty index.
+        candidate_limit caps how many candidates are scored with RapidFuzz,
+        min_score drops candidates whose best fuzzy score is below it, and posting
+        lists longer than common_limit count as common.
+        """
+        self.index_descriptions = index_descriptions
+        self.candidate_limit = candidate_limit
+        self.min_score = min_score
+        self.common_limit = common_limit
+        self._titles = {}
+        self._descriptions = {}
+        self._title_grams = {}
+        self._description_words = {}
+        self._vocabulary = None  # Sorted description words for prefix lookups, rebuilt when words come or go
+
+    def rebuild(self, movies):
+        """
+        Rebuild the index from a movies dict.
+        """
+        self._titles.clear()
+        self._descriptions.clear()
+        self._title_grams.clear()
+        self._description_words.clear()
+        self._vocabulary = None
+        for key, movie in movies.items():
+            self.add(key, movie)
+
+    @staticmethod
+    def _post(postings, grams, key):
+        for gram in grams:
+            keys = postings.get(gram)
+            if keys is None:
+                postings[gram] = {key}
+            else:
+                keys.add(key)
+
+    @staticmethod
+    def _unpost(postings, grams, key):
+        for gram in grams:
+            keys = postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del postings[gram]
+
+    def add(self, key, movie):
+        """
+        Index one movie under its storage key.
+        """
+        if key in self._titles:
+            self.remove(key)
+        title = key.lower()
+        self._titles[key] = title
+        self._post(self._title_grams, trigrams(title), key)
+        if self.index_descriptions:
+            description = (movie.get('description') or '').lower()
+            if description:
+                self._descriptions[key] = description
+                grams = words(description)
+                if self._vocabulary is not None and not grams.issubset(self._description_words.keys()):
+                    self._vocabulary = None
+                self._post(self._description_words, grams, key)
+
+    def remove(self, key, movie=None):
+        """
+        Drop one movie from the index.
+        """
+        title = self._titles.pop(key, None)
+        if title is None:
+            return
+        self._unpost(self._title_grams, trigrams(title), key)
+        description = self._descriptions.pop(key, None)
+        if description:
+            grams = words(description)
+            self._unpost(self._description_words, grams, key)
+            if self._vocabulary is not None and not grams.issubset(self._description_words.keys()):
+                self._vocabulary = None
+
+    def _word_postings(self, word):
+        """
+        Posting lists of the description words starting with word (only word itself for one- or
+        two-letter words), so 'dream' also finds descriptions saying 'dreams'.
+        """
+        if len(word) < 3:
+            keys = self._description_words.get(word)
+            return [keys] if keys else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._description_words)
+        start = bisect.bisect_left(self._vocabulary, word)
+        end = bisect.bisect_left(self._vocabulary, word + '\U0010ffff', start)
+        return [self._description_words[match] for match in self._vocabulary[start:end]]
+
+    def _candidates(self, query):
+        """
+        Return the keys sharing the most title trigrams and description words with the query.
+        """
+        # (posting lists, their total size, overlap weight): a query word can match several description words
+        postings = [([self._title_grams[gram]], len(self._title_grams[gram]), self.TITLE_GRAM_OVERLAP)
+                    for gram in trigrams(query) if gram in self._title_grams]
+        for word in words(query):
+            group = self._word_postings(word)
+            if group:
+                postings.append((group, sum(map(len, group)), self.DESCRIPTION_WORD_OVERLAP))
+        if not postings:
+            return []
+        postings.sort(key=lambda item: item[1])
+        overlap = Counter()
+        common = []
+        for group, size, weight in postings:
+            if size > self.common_limit:
+                common.append((group, weight))
+                continue
+            for keys in group:
+                for _ in range(weight):
+                    overlap.update(keys)  # Counting an iterable runs in C; a {key: weight} mapping would not
+        if common and len(overlap) < self.candidate_limit:
+            # The rare grams may all come from a typo: also consider the movies sharing the least common one
+            group, weight = common.pop(0)
+            for keys in group:
+                for _ in range(weight):
+                    overlap.update(keys)
+        for group, weight in common:
+            for keys in group:
+                matches = keys.intersection(overlap)
+                for _ in range(weight):
+                    overlap.update(matches)
+        if len(overlap) <= self.candidate_limit:
+            return list(overlap)
+        return [key for key, _ in heapq.nlargest(self.candidate_limit, overlap.items(), key=lambda item: item[1])]
+
+    def _score(self, query, key):
+        """
+        Fuzzy score of one candidate: the better of its title and (down-weighted) description match.
+        """
+        title = self._titles[key]
+        if query in title:
+            return 100 + len(query) / len(title)  # Exact substrings first, tighter matches on top
+        score = fuzz.WRatio(query, title)
+        description = self._descriptions.get(key)
+        if description:
+            score = max(score, fuzz.partial_ratio(query, description) * self.DESCRIPTION_WEIGHT)
+        return score
+
+    def search(self, query, limit=10):
+        """
+        Return up to limit keys best matching query, best first.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        scored = []
+        for key in self._candidates(query):
+            score = self._score(query, key)
+            if score >= self.min_score:
+                scored.append((score, key))
+        return [key for _, key in heapq.nlargest(limit, scored)]
@@ -0,0 +1,152 @@
+import json
+import os
+import stat
+import tempfile
+import msgpack
+import zstandard
+
+
+# Process umask, read once: mkstemp creates files as 0600, new files get the mode open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class SnapshotDecodeError(ValueError):
+    """
+    Raised when a snapshot file cannot be decoded by its codec.
+    """
+
+
+class JsonCodec:
+    """
+    Human-readable indented JSON snapshots (the default for '.json' files).
+    """
+
+    def encode(self, movies):
+        """
+        Serialize the movies dict to bytes.
+        """
+        return json.dumps(movies, indent=4).encode('utf-8')
+
+    def decode(self, payload):
+        """
+        Deserialize bytes back into a movies dict.
+        """
+        try:
+            return json.loads(payload.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise SnapshotDecodeError(str(e)) from e
+
+
+class MsgpackZstdCodec:
+    """
+    Compact binary snapshots: msgpack serialization compressed with zstandard.
+    """
+
+    def __init__(self, level=3):
+        """
+        Initialize with the zstandard compression level.
+        """
+        self.level = level
+
+    def encode(self, movies):
+        """
+        Serialize the movies dict to bytes.
+        """
+        return zstandard.ZstdCompressor(level=self.level).compress(msgpack.packb(movies, use_bin_type=True))
+
+    def decode(self, payload):
+        """
+        Deserialize bytes back into a movies dict.
+        """
+        try:
+            return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(payload), raw=False)
+        except (zstandard.ZstdError, msgpack.UnpackException, ValueError) as e:
+            raise SnapshotDecodeError(str(e)) from e
+
+
+_CODECS = {
+    '.json': JsonCodec(),
+    '.msgpack.zst': MsgpackZstdCodec(),
+    '.mpk.zst': MsgpackZstdCodec(),
+}
+
+
+def register_codec(extension, codec):
+    """
+    Register a codec (an object with encode/decode methods) for a file extension.
+    """
+    _CODECS[extension.lower()] = codec
+
+
+def codec_for_path(path):
+    """
+    Pick the snapshot codec from the file extension, falling back to JSON.
+    The longest matching extension wins, so '.msgpack.zst' beats '.zst'.
+    """
+    name = path.lower()
+    for extension in sorted(_CODECS, key=len, reverse=True):
+        if name.endswith(extension):
+            return _CODECS[extension]
+    return _CODECS['.json']
+
+
+def write_atomic_chunks(path, chunks):
+    """
+    Write an iterable of byte chunks to path so that readers see either the old or the new
+    file, never a partial one: stream into a temp file in the same directory, fsync it,
+    rename it over the target and fsync the directory. The target keeps its permissions.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            if hasattr(os, 'fchmod'):  # Not available on Windows
+                os.fchmod(file.fileno(), mode)
+            file.writelines(chunks)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened for fsync on this platform
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def write_atomic(path, payload):
+    """
+    Atomically replace path with the given bytes.
+    """
+    write_atomic_chunks(path, [payload])
+
+
+def read_snapshot(path):
+    """
+    Read and decode a snapshot file with the codec matching its extension.
+    """
+    with open(path, 'rb') as file:
+        payload = file.read()
+    return codec_for_path(path).decode(payload)
+
+
+def write_snapshot(path, movies):
+    """
+    Encode and atomically write a snapshot file with the codec matching its extension.
+    """
+    write_atomic(path, codec_for_path(path).encode(movies))
@@ -0,0 +1,121 @@
+import numpy as np
+from storage.movie import movie_rating, movie_year
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class RatingStats:
+    """
+    Columnar rating and year arrays kept in sync with a movie catalog.
+
+    Each movie owns one slot in the arrays; removal swaps the last slot into the hole,
+    so updates are O(1). Non-numeric ratings are stored as NaN and skipped. Ratings
+    outside 0-10 count everywhere as they are, but fall into the histogram's first or
+    last bin, so its bins always add up to count. The summary is computed in one
+    vectorized pass and cached until the next mutation.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize empty columns with room for capacity movies.
+        """
+        self._capacity = capacity
+        self._ratings = np.full(capacity, np.nan)
+        self._years = np.full(capacity, np.nan)
+        self._keys = []
+        self._slots = {}
+        self._summary = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self, movies):
+        """
+        Rebuild the columns from (title, details) pairs, starting again from the initial capacity.
+        """
+        self.__init__(self._capacity)
+        for key, movie in movies:
+            self.add(key, movie)
+
+    def _grow(self):
+        """
+        Double the column capacity.
+        """
+        extra = np.full(len(self._ratings), np.nan)
+        self._ratings = np.concatenate([self._ratings, extra])
+        self._years = np.concatenate([self._years, extra])
+
+    def add(self, key, movie):
+        """
+        Store or replace the rating and year of one movie.
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            if slot == len(self._ratings):
+                self._grow()
+            self._slots[key] = slot
+            self._keys.append(key)
+        rating = movie_rating(movie)
+        year = movie_year(movie)
+        self._ratings[slot] = np.nan if rating is None else rating
+        self._years[slot] = np.nan if year is None else year
+        self._summary = None
+
+    def remove(self, key):
+        """
+        Drop one movie, moving the last slot into its place.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        last = len(self._keys) - 1
+        if slot != last:
+            moved = self._keys[last]
+            self._keys[slot] = moved
+            self._slots[moved] = slot
+            self._ratings[slot] = self._ratings[last]
+            self._years[slot] = self._years[last]
+        self._keys.pop()
+        self._ratings[last] = np.nan
+        self._years[last] = np.nan
+        self._summary = None
+
+    def summary(self):
+        """
+        Return rating statistics over rated movies, or None if no movie has a numeric rating:
+        count, mean, median, percentiles, a 0-10 histogram, per-decade count and mean, best and worst.
+        """
+        if self._summary is not None:
+            return self._summary
+        count = len(self._keys)
+        ratings = self._ratings[:count]
+        rated = ~np.isnan(ratings)
+        values = ratings[rated]
+        if not values.size:
+            return None
+
+        percentiles = np.percentile(values, PERCENTILES)
+        histogram, edges = np.histogram(np.clip(values, 0, 10), bins=10, range=(0, 10))
+        best = int(np.nanargmax(ratings))
+        worst = int(np.nanargmin(ratings))
+
+        years = self._years[:count][rated]
+        dated = ~np.isnan(years)
+        decades, inverse = np.unique((years[dated] // 10 * 10).astype(int), return_inverse=True)
+        decade_counts = np.bincount(inverse, minlength=len(decades))
+        decade_sums = np.bincount(inverse, weights=values[dated], minlength=len(decades))
+
+        self._summary = {
+            'count': int(values.size),
+            'unrated': int(count - values.size),
+            'mean': float(values.mean()),
+            'median': float(percentiles[PERCENTILES.index(50)]),
+            'percentiles': {p: float(v) for p, v in zip(PERCENTILES, percentiles)},
+            'histogram': [(float(low), float(high), int(n)) for low, high, n in zip(edges, edges[1:], histogram)],
+            'decades': {int(d): {'count': int(n), 'mean': float(s / n)}
+                        for d, n, s in zip(decades, decade_counts, decade_sums)},
+            'best': (self._keys[best], float(ratings[best])),
+            'worst': (self._keys[worst], float(ratings[worst])),
+        }
+        return self._summary
@@ -1,47 +1,211 @@
 import csv
-from istorage import IStorage
+import io
+import os
+from storage.file_lock import FileLock
+from storage.movie import parse_rating
+from storage.istorage import IStorage
+from storage.snapshot import write_atomic
+from storage.stats import RatingStats
+
+FIELDNAMES = ['title', 'year', 'rating', 'poster']
+
+
+def _parse_rating(value):
+    """
+    Ratings are stored as floats; non-numeric ratings such as "N/A" are kept as they are.
+    """
+    rating = parse_rating(value)
+    return value if rating is None else rating
+
 
 class StorageCsv(IStorage):
     """
     CSV storage implementation for movie data.
+
+    The parsed file is cached in memory and only re-read when the CSV (or its tombstone
+    file) changes size or mtime on disk. Adds append a single row. Deletes and updates are
+    appended to '<file_path>.tombstones' and folded into the CSV by compact(), which runs
+    once compact_threshold tombstones accumulate and on close().
+
+    Writes hold an exclusive lock on '<file_path>.lock' from the change check to the
+    append, so a row another process writes in between is loaded before our own write
+    and the signature recorded after it only covers rows this instance has seen.
     """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, compact_threshold=1000):
         """
-        Initialize with the path to the CSV file.
+        Initialize with the path to the CSV file and the tombstone count that triggers compaction.
         """
         self.file_path = file_path
+        self.tombstone_path = f"{file_path}.tombstones"
+        self.compact_threshold = compact_threshold
+        self._movies = None
+        self._signature = None
+        self._tombstones = 0
+        self._tombstoned = set()
+        self._stats = None
+        self._stats_source = None
+        self._lock = FileLock(f"{file_path}.lock")
+
+    def _stat_signature(self):
+        """
+        (mtime, size) of the CSV and tombstone files, used to detect changes made by other processes.
+        """
+        signature = []
+        for path in (self.file_path, self.tombstone_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _parse_rows(self, file):
+        """
+        Parse movie rows with csv.reader and header positions, avoiding a dict per parsed row.
+        """
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        title_at, year_at, rating_at, poster_at = (header.index(name) for name in FIELDNAMES)
+        return {
+            row[title_at]: {'year': row[year_at], 'rating': _parse_rating(row[rating_at]), 'poster': row[poster_at]}
+            for row in reader if row
+        }
 
     def _load_movies(self):
         """
-        Load movies from the CSV file.
-        """
-        movies = {}
-        with open(self.file_path, mode='r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                movies[row['title']] = {
-                    'year': row['year'],
-                    'rating': float(row['rating']),
-                    'poster': row['poster']
-                }
+        Load movies from the CSV file, reusing the cached parse while the files are unchanged.
+        """
+        signature = self._stat_signature()
+        if self._movies is not None and signature == self._signature:
+            return self._movies
+        with self._lock.shared():
+            return self._reload()
+
+    def _reload(self):
+        """
+        Parse the CSV and tombstone files from scratch and remember their signature.
+        """
+        signature = self._stat_signature()
+        try:
+            with open(self.file_path, mode='r', newline='') as file:
+                movies = self._parse_rows(file)
+        except FileNotFoundError:
+            movies = {}
+        self._tombstones = 0
+        self._tombstoned = set()
+        try:
+            with open(self.tombstone_path, mode='r', newline='') as file:
+                for op, title, rating in csv.reader(file):
+                    if op == 'del':
+                        movies.pop(title, None)
+                    elif title in movies:
+                        movies[title]['rating'] = _parse_rating(rating)
+                    self._tombstones += 1
+                    self._tombstoned.add(title)
+        except FileNotFoundError:
+            pass
+        self._movies = movies
+        self._signature = signature
         return movies
 
     def _save_movies(self, movies):
         """
-        Save movies to the CSV file.
+        Atomically save movies to the CSV file.
+        """
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(FIELDNAMES)
+        writer.writerows([title, details['year'], details['rating'], details['poster']]
+                         for title, details in movies.items())
+        write_atomic(self.file_path, buffer.getvalue().encode('utf-8'))
+
+    def _append(self, path, row, header=None):
+        """
+        Append one CSV row to path, writing the header first if the file is new, and
+        refresh the cached signature so our own write does not invalidate the cache.
+        Callers hold the exclusive lock and loaded the movies under it.
+        """
+        with open(path, mode='a', newline='') as file:
+            writer = csv.writer(file)
+            if header and file.tell() == 0:
+                writer.writerow(header)
+            writer.writerow(row)
+        self._signature = self._stat_signature()
+
+    def _add_tombstone(self, op, title, rating=''):
+        """
+        Record a delete or rating update, compacting once enough have accumulated.
+        """
+        self._append(self.tombstone_path, [op, title, rating])
+        self._tombstones += 1
+        self._tombstoned.add(title)
+        if self._tombstones >= self.compact_threshold:
+            self.compact()
+
+    def _rewrite(self, movies):
+        """
+        Rewrite the CSV file from movies, which already reflects every tombstone, and drop the tombstones.
+        """
+        self._save_movies(movies)
+        try:
+            os.remove(self.tombstone_path)
+        except FileNotFoundError:
+            pass
+        self._tombstones = 0
+        self._tombstoned = set()
+        self._signature = self._stat_signature()
+
+    def compact(self):
+        """
+        Fold the tombstones into the CSV file and remove the tombstone file.
+        """
+        with self._lock.exclusive():
+            movies = self._load_movies()
+            if self._tombstones:
+                self._rewrite(movies)
+
+    def close(self):
+        """
+        Compact pending tombstones into the CSV file.
+        """
+        self.compact()
+
+    @property
+    def movies(self):
+        """
+        The cached movies dict, refreshed if the files changed on disk.
+        """
+        return self._load_movies()
+
+    def iter_movies(self):
+        """
+        Yield (title, details) pairs in file order.
         """
-        with open(self.file_path, mode='w', newline='') as file:
-            fieldnames = ['title', 'year', 'rating', 'poster']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for title, details in movies.items():
-                writer.writerow({
-                    'title': title,
-                    'year': details['year'],
-                    'rating': details['rating'],
-                    'poster': details['poster']
-                })
+        return iter(self._load_movies().items())
+
+    def movie_stats(self):
+        """
+        Return rating statistics (see RatingStats.summary), or None if no movie is rated.
+        """
+        movies = self._load_movies()
+        if self._stats_source is not movies:
+            self._stats = RatingStats()
+            self._stats.rebuild(movies.items())
+            self._stats_source = movies
+        return self._stats.summary()
+
+    def _update_stats(self, movies, title):
+        """
+        Keep the stats columns in sync with one changed movie, if they were built from this parse.
+        """
+        if self._stats_source is movies:
+            if title in movies:
+                self._stats.add(title, movies[title])
+            else:
+                self._stats.remove(title)
 
     def list_movies(self):
         """
@@ -54,21 +218,33 @@ class StorageCsv(IStorage):
 
     def add_movie(self, title, year, rating, poster):
         """
-        Add a new movie.
+        Add a new movie by appending one row.
         """
-        movies = self._load_movies()
-        movies[title] = {'year': year, 'rating': float(rating), 'poster': poster}
-        self._save_movies(movies)
+        movie = {'year': year, 'rating': float(rating), 'poster': poster}
+        with self._lock.exclusive():
+            movies = self._load_movies()
+            if title in movies or title in self._tombstoned:
+                # An appended row would be shadowed by the stored row or its tombstones, so rewrite instead
+                movies[title] = movie
+                self._rewrite(movies)
+            else:
+                self._append(self.file_path, [title, year, movie['rating'], poster], header=FIELDNAMES)
+                movies[title] = movie
+            self._update_stats(movies, title)
         print("Movie added successfully!")
 
     def delete_movie(self, title):
         """
         Delete a movie by title.
         """
-        movies = self._load_movies()
-        if title in movies:
-            del movies[title]
-            self._save_movies(movies)
+        with self._lock.exclusive():
+            movies = self._load_movies()
+            found = title in movies
+            if found:
+                del movies[title]
+                self._update_stats(movies, title)
+                self._add_tombstone('del', title)
+        if found:
             print("Movie deleted successfully!")
         else:
             print("Movie not found. Please try again with one of the list")
@@ -77,10 +253,14 @@ class StorageCsv(IStorage):
         """
         Update the rating of a movie.
         """
-        movies = self._load_movies()
-        if title in movies:
-            movies[title]['rating'] = float(rating)
-            self._save_movies(movies)
+        with self._lock.exclusive():
+            movies = self._load_movies()
+            found = title in movies
+            if found:
+                movies[title]['rating'] = float(rating)
+                self._update_stats(movies, title)
+                self._add_tombstone('upd', title, float(rating))
+        if found:
             print("Movie rating updated successfully!")
         else:
-            print("Movie not found. Please try again with one of the list")
\ No newline at end of file
+            print("Movie not found. Please try again with one of the list")
@@ -1,64 +1,290 @@
-import json
-import requests
+import os
+from contextlib import contextmanager
+from storage.file_lock import FileLock
+from storage.indexes import MovieIndex
 from storage.istorage import IStorage
+from storage.journal import Journal
+from storage.movie import Movie
+from storage.omdb_client import OmdbClient, fetch_movie_details, movie_from_details
+from storage.sampler import MovieSampler
+from storage.search_index import SearchIndex
+from storage.snapshot import SnapshotDecodeError, read_snapshot, write_snapshot
+from storage.stats import RatingStats
 
 class StorageJson(IStorage):
     """
     Combined API and JSON storage implementation for movie data.
     """
 
-    def __init__(self, api_url, api_key, file_path):
+    def __init__(self, api_url, api_key, file_path, journal=False, compact_threshold=1000, cache=None,
+                 omdb_client=None):
         """
         Initialize with the API URL, API key, and path to the JSON file.
+        The snapshot format follows the file extension: '.json' for indented JSON,
+        '.msgpack.zst' for compressed msgpack. With journal=True, mutations are
+        appended to '<file_path>.journal' and folded back into the JSON file once
+        compact_threshold records accumulate. An optional OmdbCache serves repeated
+        OMDb lookups without hitting the API; lookups that miss it go through
+        omdb_client (an OmdbClient for api_url by default).
         """
         self.api_url = api_url
         self.api_key = api_key
         self.file_path = file_path
-        self.movies = self._load_movies()
+        self.cache = cache
+        self.omdb = omdb_client or OmdbClient(api_url, api_key)
+        self.compact_threshold = compact_threshold
+        self.version = 0  # Bumped on every mutation and reload, so cached query results can be invalidated
+        self._batch_depth = 0
+        self._pending = {}
+        self._lock = FileLock(f"{file_path}.lock")
+        self._journal = Journal(f"{file_path}.journal") if journal else None
+        with self._lock.shared():
+            self.movies = self._load_movies()
+            self._signature = self._file_signature()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """
+        Rebuild every in-memory index from self.movies.
+        """
+        self._index = MovieIndex()
+        self._index.rebuild(self.movies)
+        self._search = None  # Built on the first search
+        self._stats = RatingStats()
+        self._stats.rebuild(self.movies.items())
+        self._sampler = MovieSampler()
+        self._sampler.rebuild(self.movies.items())
+
+    def _file_signature(self):
+        """
+        (inode, mtime, size) of the snapshot and journal files. Any commit by any process
+        changes it, so a different signature means self.movies is stale.
+        """
+        paths = [self.file_path, self._journal.path] if self._journal else [self.file_path]
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
 
     def _load_movies(self):
         """
-        Load movies from the JSON file.
+        Load movies from the snapshot file (and journal) into Movie records.
+        An undecodable snapshot is moved aside to '<file_path>.corrupt' so that
+        the next save cannot overwrite it.
         """
         try:
-            with open(self.file_path, 'r') as file:
-                return json.load(file)
+            movies = read_snapshot(self.file_path)
         except FileNotFoundError:
             print(f"File not found: {self.file_path}. Starting with an empty movie list.")
-            return {}
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from file: {self.file_path}. Starting with an empty movie list.")
-            return {}
+            movies = {}
+        except SnapshotDecodeError:
+            corrupt_path = f"{self.file_path}.corrupt"
+            os.replace(self.file_path, corrupt_path)
+            print(f"Error decoding file: {self.file_path}. Moved it to {corrupt_path}. "
+                  f"Starting with an empty movie list.")
+            movies = {}
+        if self._journal:
+            self._journal.replay(movies)
+        return {key: Movie.from_dict(movie) for key, movie in movies.items()}
+
+    def _merge_if_stale(self):
+        """
+        If another process committed since we last loaded or wrote, reload the catalog and
+        re-apply our uncommitted changes on top of it. Our changes win for the titles they touch.
+        Must be called with the lock held. Returns True if the catalog was reloaded.
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False
+        local = {key: self.movies.get(key) for key in self._pending}
+        if self._journal:
+            self._journal.close()  # Our handle may point to a journal another process compacted away
+        movies = self._load_movies()
+        for key, movie in local.items():
+            if movie is None:
+                movies.pop(key, None)
+            else:
+                movies[key] = movie
+        self._reindex(movies)
+        self._signature = signature
+        self.version += 1
+        return True
+
+    def _reindex(self, movies):
+        """
+        Replace self.movies with a reloaded catalog, applying only the difference to the indexes:
+        with another active writer, rebuilding them on every merge would make each commit O(n log n).
+        When most of the catalog changed, the sorted indexes are rebuilt instead, since inserting
+        into them one by one would cost more; the search index is always patched.
+        """
+        removed = [(key, movie) for key, movie in self.movies.items() if key not in movies]
+        changed = [(key, movie, self.movies.get(key)) for key, movie in movies.items()
+                   if self.movies.get(key) != movie]
+        search = self._search
+        if search is not None:
+            for key, movie in removed:
+                search.remove(key, movie)
+            for key, movie, previous in changed:
+                if previous is None or previous.description != movie.description:
+                    search.add(key, movie)
+        if len(removed) + len(changed) > len(movies) // 2:
+            self.movies = movies
+            self._rebuild_indexes()
+            self._search = search
+            return
+        for key, movie in removed:
+            self._index.remove(key, movie)
+            self._stats.remove(key)
+            self._sampler.remove(key)
+        for key, movie, previous in changed:
+            if previous is not None:
+                self._index.remove(key, previous)
+            self._index.add(key, movie)
+            self._stats.add(key, movie)
+            self._sampler.add(key, movie)
+        self.movies = movies
+
+    def refresh(self):
+        """
+        Reload the catalog if another process changed it. Costs two stat calls when nothing changed.
+        Returns True if the catalog was reloaded.
+        """
+        if self._file_signature() == self._signature:
+            return False
+        with self._lock.shared():
+            return self._merge_if_stale()
 
     def _save_movies(self):
         """
-        Save movies to the JSON file.
+        Atomically save movies to the snapshot file.
         """
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(self.movies, file, indent=4)
+            write_snapshot(self.file_path, {key: movie.to_dict() for key, movie in self.movies.items()})
         except IOError as e:
             print(f"Error saving movies to file: {self.file_path}. {e}")
 
-    def _fetch_movie_details(self, title):
+    def _commit(self, key):
+        """
+        Persist a change to key: append it to the journal in journal mode,
+        otherwise rewrite the JSON file. Inside a batch, persisting is deferred.
+        """
+        self._pending[key] = None
+        if not self._batch_depth:
+            self._flush(compact=False)
+
+    def _flush(self, compact):
         """
-        Fetch movie details from the OMDb API.
+        Commit the pending changes under the exclusive lock, merging in other processes'
+        commits first. In journal mode the changes are appended to the journal, or with
+        compact=True folded into one snapshot write.
         """
-        params = {
-            't': title,
-            'apikey': self.api_key
-        }
+        with self._lock.exclusive():
+            self._merge_if_stale()
+            pending, self._pending = self._pending, {}
+            if not self._journal:
+                self._save_movies()
+            elif compact or self._journal.record_count + len(pending) >= self.compact_threshold:
+                self._compact()
+            else:
+                for key in pending:
+                    movie = self.movies.get(key)
+                    if movie is None:
+                        self._journal.append('del', key)
+                    else:
+                        self._journal.append('put', key, movie.to_dict())
+            self._signature = self._file_signature()
+
+    def _put(self, key, movie):
+        """
+        Store a movie (a Movie or a movie dict) under key, keeping the indexes in sync,
+        and persist the change.
+        """
+        movie = Movie.from_dict(movie)
+        previous = self.movies.get(key)
+        if previous is not None:
+            self._index.remove(key, previous)
+        self.movies[key] = movie
+        self._index.add(key, movie)
+        if self._search is not None and (previous is None or previous.description != movie.description):
+            self._search.add(key, movie)
+        self._stats.add(key, movie)
+        self._sampler.add(key, movie)
+        self.version += 1
+        self._commit(key)
+
+    def _delete(self, key):
+        """
+        Remove the movie stored under key, keeping the indexes in sync, and persist the change.
+        """
+        movie = self.movies.pop(key)
+        self._index.remove(key, movie)
+        if self._search is not None:
+            self._search.remove(key, movie)
+        self._stats.remove(key)
+        self._sampler.remove(key)
+        self.version += 1
+        self._commit(key)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group mutations so they are persisted with a single snapshot write
+        when the outermost batch exits.
+        """
+        self._batch_depth += 1
         try:
-            response = requests.get(self.api_url, params=params)
-            response.raise_for_status()
-            movie_details = response.json()
-            if movie_details.get('Response') == 'False':
-                print(f"Error: {movie_details.get('Error')}")
-                return None
-            return movie_details
-        except requests.exceptions.RequestException as e:
-            print(f"Error: Unable to fetch movie details. {e}")
-            return None
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending:
+                self._flush(compact=True)
+
+    def _compact(self):
+        """
+        Write the snapshot and drop the journal. Must be called with the lock held.
+        """
+        self._journal.sync()
+        self._save_movies()
+        self._journal.truncate()
+
+    def compact(self):
+        """
+        Fold the journal back into the JSON file and truncate it.
+        """
+        if self._journal:
+            with self._lock.exclusive():
+                self._merge_if_stale()
+                self._compact()
+                self._signature = self._file_signature()
+
+    def close(self):
+        """
+        Compact the journal into the JSON file if this instance appended to it, and release
+        the OMDb session and cache. Instances that only read leave the files untouched.
+        """
+        if self._journal and self._journal.appended:
+            self.compact()
+        elif self._journal:
+            self._journal.close()
+        if self.cache:
+            self.cache.close()
+        self.omdb.close()
+
+    def _fetch_movie_details(self, title=None, imdb_id=None):
+        """
+        Fetch movie details from the OMDb API by title or IMDb ID, going through the cache if one is set.
+        """
+        return fetch_movie_details(self.omdb, self.cache, title, imdb_id)
+
+    def iter_movies(self):
+        """
+        Yield (title, details) pairs in storage order.
+        """
+        return iter(self.movies.items())
 
     def _fetch_movies(self):
         """
@@ -83,20 +309,23 @@ class StorageJson(IStorage):
             print(f"Error listing movies: {e}")
             return []
 
+    def add_movie_details(self, movie_details):
+        """
+        Add a movie from an already fetched OMDb response and return its stored title.
+        """
+        title = movie_details['Title']
+        if self._index.find(title) is not None:
+            raise Exception("Movie already exists.")
+        self._put(title, movie_from_details(movie_details))
+        return title
+
     def add_movie(self, title, year=None, rating=None, poster=None, description=None):
-        if title.lower() in (movie.lower() for movie in self.movies):
+        if self._index.find(title) is not None:
             raise Exception("Movie already exists.")
         if not year or not rating or not poster or not description:
             movie_details = self._fetch_movie_details(title)
             if movie_details:
-                movie = {
-                    "title": movie_details['Title'],
-                    "year": movie_details['Year'],
-                    "rating": movie_details['imdbRating'],
-                    "poster": movie_details['Poster'],
-                    "imdb_id": movie_details['imdbID'],
-                    "description": movie_details.get('Plot', 'No description available')
-                }
+                movie = movie_from_details(movie_details)
             else:
                 raise Exception("Error: Movie not found.")
         else:
@@ -107,19 +336,16 @@ class StorageJson(IStorage):
                 'poster': poster,
                 'description': description
             }
-        self.movies[title] = movie
-        self._save_movies()
+        self._put(title, movie)
         print("Movie added successfully!")
 
     def delete_movie(self, title):
         """
         Delete a movie by title.
         """
-        title_lower = title.lower()
-        movies_lower = {k.lower(): k for k in self.movies.keys()}
-        if title_lower in movies_lower:
-            del self.movies[movies_lower[title_lower]]
-            self._save_movies()
+        key = self._index.find(title)
+        if key is not None:
+            self._delete(key)
             print("Movie deleted successfully!")
         else:
             raise Exception("Error: Movie not found.")
@@ -128,11 +354,68 @@ class StorageJson(IStorage):
         """
         Update the rating of a movie.
         """
-        title_lower = title.lower()
-        movies_lower = {k.lower(): k for k in self.movies.keys()}
-        if title_lower in movies_lower:
-            self.movies[movies_lower[title_lower]]['rating'] = float(rating)
-            self._save_movies()
+        key = self._index.find(title)
+        if key is not None:
+            self._put(key, self.movies[key].replace(rating=float(rating)))
             print("Movie rating updated successfully!")
         else:
-            raise Exception("Error: Movie not found.")
\ No newline at end of file
+            raise Exception("Error: Movie not found.")
+
+    def update_movie_details(self, title, changes):
+        """
+        Apply a dict of changed fields (year, rating, poster, description) to a movie.
+        """
+        key = self._index.find(title)
+        if key is None:
+            raise Exception("Error: Movie not found.")
+        self._put(key, self.movies[key].replace(**changes))
+
+    def find_movie(self, title):
+        """
+        Return the stored title matching title case-insensitively, or None.
+        """
+        return self._index.find(title)
+
+    def movies_sorted_by_rating(self, limit=None):
+        """
+        Return (title, details) pairs ordered by rating, highest first.
+        Movies without a numeric rating come last.
+        """
+        return [(key, self.movies[key]) for key in self._index.top_rated(limit)]
+
+    def movies_in_years(self, start=None, end=None):
+        """
+        Return (title, details) pairs released between start and end (inclusive), ordered by year.
+        """
+        return [(key, self.movies[key]) for key in self._index.in_years(start, end)]
+
+    def search_movies(self, query, limit=10):
+        """
+        Return up to limit (title, details) pairs matching query by title or description,
+        tolerating typos, best match first.
+        """
+        if self._search is None:
+            self._search = SearchIndex()
+            self._search.rebuild(self.movies)
+        return [(key, self.movies[key]) for key in self._search.search(query, limit)]
+
+    def movie_stats(self):
+        """
+        Return rating statistics (see RatingStats.summary), or None if no movie is rated.
+        """
+        return self._stats.summary()
+
+    def random_movie(self, weighted=False):
+        """
+        Return a random (title, details) pair, or None if there are no movies.
+        With weighted=True, higher rated movies are proportionally more likely and unrated ones are skipped.
+        """
+        key = self._sampler.weighted_choice() if weighted else self._sampler.choice()
+        return None if key is None else (key, self.movies[key])
+
+    def sample_movies(self, k, weighted=False):
+        """
+        Return up to k distinct random (title, details) pairs, weighted by rating if requested.
+        """
+        keys = self._sampler.weighted_sample(k) if weighted else self._sampler.sample(k)
+        return [(key, self.movies[key]) for key in keys]
@@ -0,0 +1,368 @@
+import heapq
+import json
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from rapidfuzz import fuzz, process, utils
+from storage.movie import movie_rating
+from storage.istorage import IStorage
+from storage.omdb_client import OmdbClient, fetch_movie_details, movie_from_details
+from storage.sampler import MovieSampler
+from storage.snapshot import read_snapshot, write_atomic_chunks
+from storage.stats import RatingStats
+
+
+def encode_record(key, movie):
+    """
+    Encode one line of a records file: the JSON key, a tab, then the JSON movie ('null' for a deletion).
+    JSON escapes tabs and newlines inside strings, so the first raw tab and newline are unambiguous.
+    """
+    return (json.dumps(key) + '\t' + json.dumps(movie, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class LazyMovies(Mapping):
+    """
+    Read-only mapping view over a LazyStorageJson: titles come from the offset index
+    and records are decoded only when accessed.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def __getitem__(self, key):
+        return self._storage.get_movie(key)
+
+    def __iter__(self):
+        return iter(list(self._storage._offsets))
+
+    def __len__(self):
+        return len(self._storage._offsets)
+
+    def __contains__(self, key):
+        return key in self._storage._offsets
+
+    def items(self):
+        return self._storage.iter_movies()
+
+
+class LazyStorageJson(IStorage):
+    """
+    Storage for catalogs larger than memory, backed by a line-delimited records file.
+
+    Opening the file only builds an index of title -> (offset, length) by decoding each
+    line's key; movie records are decoded on demand from a memory map. Mutations append
+    a line, and the file is compacted once more than half of it is superseded records.
+    """
+
+    CACHE_SIZE = 1024
+
+    def __init__(self, api_url, api_key, file_path, cache=None, omdb_client=None):
+        """
+        Initialize with the API URL, API key, and path to the records file (usually '.jsonl').
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.file_path = file_path
+        self.cache = cache
+        self.omdb = omdb_client or OmdbClient(api_url, api_key)
+        self.movies = LazyMovies(self)
+        self._offsets = {}
+        self._by_title = {}
+        self._decoded = OrderedDict()
+        self._garbage = 0
+        self._size = 0
+        self._file = None
+        self._map = None
+        self._stats = None
+        self._sampler = None
+        self.version = 0  # Bumped on every mutation, so cached query results can be invalidated
+        self._load_offsets()
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, file_path, **kwargs):
+        """
+        Convert a StorageJson snapshot (e.g. 'data/movies.json') into a records file and open it.
+        """
+        movies = read_snapshot(snapshot_path)
+        write_atomic_chunks(file_path, (encode_record(key, movie) for key, movie in movies.items()))
+        return cls(file_path=file_path, **kwargs)
+
+    def _remap(self):
+        """
+        Map the records file into memory again after it grew or was replaced.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._size:
+            with open(self.file_path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), self._size, access=mmap.ACCESS_READ)
+
+    def _view(self, offset, length):
+        """
+        Return the raw bytes at offset, remapping first if they were appended after the last map.
+        """
+        if self._map is None or offset + length > len(self._map):
+            self._remap()
+        return self._map[offset:offset + length]
+
+    def _load_offsets(self):
+        """
+        Build the offset index by scanning line keys, without decoding movie records.
+        """
+        try:
+            self._size = os.path.getsize(self.file_path)
+        except FileNotFoundError:
+            print(f"File not found: {self.file_path}. Starting with an empty movie list.")
+            self._size = 0
+        self._remap()
+        position = 0
+        while position < self._size:
+            end = self._map.find(b'\n', position)
+            if end == -1:
+                # A torn final line from a crash mid-append; everything before it is valid.
+                print(f"Ignoring truncated record in: {self.file_path}")
+                self._size = position
+                break
+            tab = self._map.find(b'\t', position, end)
+            key = json.loads(self._map[position:tab])
+            self._index(key, tab + 1, end - tab - 1, self._map[tab + 1:end] == b'null')
+            position = end + 1
+
+    def _index(self, key, offset, length, deleted):
+        """
+        Point key at the record value stored at offset, or drop it for a deletion line,
+        counting the superseded bytes as garbage.
+        """
+        previous = self._offsets.pop(key, None) if deleted else self._offsets.get(key)
+        if previous is not None:
+            self._garbage += previous[1]
+        if deleted:
+            self._garbage += length
+            self._by_title.pop(key.lower(), None)
+        else:
+            self._offsets[key] = (offset, length)
+            self._by_title[key.lower()] = key
+
+    def _append(self, key, movie):
+        """
+        Append one record line and index it.
+        """
+        if self._file is None:
+            self._file = open(self.file_path, 'ab')
+            self._file.truncate(self._size)  # Drop any torn line found while loading
+        line = encode_record(key, movie)
+        self._file.write(line)
+        self._file.flush()
+        self.version += 1
+        self._decoded.pop(key, None)
+        for derived in (self._stats, self._sampler):
+            if derived is None:
+                continue
+            if movie is None:
+                derived.remove(key)
+            else:
+                derived.add(key, movie)
+        offset = self._size + line.index(b'\t') + 1
+        self._size += len(line)
+        self._index(key, offset, self._size - 1 - offset, movie is None)
+        if self._garbage > self._size // 2:
+            self.compact()
+
+    def _decode(self, key):
+        """
+        Decode one movie record straight from the file.
+        """
+        offset, length = self._offsets[key]
+        return json.loads(self._view(offset, length))
+
+    def get_movie(self, key):
+        """
+        Decode and return one movie record, keeping the most recently used ones decoded.
+        """
+        movie = self._decoded.get(key)
+        if movie is not None:
+            self._decoded.move_to_end(key)
+            return movie
+        movie = self._decode(key)
+        self._decoded[key] = movie
+        if len(self._decoded) > self.CACHE_SIZE:
+            self._decoded.popitem(last=False)
+        return movie
+
+    def iter_movies(self):
+        """
+        Yield (title, details) pairs in file order, decoding one record at a time.
+        """
+        for key in list(self._offsets):
+            if key in self._offsets:
+                yield key, self._decoded.get(key) or self._decode(key)
+
+    def compact(self):
+        """
+        Rewrite the records file with only the live records, copying raw bytes without decoding.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._remap()
+
+        def live_lines():
+            for key, (offset, length) in self._offsets.items():
+                yield json.dumps(key).encode('utf-8') + b'\t' + self._map[offset:offset + length] + b'\n'
+
+        write_atomic_chunks(self.file_path, live_lines())
+        self._offsets.clear()
+        self._by_title.clear()
+        self._garbage = 0
+        self._load_offsets()
+
+    def close(self):
+        """
+        Close the records file and its memory map.
+        """
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self.cache:
+            self.cache.close()
+        self.omdb.close()
+
+    def _fetch_movie_details(self, title=None, imdb_id=None):
+        """
+        Fetch movie details from the OMDb API by title or IMDb ID, going through the cache if one is set.
+        """
+        return fetch_movie_details(self.omdb, self.cache, title, imdb_id)
+
+    def find_movie(self, title):
+        """
+        Return the stored title matching title case-insensitively, or None.
+        """
+        return self._by_title.get(title.lower())
+
+    def list_movies(self):
+        """
+        List all movies, streaming records instead of loading them all.
+        """
+        if not self._offsets:
+            print("No movies available.")
+            return
+        print(f"{len(self._offsets)} movies in total:\n")
+        for _, movie in self.iter_movies():
+            print(f"{movie['title']} ({movie['year']}): {movie['rating']}")
+
+    def movies_sorted_by_rating(self, limit=None):
+        """
+        Yield (title, details) pairs ordered by rating, highest first; unrated movies come last.
+        Only titles and ratings are held in memory while ordering.
+        """
+        ratings = ((movie_rating(movie), key) for key, movie in self.iter_movies())
+        ratings = ((rating if rating is not None else float('-inf'), key) for rating, key in ratings)
+        if limit is None:
+            ordered = sorted(ratings, key=lambda entry: (-entry[0], entry[1]))
+        else:
+            ordered = heapq.nsmallest(limit, ratings, key=lambda entry: (-entry[0], entry[1]))
+        for _, key in ordered:
+            yield key, self.get_movie(key)
+
+    def movie_stats(self):
+        """
+        Return rating statistics (see RatingStats.summary), or None if no movie is rated.
+        The columns are built by streaming the records on first use and kept up to date afterwards.
+        """
+        if self._stats is None:
+            self._stats = RatingStats()
+            self._stats.rebuild(self.iter_movies())
+        return self._stats.summary()
+
+    def _get_sampler(self):
+        """
+        The random sampler, built by streaming the records on first use and kept up to date afterwards.
+        """
+        if self._sampler is None:
+            self._sampler = MovieSampler()
+            self._sampler.rebuild(self.iter_movies())
+        return self._sampler
+
+    def random_movie(self, weighted=False):
+        """
+        Return a random (title, details) pair, or None if there are no movies.
+        With weighted=True, higher rated movies are proportionally more likely and unrated ones are skipped.
+        """
+        sampler = self._get_sampler()
+        key = sampler.weighted_choice() if weighted else sampler.choice()
+        return None if key is None else (key, self.get_movie(key))
+
+    def sample_movies(self, k, weighted=False):
+        """
+        Return up to k distinct random (title, details) pairs, weighted by rating if requested.
+        """
+        sampler = self._get_sampler()
+        keys = sampler.weighted_sample(k) if weighted else sampler.sample(k)
+        return [(key, self.get_movie(key)) for key in keys]
+
+    def search_movies(self, query, limit=10):
+        """
+        Return up to limit (title, details) pairs whose title best matches query.
+        Titles are matched from the offset index, so no records are decoded to search.
+        """
+        matches = process.extract(query, list(self._offsets), scorer=fuzz.WRatio,
+                                  processor=utils.default_process, limit=limit, score_cutoff=60)
+        return [(key, self.get_movie(key)) for key, _, _ in matches]
+
+    def add_movie_details(self, movie_details):
+        """
+        Add a movie from an already fetched OMDb response and return its stored title.
+        """
+        title = movie_details['Title']
+        if self.find_movie(title) is not None:
+            raise Exception("Movie already exists.")
+        self._append(title, movie_from_details(movie_details))
+        return title
+
+    def add_movie(self, title, year=None, rating=None, poster=None, description=None):
+        """
+        Add a new movie, fetching missing details from OMDb.
+        """
+        if self.find_movie(title) is not None:
+            raise Exception("Movie already exists.")
+        if not year or not rating or not poster or not description:
+            movie_details = self._fetch_movie_details(title)
+            if not movie_details:
+                raise Exception("Error: Movie not found.")
+            movie = movie_from_details(movie_details)
+        else:
+            movie = {
+                'title': title,
+                'year': year,
+                'rating': float(rating),
+                'poster': poster,
+                'description': description
+            }
+        self._append(title, movie)
+        print("Movie added successfully!")
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title.
+        """
+        key = self.find_movie(title)
+        if key is None:
+            raise Exception("Error: Movie not found.")
+        self._append(key, None)
+        print("Movie deleted successfully!")
+
+    def update_movie(self, title, rating):
+        """
+        Update the rating of a movie.
+        """
+        key = self.find_movie(title)
+        if key is None:
+            raise Exception("Error: Movie not found.")
+        self._append(key, {**self.get_movie(key), 'rating': float(rating)})
+        print("Movie rating updated successfully!")
@@ -0,0 +1,448 @@
+import random
+import sqlite3
+from collections.abc import Mapping
+from contextlib import contextmanager
+from storage.movie import parse_rating, parse_year
+from storage.istorage import IStorage
+from storage.omdb_client import OmdbClient, fetch_movie_details, movie_from_details
+from storage.sampler import MovieSampler
+from storage.stats import PERCENTILES
+
+FIELDS = ('title', 'year', 'rating', 'poster', 'imdb_id', 'description')
+_SELECT = f"SELECT {', '.join(FIELDS)} FROM movies"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    title TEXT PRIMARY KEY,
+    title_key TEXT NOT NULL UNIQUE,
+    year,
+    rating,
+    poster TEXT,
+    imdb_id TEXT,
+    description TEXT,
+    year_num INTEGER,
+    rating_num REAL
+);
+CREATE INDEX IF NOT EXISTS movies_year ON movies (year_num);
+CREATE INDEX IF NOT EXISTS movies_rating ON movies (rating_num DESC, title);
+"""
+
+# Trigram full-text index over titles and descriptions, kept in sync with the movies table by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+    title, description, content='movies', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+    INSERT INTO movies_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title, description ON movies BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO movies_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+# PRAGMA user_version of a database whose rating column holds numbers (NULL when unrated)
+SCHEMA_VERSION = 1
+
+
+def _row_to_movie(row):
+    """
+    Convert a selected row back into the movie dict shape used by the other backends.
+    """
+    movie = dict(zip(FIELDS, row))
+    if movie['rating'] is None:
+        movie['rating'] = 'N/A'
+    if movie['imdb_id'] is None:
+        del movie['imdb_id']
+    return movie
+
+
+def _movie_params(key, movie):
+    """
+    Column values for storing movie under key, including the derived lookup columns.
+    Ratings are stored as numbers, or NULL when there is none ("N/A").
+    """
+    rating = parse_rating(movie.get('rating'))
+    return (key, key.lower(), movie.get('year'), rating, movie.get('poster'), movie.get('imdb_id'),
+            movie.get('description'), parse_year(movie.get('year')), rating)
+
+
+class SqliteMovies(Mapping):
+    """
+    Read-only mapping view over a StorageSqlite, fetching rows on access.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def __getitem__(self, key):
+        movie = self._storage.get_movie(key)
+        if movie is None:
+            raise KeyError(key)
+        return movie
+
+    def __iter__(self):
+        return (row[0] for row in self._storage._connection.execute("SELECT title FROM movies ORDER BY rowid"))
+
+    def __len__(self):
+        return self._storage._connection.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def __contains__(self, key):
+        return self._storage.get_movie(key) is not None
+
+    def items(self):
+        return self._storage.iter_movies()
+
+
+class StorageSqlite(IStorage):
+    """
+    SQLite storage for movie data.
+
+    The database runs in WAL mode so several reader processes can share one catalog
+    while a writer commits. Titles are indexed case-insensitively and year and rating
+    have their own indexes, so lookups, sorting, stats and random picks run in SQL.
+    Searches of three or more characters go through an FTS5 trigram index; shorter
+    queries, and SQLite builds without FTS5, fall back to a full scan with LIKE.
+    Weighted random picks use an in-memory MovieSampler of the rated titles, built on
+    the first weighted pick and rebuilt after another connection commits.
+    """
+
+    def __init__(self, api_url, api_key, file_path, cache=None, omdb_client=None):
+        """
+        Initialize with the API URL, API key, and path to the SQLite database.
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.file_path = file_path
+        self.cache = cache
+        self.omdb = omdb_client or OmdbClient(api_url, api_key)
+        self.movies = SqliteMovies(self)
+        self._batch_depth = 0
+        self._changes = 0
+        self._sampler = None
+        self._sampler_version = None
+        self._connection = sqlite3.connect(file_path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA recursive_triggers=ON")  # INSERT OR REPLACE fires the delete trigger
+        self._connection.executescript(SCHEMA)
+        self._fts = self._create_fts()
+        self._migrate()
+
+    def _create_fts(self):
+        """
+        Create the full-text index, filling it from the table if it is new.
+        Returns False when this SQLite has no FTS5 trigram tokenizer.
+        """
+        exists = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'").fetchone()
+        try:
+            self._connection.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not exists:
+            self._connection.execute("INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')")
+        return True
+
+    def _migrate(self):
+        """
+        Convert the ratings of a database written before they were stored as numbers.
+        """
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        with self.batch():
+            self._connection.execute("UPDATE movies SET rating = rating_num WHERE typeof(rating) = 'text'")
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @property
+    def version(self):
+        """
+        Changes by this connection plus SQLite's data_version, which moves when another
+        connection commits, so cached query results can be invalidated across processes.
+        """
+        data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self._changes
+
+    @contextmanager
+    def batch(self):
+        """
+        Run the enclosed mutations in one transaction, committed when the outermost batch exits
+        and rolled back if it raises.
+        """
+        if not self._batch_depth:
+            self._connection.execute("BEGIN IMMEDIATE")
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._connection.execute("ROLLBACK")
+                self._sampler = None  # It may hold rolled back changes
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._connection.execute("COMMIT")
+
+    def import_movies(self, movies):
+        """
+        Insert or replace (title, details) pairs in a single transaction. Returns the number imported.
+        """
+        with self.batch():
+            cursor = self._connection.executemany(
+                "INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_movie_params(key, movie) for key, movie in movies)
+            )
+            self._changes += 1
+            self._sampler = None  # Rebuilt on the next weighted pick
+        return cursor.rowcount
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self._connection.close()
+        if self.cache:
+            self.cache.close()
+        self.omdb.close()
+
+    def _fetch_movie_details(self, title=None, imdb_id=None):
+        """
+        Fetch movie details from the OMDb API by title or IMDb ID, going through the cache if one is set.
+        """
+        return fetch_movie_details(self.omdb, self.cache, title, imdb_id)
+
+    def get_movie(self, key):
+        """
+        Return the movie stored under key, or None.
+        """
+        row = self._connection.execute(f"{_SELECT} WHERE title = ?", (key,)).fetchone()
+        return _row_to_movie(row) if row else None
+
+    def find_movie(self, title):
+        """
+        Return the stored title matching title case-insensitively, or None.
+        """
+        row = self._connection.execute("SELECT title FROM movies WHERE title_key = ?", (title.lower(),)).fetchone()
+        return row[0] if row else None
+
+    def iter_movies(self):
+        """
+        Yield (title, details) pairs in insertion order, streaming rows from the database.
+        """
+        for row in self._connection.execute(f"{_SELECT} ORDER BY rowid"):
+            yield row[0], _row_to_movie(row)
+
+    def list_movies(self):
+        """
+        List all movies.
+        """
+        count = len(self.movies)
+        if not count:
+            print("No movies available.")
+            return []
+        print(f"{count} movies in total:\n")
+        movies = []
+        for _, movie in self.iter_movies():
+            print(f"{movie['title']} ({movie['year']}): {movie['rating']}")
+            movies.append(movie)
+        return movies
+
+    def movies_sorted_by_rating(self, limit=None):
+        """
+        Return (title, details) pairs ordered by rating, highest first; unrated movies come last.
+        """
+        rows = self._connection.execute(
+            f"{_SELECT} ORDER BY rating_num IS NULL, rating_num DESC, title LIMIT ?",
+            (-1 if limit is None else limit,)
+        )
+        return [(row[0], _row_to_movie(row)) for row in rows]
+
+    def movies_in_years(self, start=None, end=None):
+        """
+        Return (title, details) pairs released between start and end (inclusive), ordered by year.
+        """
+        rows = self._connection.execute(
+            f"{_SELECT} WHERE year_num BETWEEN ? AND ? ORDER BY year_num, title",
+            (-1 if start is None else start, 10 ** 6 if end is None else end)
+        )
+        return [(row[0], _row_to_movie(row)) for row in rows]
+
+    def search_movies(self, query, limit=10):
+        """
+        Return up to limit (title, details) pairs whose title, or failing that description,
+        contains query. Title matches come first, earlier and tighter matches on top.
+        Matches are found in the trigram index; queries shorter than a trigram scan the table.
+        """
+        query = query.strip().lower()
+        pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        if self._fts and len(query) >= 3:
+            matches = "rowid IN (SELECT rowid FROM movies_fts WHERE movies_fts MATCH :match)"
+        else:
+            matches = "title_key LIKE :pattern ESCAPE '\\' OR lower(description) LIKE :pattern ESCAPE '\\'"
+        rows = self._connection.execute(
+            f"{_SELECT} WHERE {matches} "
+            f"ORDER BY title_key NOT LIKE :pattern ESCAPE '\\', instr(title_key, :query), length(title) LIMIT :limit",
+            {'pattern': pattern, 'query': query, 'match': '"' + query.replace('"', '""') + '"', 'limit': limit}
+        )
+        return [(row[0], _row_to_movie(row)) for row in rows]
+
+    def movie_stats(self):
+        """
+        Return rating statistics computed in SQL, in the shape of RatingStats.summary: count,
+        unrated, mean, median, percentiles, a 0-10 histogram, per-decade count and mean, best
+        and worst. Movies without a numeric rating are skipped. Returns None if no movie is rated.
+        """
+        total, count, mean = self._connection.execute(
+            "SELECT COUNT(*), COUNT(rating_num), AVG(rating_num) FROM movies"
+        ).fetchone()
+        if not count:
+            return None
+        percentiles = {percent: self._rating_percentile(count, percent) for percent in PERCENTILES}
+        bins = dict(self._connection.execute(
+            "SELECT MAX(MIN(CAST(rating_num AS INTEGER), 9), 0), COUNT(*) FROM movies "
+            "WHERE rating_num IS NOT NULL GROUP BY 1"
+        ).fetchall())
+        decades = self._connection.execute(
+            "SELECT year_num / 10 * 10, COUNT(*), AVG(rating_num) FROM movies "
+            "WHERE rating_num IS NOT NULL AND year_num IS NOT NULL GROUP BY 1 ORDER BY 1"
+        ).fetchall()
+        best = self._connection.execute(
+            "SELECT title, rating_num FROM movies WHERE rating_num IS NOT NULL ORDER BY rating_num DESC, title LIMIT 1"
+        ).fetchone()
+        worst = self._connection.execute(
+            "SELECT title, rating_num FROM movies WHERE rating_num IS NOT NULL ORDER BY rating_num, title LIMIT 1"
+        ).fetchone()
+        return {
+            'count': count,
+            'unrated': total - count,
+            'mean': mean,
+            'median': percentiles[50],
+            'percentiles': percentiles,
+            'histogram': [(float(low), float(low + 1), bins.get(low, 0)) for low in range(10)],
+            'decades': {decade: {'count': n, 'mean': average} for decade, n, average in decades},
+            'best': tuple(best),
+            'worst': tuple(worst),
+        }
+
+    def _rating_percentile(self, count, percent):
+        """
+        Percentile of the numeric ratings, interpolated between the two nearest ranks like
+        numpy.percentile, read from the rating index.
+        """
+        position = (count - 1) * percent / 100
+        below = int(position)
+        values = [value for value, in self._connection.execute(
+            "SELECT rating_num FROM movies WHERE rating_num IS NOT NULL ORDER BY rating_num LIMIT 2 OFFSET ?",
+            (below,)
+        )]
+        if len(values) == 1:
+            return values[0]
+        return values[0] + (values[1] - values[0]) * (position - below)
+
+    def random_movie(self, weighted=False):
+        """
+        Return a random (title, details) pair, or None if there are no movies.
+        Picks the first row at or after a random rowid, so it costs one index seek;
+        rows that follow gaps left by deletes are slightly more likely.
+        With weighted=True, higher rated movies are proportionally more likely and unrated ones
+        are skipped: the title is drawn in O(log n) from the sampler, then fetched by primary key.
+        """
+        if weighted:
+            key = self._weighted_sampler().weighted_choice()
+            movie = None if key is None else self.get_movie(key)
+            return None if movie is None else (key, movie)
+        max_rowid = self._connection.execute("SELECT MAX(rowid) FROM movies").fetchone()[0]
+        if max_rowid is None:
+            return None
+        row = self._connection.execute(
+            f"{_SELECT} WHERE rowid >= ? ORDER BY rowid LIMIT 1", (random.randint(1, max_rowid),)
+        ).fetchone()
+        return row[0], _row_to_movie(row)
+
+    def _weighted_sampler(self):
+        """
+        The MovieSampler of rated titles, built on first use and again once another connection
+        has committed (PRAGMA data_version moved); this connection's writes keep it in sync.
+        """
+        data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        if self._sampler is None or data_version != self._sampler_version:
+            rows = self._connection.execute("SELECT title, rating_num FROM movies WHERE rating_num > 0")
+            self._sampler = MovieSampler()
+            self._sampler.rebuild((title, {'rating': rating}) for title, rating in rows)
+            self._sampler_version = data_version
+        return self._sampler
+
+    def _put(self, key, movie):
+        """
+        Insert or replace the movie stored under key.
+        """
+        self._connection.execute("INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 _movie_params(key, movie))
+        self._changes += 1
+        if self._sampler is not None:
+            self._sampler.add(key, movie)
+
+    def add_movie_details(self, movie_details):
+        """
+        Add a movie from an already fetched OMDb response and return its stored title.
+        """
+        title = movie_details['Title']
+        if self.find_movie(title) is not None:
+            raise Exception("Movie already exists.")
+        self._put(title, movie_from_details(movie_details))
+        return title
+
+    def add_movie(self, title, year=None, rating=None, poster=None, description=None):
+        """
+        Add a new movie, fetching missing details from OMDb.
+        """
+        if self.find_movie(title) is not None:
+            raise Exception("Movie already exists.")
+        if not year or not rating or not poster or not description:
+            movie_details = self._fetch_movie_details(title)
+            if not movie_details:
+                raise Exception("Error: Movie not found.")
+            movie = movie_from_details(movie_details)
+        else:
+            movie = {
+                'title': title,
+                'year': year,
+                'rating': float(rating),
+                'poster': poster,
+                'description': description
+            }
+        self._put(title, movie)
+        print("Movie added successfully!")
+
+    def delete_movie(self, title):
+        """
+        Delete a movie by title.
+        """
+        key = self.find_movie(title)
+        if key is None:
+            raise Exception("Error: Movie not found.")
+        self._connection.execute("DELETE FROM movies WHERE title = ?", (key,))
+        self._changes += 1
+        if self._sampler is not None:
+            self._sampler.remove(key)
+        print("Movie deleted successfully!")
+
+    def update_movie(self, title, rating):
+        """
+        Update the rating of a movie.
+        """
+        key = self.find_movie(title)
+        if key is None:
+            raise Exception("Error: Movie not found.")
+        self._connection.execute("UPDATE movies SET rating = ?, rating_num = ? WHERE title = ?",
+                                 (float(rating), float(rating), key))
+        self._changes += 1
+        if self._sampler is not None:
+            self._sampler.add(key, {'rating': float(rating)})
+        print("Movie rating updated successfully!")
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+import unittest
+import httpx
+from api_server import MovieApiServer
+from storage.storage_json import StorageJson
+
+
+class ReopenedStorageJson(StorageJson):
+    """
+    StorageJson without refresh(), so the server reopens it on changes.
+    """
+
+    refresh = None
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class TestMovieApiServer(unittest.TestCase):
+    def setUp(self):
+        self.test_file = 'test_api_data.json'
+        storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file)
+        storage.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        storage.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+
+    def tearDown(self):
+        for path in (self.test_file, f"{self.test_file}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _run(self, scenario, **kwargs):
+        async def run():
+            storage_class = kwargs.pop('storage_class', StorageJson)
+            server = MovieApiServer(lambda: storage_class('http://www.omdbapi.com/', None, self.test_file),
+                                    **kwargs)
+            port = await server.start(port=0)
+            try:
+                async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                    return await scenario(server, client)
+            finally:
+                await server.close()
+        return asyncio.run(run())
+
+    def test_queries_and_pagination(self):
+        async def scenario(server, client):
+            page = (await client.get('/movies', params={'page': 2, 'per_page': 2})).json()
+            self.assertEqual(page['total'], 3)
+            self.assertEqual([movie['title'] for movie in page['movies']], ["Inception"])
+            self.assertEqual((await client.get('/movies/memento')).json()['rating'], 8.4)
+            self.assertEqual((await client.get('/movies/Nope')).status_code, 404)
+            self.assertEqual((await client.get('/search', params={'q': 'dream'})).json()[0]['title'], "Inception")
+            self.assertEqual((await client.get('/stats')).json()['count'], 3)
+            sorted_page = (await client.get('/sorted', params={'per_page': 2})).json()
+            self.assertEqual([movie['title'] for movie in sorted_page['movies']], ["Inception", "Memento"])
+            random_response = await client.get('/random')
+            self.assertEqual(random_response.headers['cache-control'], 'no-store')
+            self.assertIn(random_response.json()['title'], {"Memento", "Jumanji", "Inception"})
+            streamed = await client.get('/movies', params={'stream': 1})
+            self.assertEqual([movie['title'] for movie in json.loads(streamed.content)],
+                             ["Memento", "Jumanji", "Inception"])
+        self._run(scenario)
+
+    def test_etag_invalidated_by_mutation(self):
+        async def scenario(server, client):
+            first = await client.get('/stats')
+            etag = first.headers['etag']
+            self.assertEqual((await client.get('/stats', headers={'If-None-Match': etag})).status_code, 304)
+            server.storage.update_movie("Jumanji", "9.9")
+            second = await client.get('/stats', headers={'If-None-Match': etag})
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(second.json()['best'], ["Jumanji", 9.9])
+        self._run(scenario)
+
+    def test_errors_are_not_answered_with_304(self):
+        async def scenario(server, client):
+            etag = (await client.get('/stats')).headers['etag']
+            headers = {'If-None-Match': etag}
+            self.assertEqual((await client.get('/nope', headers=headers)).status_code, 404)
+            self.assertEqual((await client.get('/movies/Nope', headers=headers)).status_code, 404)
+            self.assertEqual((await client.get('/search', headers=headers)).status_code, 400)
+            self.assertEqual((await client.get('/movies', params={'page': 'x'}, headers=headers)).status_code, 400)
+            self.assertEqual((await client.get('/movies', headers=headers)).status_code, 304)
+        self._run(scenario)
+
+    def test_stream_spans_several_chunks(self):
+        async def scenario(server, client):
+            streamed = await client.get('/movies', params={'stream': 1})
+            self.assertEqual([movie['title'] for movie in json.loads(streamed.content)],
+                             ["Memento", "Jumanji", "Inception"])
+        self._run(scenario, max_per_page=2)
+
+    def test_hot_reload(self):
+        async def scenario(server, client):
+            storage = server.storage
+            other = StorageJson('http://www.omdbapi.com/', None, self.test_file)
+            other.delete_movie("Memento")
+            self.assertTrue(await server.reload_if_changed())
+            self.assertIs(server.storage, storage)  # Merged in place by refresh()
+            self.assertEqual((await client.get('/movies')).json()['total'], 2)
+            self.assertFalse(await server.reload_if_changed())
+        self._run(scenario, watch_paths=[self.test_file], reload_interval=60)
+
+    def test_reopened_storage_is_closed_after_its_requests(self):
+        async def scenario(server, client):
+            storage = server.storage
+            server._in_flight[id(storage)] = 1  # A request still streaming from the old catalog
+            StorageJson('http://www.omdbapi.com/', None, self.test_file).delete_movie("Memento")
+            self.assertTrue(await server.reload_if_changed())
+            self.assertIsNot(server.storage, storage)
+            self.assertFalse(hasattr(storage, 'closed'))
+            server._in_flight.clear()
+            self.assertEqual((await client.get('/movies')).json()['total'], 2)
+            self.assertTrue(storage.closed)
+        self._run(scenario, watch_paths=[self.test_file], reload_interval=60, storage_class=ReopenedStorageJson)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+from benchmarks.generate_catalog import generate_catalog
+from benchmarks.run_benchmarks import BACKENDS, compare, run
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generate_catalog(self):
+        movies = generate_catalog(200, seed=1)
+        self.assertEqual(len(movies), 200)
+        self.assertEqual(movies, generate_catalog(200, seed=1))
+        title, movie = next(iter(movies.items()))
+        self.assertEqual(movie['title'], title)
+        self.assertEqual(set(movie), {'title', 'year', 'rating', 'poster', 'imdb_id', 'description'})
+
+    def test_run_reports_every_backend(self):
+        results = run([50], BACKENDS, repeat=1, operations=2)
+        self.assertEqual({entry['backend'] for entry in results}, set(BACKENDS))
+        operations = {entry['operation'] for entry in results if entry['backend'] == 'json'}
+        self.assertTrue({'load', 'save', 'add', 'search', 'stats', 'random', 'fetch', 'site_cold'} <= operations)
+        self.assertTrue(all(entry['median'] >= 0 for entry in results))
+        slower = [{**entry, 'median': entry['median'] * 2 + 1} for entry in results]
+        self.assertEqual(len(compare({'results': results}, slower)), len(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from benchmarks.omdb_stub import OmdbStubServer
+from instrumentation import Instrumentation, LatencyHistogram, add_storage_sources, install
+from movie_app import MovieApp
+from storage.storage_json import StorageJson
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for milliseconds in [0.05] * 90 + [30] * 9 + [700]:
+            histogram.record(milliseconds / 1000)
+        summary = histogram.to_dict()
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['p50_ms'], 0.1)
+        self.assertEqual(summary['p95_ms'], 50)
+        self.assertAlmostEqual(summary['p99_ms'], 50)
+        self.assertAlmostEqual(summary['max_ms'], 700)
+        self.assertEqual(summary['buckets'], {'0.1': 90, '50': 9, '1000': 1})
+
+
+class TestInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.omdb = OmdbStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.omdb.stop()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'movies.json')
+        self.instrumentation = install(profile=['command.add_movie'])
+
+    def tearDown(self):
+        self.instrumentation.uninstall()
+        self.directory.cleanup()
+
+    def test_records_commands_io_and_api_calls(self):
+        storage = StorageJson(self.omdb.url, 'key', self.file_path, journal=True)
+        add_storage_sources(self.instrumentation, storage)
+        app = MovieApp(storage, storage)
+        app.add_movie("Inception")
+        app.add_movie("Heat")
+        app.movie_stats()
+        storage.close()
+
+        report = self.instrumentation.report()
+        operations = report['operations']
+        self.assertEqual(operations['command.add_movie']['count'], 2)
+        self.assertEqual(operations['command.movie_stats']['count'], 1)
+        self.assertEqual(operations['StorageJson._fetch_movie_details']['count'], 2)
+        self.assertEqual(operations['StorageJson._load_movies']['count'], 1)
+        self.assertGreater(report['bytes_written']['Journal.append'], 0)
+        self.assertEqual(report['bytes_written']['StorageJson._save_movies'], os.path.getsize(self.file_path))
+        self.assertEqual(report['sources']['omdb']['requests'], 2)
+        self.assertEqual(report['allocations']['command.add_movie']['calls'], 2)
+        self.assertNotIn('command.movie_stats', report['allocations'])
+
+        stats_path = os.path.join(self.directory.name, 'stats.json')
+        self.instrumentation.dump(stats_path)
+        with open(stats_path, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['operations']['command.add_movie']['count'], 2)
+        self.assertTrue(os.path.exists(f"{stats_path}.command.add_movie.prof"))
+
+    def test_records_menu_commands(self):
+        storage = StorageJson(self.omdb.url, 'key', self.file_path, journal=True)
+        app = MovieApp(storage, storage)
+        app.add_movie("Inception")
+        with patch('builtins.input', return_value=''), patch('builtins.print') as output:
+            app._command_list_movies()
+            app._command_movie_stats()
+        storage.close()
+
+        operations = self.instrumentation.report()['operations']
+        self.assertEqual(operations['command.iter_movies']['count'], 1)
+        self.assertEqual(operations['command.movie_stats']['count'], 1)
+        self.assertIn("1 movies in total:\n", [call.args[0] for call in output.call_args_list])
+
+    def test_uninstall_restores_methods(self):
+        self.instrumentation.uninstall()
+        original = StorageJson.__dict__['_load_movies']
+        instrumentation = Instrumentation()
+        instrumentation.wrap(StorageJson, '_load_movies')
+        self.assertIsNot(StorageJson.__dict__['_load_movies'], original)
+        instrumentation.uninstall()
+        self.assertIs(StorageJson.__dict__['_load_movies'], original)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from storage.movie import Movie, parse_rating, parse_year
+
+
+class TestMovie(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "title": "Inception",
+            "year": "2010",
+            "rating": "8.8",
+            "poster": "https://example.com/inception.jpg",
+            "imdb_id": "tt1375666",
+            "description": "A thief who steals corporate secrets"
+        }
+
+    def test_from_dict_normalizes_fields(self):
+        movie = Movie.from_dict(self.data)
+        self.assertEqual(movie.year, 2010)
+        self.assertEqual(movie.rating, 8.8)
+        self.assertIs(movie.imdb_id, Movie.from_dict(dict(self.data)).imdb_id)
+        self.assertFalse(hasattr(movie, '__dict__'))
+
+    def test_to_dict_round_trip(self):
+        movie = Movie.from_dict(self.data)
+        self.assertEqual(movie.to_dict(), {**self.data, "rating": 8.8})
+        self.assertEqual(Movie.from_dict(movie.to_dict()), movie)
+
+    def test_missing_values(self):
+        movie = Movie.from_dict({"title": "Alien", "year": "N/A", "rating": "N/A", "poster": "N/A"})
+        self.assertIsNone(movie.year)
+        self.assertIsNone(movie.rating)
+        self.assertEqual(movie['rating'], "N/A")
+        self.assertNotIn('imdb_id', movie.to_dict())
+        self.assertIsNone(movie.get('imdb_id'))
+
+    def test_item_access_uses_schema_values(self):
+        movie = Movie.from_dict(self.data)
+        self.assertEqual(movie['year'], "2010")
+        self.assertEqual(movie['poster'], self.data['poster'])
+        with self.assertRaises(KeyError):
+            movie['genre']
+
+    def test_replace(self):
+        movie = Movie.from_dict(self.data)
+        updated = movie.replace(rating=9.1)
+        self.assertEqual(updated.rating, 9.1)
+        self.assertEqual(movie.rating, 8.8)
+        self.assertEqual(updated.title, movie.title)
+
+    def test_year_range_round_trip(self):
+        series = {**self.data, "title": "Sherlock", "year": "2010–2017"}
+        movie = Movie.from_dict(series)
+        self.assertEqual(movie.year, 2010)
+        self.assertEqual(movie['year'], "2010–2017")
+        self.assertEqual(movie.to_dict()['year'], "2010–2017")
+        self.assertEqual(Movie.from_dict(movie.to_dict()), movie)
+        self.assertNotEqual(movie, Movie.from_dict({**series, "year": "2010"}))
+        self.assertIsNone(Movie.from_dict(self.data).year_text)
+
+        # Other changes keep the range; a new year replaces it
+        self.assertEqual(movie.replace(rating=9.1)['year'], "2010–2017")
+        updated = movie.replace(year="2011")
+        self.assertEqual((updated.year, updated['year']), (2011, "2011"))
+        self.assertEqual(movie.replace(year="2012–").to_dict()['year'], "2012–")
+
+    def test_parsers(self):
+        self.assertEqual(parse_year("2010–2012"), 2010)
+        self.assertIsNone(parse_year("N/A"))
+        self.assertEqual(parse_rating("7.1"), 7.1)
+        self.assertIsNone(parse_rating("nan"))
+
+
+if __name__ == '__main__':
+    unittest.main()
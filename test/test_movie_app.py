@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from movie_app import MovieApp
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+class StubApi:
+    """
+    Stands in for the OMDb-backed storage, answering from a fixed dict of responses.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def _fetch_movie_details(self, title):
+        return self.responses.get(title)
+
+
+class TestMovieAppCommands(unittest.TestCase):
+    def setUp(self):
+        self.test_file = 'test_app_data.json'
+        self.storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file)
+        self.storage.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        self.storage.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        api = StubApi({"Alien": {"Title": "Alien", "Year": "1979", "imdbRating": "8.5", "Poster": "N/A",
+                                 "imdbID": "tt0078748", "Plot": "A space horror."}})
+        self.app = MovieApp(api, self.storage)
+
+    def tearDown(self):
+        for path in (self.test_file, f"{self.test_file}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_commands_return_results(self):
+        self.assertEqual(self.app.add_movie("Alien"), "Alien")
+        self.assertEqual([movie['title'] for movie in self.app.movies_sorted_by_rating(limit=2)],
+                         ["Alien", "Memento"])
+        self.assertEqual(self.app.search_movies("jumanj")[0]['rating'], 7.1)
+        self.assertEqual(self.app.movie_stats()['count'], 3)
+        self.assertIn(self.app.random_movie()['title'], {"Alien", "Memento", "Jumanji"})
+
+    def test_run_batch(self):
+        saves = []
+        original_save = self.storage._save_movies
+        self.storage._save_movies = lambda: saves.append(original_save())
+        script = [
+            '# comment',
+            'add Alien',
+            'update "memento" 9.0',
+            'delete Jumanji',
+            '',
+            'sorted 1',
+            'add "Not A Movie"',
+            'frobnicate',
+        ]
+        outcomes = list(self.app.run_batch(script))
+        self.assertEqual([outcome['line'] for outcome in outcomes], [2, 3, 4, 6, 7, 8])
+        self.assertEqual([outcome['ok'] for outcome in outcomes], [True, True, True, True, False, False])
+        self.assertEqual(outcomes[3]['result'][0]['title'], "Memento")
+        self.assertEqual(outcomes[4]['error'], "Error: Movie not found.")
+        self.assertEqual(len(saves), 1)
+
+
+class TestMovieAppSqlite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = StorageSqlite(api_url='http://www.omdbapi.com/', api_key=None,
+                                     file_path=os.path.join(self.temp_dir.name, 'movies.sqlite'))
+        self.storage.import_movies([
+            (title, {"title": title, "year": "2000", "rating": rating, "poster": "N/A", "description": "A movie."})
+            for title, rating in [("Memento", "8.4"), ("Jumanji", "7.1"), ("Unrated", "N/A")]
+        ])
+        self.app = MovieApp(StubApi({}), self.storage)
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_weighted_random(self):
+        picks = {self.app.run_command('random weighted')['title'] for _ in range(50)}
+        self.assertEqual(picks, {"Memento", "Jumanji"})
+        self.assertIn(self.app.random_movie()['title'], {"Memento", "Jumanji", "Unrated"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import asyncio
+import time
+import unittest
+import httpx
+from storage.omdb_async import AsyncOmdbClient, RateLimiter
+
+
+def omdb_stub(request):
+    title = request.url.params.get('t')
+    if title == 'Broken':
+        return httpx.Response(500)
+    if title == 'Nonexistent Movie':
+        return httpx.Response(200, json={"Response": "False", "Error": "Movie not found!"})
+    return httpx.Response(200, json={"Title": title, "imdbID": "tt0000001", "Response": "True"})
+
+
+class TestAsyncOmdbClient(unittest.TestCase):
+    def _fetch(self, titles, **kwargs):
+        async def run():
+            async with AsyncOmdbClient('http://omdb.test/', 'key', transport=httpx.MockTransport(omdb_stub),
+                                       **kwargs) as client:
+                return await client.fetch_titles(titles)
+        return asyncio.run(run())
+
+    def test_results_keep_input_order_and_report_failures(self):
+        results = self._fetch(['Memento', 'Nonexistent Movie', 'Broken', 'Jumanji'])
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertEqual(results[0].details['Title'], 'Memento')
+        self.assertEqual(results[1].error, 'Movie not found!')
+        self.assertIn('500', results[2].error)
+
+    def test_rate_limiter_spaces_requests(self):
+        async def run():
+            limiter = RateLimiter(rate=50, burst=1)
+            start = time.monotonic()
+            for _ in range(6):
+                await limiter.acquire()
+            return time.monotonic() - start
+        self.assertGreaterEqual(asyncio.run(run()), 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
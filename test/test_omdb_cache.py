@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+import unittest
+from storage.omdb_cache import OmdbCache
+
+
+class TestOmdbCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'cache.sqlite')
+        self.cache = OmdbCache(self.path, ttl=60, negative_ttl=0.05, max_entries=4)
+        self.details = {"Title": "Inception", "Year": "2010", "imdbID": "tt1375666", "Response": "True"}
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_hit_by_normalized_title_and_imdb_id(self):
+        self.cache.put(self.details, title="inception ")
+        self.assertEqual(self.cache.get(title="  INCEPTION"), self.details)
+        self.assertEqual(self.cache.get(imdb_id="tt1375666"), self.details)
+
+    def test_survives_restart(self):
+        self.cache.put(self.details, title="Inception")
+        self.cache.close()
+        self.cache = OmdbCache(self.path)
+        self.assertEqual(self.cache.get(title="Inception"), self.details)
+
+    def test_negative_entry_expires(self):
+        missing = {"Response": "False", "Error": "Movie not found!"}
+        self.cache.put(missing, title="Nonexistent Movie")
+        self.assertEqual(self.cache.get(title="Nonexistent Movie"), missing)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get(title="Nonexistent Movie"))
+
+    def _key_count(self):
+        return self.cache._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def test_lru_eviction(self):
+        for i in range(4):
+            self.cache.put({"Response": "True"}, title=f"Movie {i}")
+        self.cache.get(title="Movie 0")
+        for i in range(4, 6):
+            self.cache.put({"Response": "True"}, title=f"Movie {i}")
+            self.assertEqual(self._key_count(), 4)  # Evicted on every put, not eventually
+        self.assertIsNotNone(self.cache.get(title="Movie 0"))
+        self.assertIsNone(self.cache.get(title="Movie 1"))
+        self.assertIsNone(self.cache.get(title="Movie 2"))
+
+    def test_cap_counts_keys(self):
+        self.cache.put(self.details, title="Dream Heist")  # Requested title, canonical title and IMDb ID
+        self.assertEqual(self._key_count(), 3)
+        self.cache.put({**self.details, "Title": "Heat", "imdbID": "tt0113277"}, title="Heat")
+        self.assertEqual(self._key_count(), 4)
+        self.assertIsNotNone(self.cache.get(imdb_id="tt0113277"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from storage.omdb_client import CircuitOpenError, OmdbClient
+
+
+class OmdbStubHandler(BaseHTTPRequestHandler):
+    # Status codes to answer with before succeeding, and their Retry-After, shared by the test case.
+    failures = []
+    retry_after = '0'
+    requests = 0
+
+    def do_GET(self):
+        OmdbStubHandler.requests += 1
+        if self.failures:
+            self.send_response(self.failures.pop(0))
+            self.send_header('Retry-After', self.retry_after)
+            self.end_headers()
+            return
+        body = json.dumps({"Title": "Inception", "Response": "True"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOmdbClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), OmdbStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = OmdbClient(self.url, 'key', max_retries=2, backoff_base=0.01)
+
+    def tearDown(self):
+        OmdbStubHandler.failures.clear()
+        OmdbStubHandler.retry_after = '0'
+        self.client.close()
+
+    def test_retries_transient_errors(self):
+        OmdbStubHandler.failures.extend([503, 429])
+        self.assertEqual(self.client.fetch(title="Inception")['Title'], "Inception")
+        stats = self.client.stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['circuit'], 'closed')
+
+    def test_circuit_opens_after_repeated_failures(self):
+        self.client.circuit_breaker.failure_threshold = 1
+        OmdbStubHandler.failures.extend([500, 500, 500])
+        with self.assertRaises(Exception):
+            self.client.fetch(title="Inception")
+        with self.assertRaises(CircuitOpenError):
+            self.client.fetch(title="Inception")
+        self.assertEqual(self.client.stats()['rejected'], 1)
+
+    def test_long_retry_after_is_not_retried_early(self):
+        self.client.circuit_breaker.failure_threshold = 1
+        OmdbStubHandler.failures.extend([429, 429])
+        OmdbStubHandler.retry_after = '3600'
+        requests = OmdbStubHandler.requests
+        with self.assertRaises(Exception):
+            self.client.fetch(title="Inception")
+        self.assertEqual(OmdbStubHandler.requests - requests, 1)
+        stats = self.client.stats()
+        self.assertEqual((stats['retries'], stats['errors']), (0, 1))
+        self.assertEqual(stats['circuit'], 'open')
+
+
+if __name__ == '__main__':
+    unittest.main()
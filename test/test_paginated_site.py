@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+from website.paginated_site import PaginatedSiteBuilder
+
+
+class TestPaginatedSiteBuilder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, 'site')
+        self.movies = [
+            (title, {"title": title, "year": "2000", "rating": "7.0", "poster": "N/A", "imdb_id": "tt0000001",
+                     "description": "A movie."})
+            for title in ["Alien", "Amelie", "Batman", "Brazil", "Casablanca"]
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _build(self, movies, per_page=2):
+        builder = PaginatedSiteBuilder(os.path.join('_static', 'index_template.html'), self.output_dir,
+                                       per_page=per_page, workers=2)
+        return builder.build(movies)
+
+    def test_pages_and_navigation(self):
+        self.assertEqual(self._build(self.movies), 3)
+        with open(os.path.join(self.output_dir, 'page-2.html'), 'r') as file:
+            page = file.read()
+        self.assertIn('href="index.html"', page)
+        self.assertIn('href="page-3.html"', page)
+        self.assertIn('Batman', page)
+        self.assertNotIn('Alien', page)
+        self.assertNotIn('style="', page.partition('<ol class="movie-grid">')[2])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, '_static', 'search.js')))
+
+    def test_search_shards(self):
+        self._build(self.movies)
+        with open(os.path.join(self.output_dir, 'search', 'manifest.json'), 'r') as file:
+            self.assertEqual(json.load(file)['shards'], {'a': 2, 'b': 2, 'c': 1})
+        with open(os.path.join(self.output_dir, 'search', 'b.json'), 'r') as file:
+            entries = json.load(file)
+        self.assertEqual([(entry['t'], entry['u']) for entry in entries],
+                         [('Batman', 'page-2.html'), ('Brazil', 'page-2.html')])
+
+    def test_stale_pages_removed(self):
+        self._build(self.movies)
+        self._build(self.movies[:2])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'page-2.html')))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'search', 'c.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
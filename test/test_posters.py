@@ -0,0 +1,140 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from website.paginated_site import PaginatedSiteBuilder
+from PIL import Image
+from storage.movie import Movie
+from website.posters import PosterCache
+from website.site_builder import SiteBuilder
+
+
+class PosterHandler(BaseHTTPRequestHandler):
+    """
+    Serves self.server.images ({path: (etag, body)}), answering If-None-Match with 304.
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path not in self.server.images:
+            self.send_error(404)
+            return
+        etag, body = self.server.images[self.path]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPosterCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), PosterHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.images = {f'/poster{number}.jpg': (f'"v1-{number}"', f'image {number}'.encode())
+                              for number in range(6)}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, '_static', 'posters')
+        self.posters = [f"{self.url}/poster{number}.jpg" for number in range(6)]
+        self.cache = PosterCache(self.directory, workers=3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_prefetch_skips_cached_posters(self):
+        counts = self.cache.prefetch(self.posters + ['N/A', self.posters[0]])
+        self.assertEqual(counts['downloaded'], 6)
+        self.assertEqual(len(self.server.requests), 6)
+        local = self.cache.src(self.posters[2])
+        self.assertTrue(local.startswith('_static/posters/'))
+        with open(os.path.join(self.directory, os.path.basename(local)), 'rb') as file:
+            self.assertEqual(file.read(), b'image 2')
+
+        # A new process reads the manifest and requests nothing
+        counts = PosterCache(self.directory).prefetch(self.posters)
+        self.assertEqual(counts['cached'], 6)
+        self.assertEqual(len(self.server.requests), 6)
+
+    def test_revalidate_uses_etag_and_content_hash(self):
+        self.cache.prefetch(self.posters)
+        self.server.images['/poster1.jpg'] = ('"v2-1"', b'image 1')  # New ETag, same bytes
+        self.server.images['/poster2.jpg'] = ('"v2-2"', b'new image 2')
+        counts = self.cache.prefetch(self.posters, revalidate=True)
+        self.assertEqual((counts['not_modified'], counts['unchanged'], counts['downloaded']), (4, 1, 1))
+        with open(os.path.join(self.directory, os.path.basename(self.cache.src(self.posters[2]))), 'rb') as file:
+            self.assertEqual(file.read(), b'new image 2')
+
+    def test_failed_download_keeps_remote_url(self):
+        missing = f"{self.url}/missing.jpg"
+        self.assertEqual(self.cache.prefetch([missing])['failed'], 1)
+        self.assertEqual(self.cache.src(missing), missing)
+
+    def test_thumbnail_is_downsized(self):
+        output = io.BytesIO()
+        Image.new('RGB', (1000, 1500), (200, 30, 30)).save(output, 'JPEG')
+        self.server.images['/large.jpg'] = ('"large"', output.getvalue())
+        url = f"{self.url}/large.jpg"
+        self.assertEqual(self.cache.prefetch([url])['downloaded'], 1)
+        local = self.cache.src(url)
+        self.assertTrue(local.endswith('.thumb.jpg'))
+        with Image.open(os.path.join(self.directory, os.path.basename(local))) as thumbnail:
+            self.assertEqual(thumbnail.size, (300, 450))
+        self.assertLess(os.path.getsize(os.path.join(self.directory, os.path.basename(local))),
+                        len(output.getvalue()))
+
+    def test_localize_keeps_identity_of_unchanged_movies(self):
+        movie = Movie.from_dict({"title": "Alien", "year": "1979", "rating": 8.5, "poster": self.posters[0]})
+        self.cache.prefetch([self.posters[0]])
+        (_, first), = self.cache.localize([("Alien", movie)])
+        (_, second), = self.cache.localize([("Alien", movie)])
+        self.assertIs(second, first)
+        self.assertEqual(first.poster, self.cache.src(self.posters[0]))
+        (_, changed), = self.cache.localize([("Alien", movie.replace(rating=9.0))])
+        self.assertIsNot(changed, first)
+
+    def test_sites_use_local_posters(self):
+        movies = {
+            "Alien": {"title": "Alien", "year": "1979", "rating": 8.5, "poster": self.posters[0],
+                      "imdb_id": "tt0078748", "description": "In space."},
+            "Brazil": {"title": "Brazil", "year": "1985", "rating": 7.8, "poster": "N/A",
+                       "imdb_id": "tt0088846", "description": "Paperwork."},
+        }
+        self.cache.prefetch(details['poster'] for details in movies.values())
+        output = os.path.join(self.temp_dir.name, 'index.html')
+        SiteBuilder(os.path.join('_static', 'index_template.html'), output).build(self.cache.localize(movies.items()))
+        with open(output, 'r') as file:
+            page = file.read()
+        self.assertIn(f'src="{self.cache.src(self.posters[0])}"', page)
+        self.assertIn('src="_static/poster_placeholder.svg"', page)
+        self.assertIn('loading="lazy"', page)
+        self.assertNotIn(self.url, page)
+
+        site = os.path.join(self.temp_dir.name, 'site')
+        PaginatedSiteBuilder(os.path.join('_static', 'index_template.html'), site, per_page=1,
+                             static_dir=os.path.dirname(self.directory), workers=1).build(
+            self.cache.localize(movies.items()))
+        self.assertTrue(os.path.exists(os.path.join(site, self.cache.src(self.posters[0]))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from benchmarks.omdb_stub import OmdbStubServer, stub_details
+from refresh_movies import changed_fields, load_refreshed, refresh_movies, refreshed_path
+from storage.storage_json import StorageJson
+from storage.storage_sqlite import StorageSqlite
+
+
+class TestRefreshMovies(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.omdb = OmdbStubServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.omdb.stop()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'movies.json')
+        self.storage = StorageJson(self.omdb.url, 'key', self.file_path, journal=True)
+        with self.storage.batch():
+            for number in range(5):
+                self.storage.add_movie_details({
+                    "Title": f"Movie {number}", "Year": "1990", "imdbRating": "0.5", "Poster": "N/A",
+                    "imdbID": f"tt000000{number}", "Plot": "Old plot.",
+                })
+            self.storage.add_movie("No IMDb ID", "2000", "5.0", "N/A", "Added by hand.")
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_changed_fields(self):
+        details = stub_details(imdb_id='tt0000001')
+        changes = changed_fields(self.storage.movies['Movie 1'], details)
+        self.assertEqual(changes['rating'], float(details['imdbRating']))
+        self.assertEqual(changes['poster'], details['Poster'])
+        self.assertNotIn('title', changes)
+        self.assertEqual(changed_fields(self.storage.movies['Movie 1'], {**details, 'imdbRating': 'N/A',
+                                                                        'Year': '1990', 'Poster': 'N/A',
+                                                                        'Plot': 'Old plot.'}), {})
+
+    def test_refresh_is_incremental_within_budget(self):
+        requests = self.omdb.requests
+        updated, failures = refresh_movies(self.storage, budget=3, min_age=1500, now=1000.0)
+        self.assertEqual(list(updated), ['Movie 0', 'Movie 1', 'Movie 2'])
+        self.assertEqual(failures, {})
+        self.assertEqual(self.omdb.requests - requests, 3)
+        expected = float(stub_details(imdb_id='tt0000000')['imdbRating'])
+        self.assertEqual(self.storage.movies['Movie 0'].rating, expected)
+
+        # The next run starts with the movies the first one did not reach, then the stalest ones
+        updated, _ = refresh_movies(self.storage, budget=3, min_age=1500, now=2000.0)
+        self.assertEqual(list(updated), ['Movie 3', 'Movie 4'])
+        self.assertEqual(load_refreshed(refreshed_path(self.storage))['tt0000003'], 2000.0)
+        updated, _ = refresh_movies(self.storage, budget=3, min_age=1500, now=2010.0)
+        self.assertEqual(updated, {})
+        self.assertEqual(self.omdb.requests - requests, 5)
+
+        # Already up to date: requested again once stale, but nothing is written
+        self.assertEqual(refresh_movies(self.storage, budget=1, min_age=1500, now=3000.0), ({}, {}))
+        self.assertEqual(load_refreshed(refreshed_path(self.storage))['tt0000000'], 3000.0)
+
+        reopened = StorageJson(self.omdb.url, 'key', self.file_path, journal=True)
+        self.assertEqual(reopened.movies['Movie 4'].rating, self.storage.movies['Movie 4'].rating)
+        reopened.close()
+
+    def test_rejects_backends_without_update_movie_details(self):
+        storage = StorageSqlite(self.omdb.url, 'key', os.path.join(self.temp_dir.name, 'movies.sqlite'))
+        requests = self.omdb.requests
+        try:
+            with self.assertRaisesRegex(Exception, 'not supported'):
+                refresh_movies(storage, now=1000.0)
+        finally:
+            storage.close()
+        self.assertEqual(self.omdb.requests, requests)
+        self.assertFalse(os.path.exists(refreshed_path(storage)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import random
+import unittest
+from collections import Counter
+from storage.sampler import MovieSampler
+
+
+class TestMovieSampler(unittest.TestCase):
+    def setUp(self):
+        self.sampler = MovieSampler(capacity=2, rng=random.Random(7))
+        self.sampler.rebuild([
+            ("Jumanji", {"rating": "2.0"}),
+            ("Memento", {"rating": 8.0}),
+            ("Alien", {"rating": "N/A"}),
+        ])
+
+    def test_choice_and_sample(self):
+        self.assertIn(self.sampler.choice(), {"Jumanji", "Memento", "Alien"})
+        sample = self.sampler.sample(5)
+        self.assertEqual(sorted(sample), ["Alien", "Jumanji", "Memento"])
+        self.assertIsNone(MovieSampler().choice())
+
+    def test_weighted_choice_follows_ratings(self):
+        counts = Counter(self.sampler.weighted_choice() for _ in range(5000))
+        self.assertNotIn("Alien", counts)
+        self.assertAlmostEqual(counts["Memento"] / 5000, 0.8, delta=0.03)
+
+    def test_weighted_sample_is_distinct_and_restores_weights(self):
+        self.assertEqual(sorted(self.sampler.weighted_sample(3)), ["Jumanji", "Memento"])
+        self.assertAlmostEqual(self.sampler._total_weight(), 10.0)
+
+    def test_remove_and_update(self):
+        self.sampler.remove("Jumanji")
+        self.sampler.add("Alien", {"rating": 5.0})
+        self.assertEqual(len(self.sampler), 2)
+        self.assertAlmostEqual(self.sampler._total_weight(), 13.0)
+        self.assertEqual(sorted(self.sampler.weighted_sample(2)), ["Alien", "Memento"])
+        self.sampler.remove("Memento")
+        self.assertEqual({self.sampler.weighted_choice() for _ in range(20)}, {"Alien"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from storage.search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.rebuild({
+            "Jumanji": {"title": "Jumanji", "description": "Two kids find and play a magical board game."},
+            "Memento": {"title": "Memento", "description": "A man with short-term memory loss."},
+            "The Matrix": {"title": "The Matrix", "description": "A hacker learns the truth about reality."},
+        })
+
+    def test_substring_match(self):
+        self.assertEqual(self.index.search("matr"), ["The Matrix"])
+
+    def test_typo_tolerance(self):
+        self.assertEqual(self.index.search("jumaji")[0], "Jumanji")
+
+    def test_description_match(self):
+        self.assertIn("Jumanji", self.index.search("board game"))
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("a", limit=1)), 1)
+
+    def test_remove(self):
+        self.index.remove("Memento")
+        self.assertEqual(self.index.search("memento"), [])
+
+    def test_description_word_prefix(self):
+        self.assertIn("Jumanji", self.index.search("magic"))
+
+    def test_common_grams_are_not_walked(self):
+        index = SearchIndex(common_limit=2)
+        movies = {f"Dark Night {number}": {"description": "A dark night."} for number in range(10)}
+        movies["Dark Shadows"] = {"description": "A vampire."}
+        index.rebuild(movies)
+        self.assertEqual(index.search("shadows", limit=1), ["Dark Shadows"])
+        self.assertEqual(index.search("dark shadwos", limit=1), ["Dark Shadows"])
+        self.assertEqual(len(index.search("dark night", limit=20)), 10)
+
+    def test_no_match(self):
+        self.assertEqual(self.index.search("xyzzy"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from storage.movie import Movie
+from website import site_builder
+from website.site_builder import SiteBuilder
+
+
+class TestSiteBuilder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, 'index.html')
+        self.builder = SiteBuilder(os.path.join('_static', 'index_template.html'), self.output)
+        self.movies = {
+            "Memento": {"title": "Memento", "year": "2000", "rating": "8.4", "poster": "N/A",
+                        "imdb_id": "tt0209144", "description": "Memory loss."},
+            "Jumanji": {"title": "Jumanji", "year": "1995", "rating": "7.1", "poster": "N/A",
+                        "imdb_id": "tt0113497", "description": "A <magical> board game."},
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_first_build_renders_everything(self):
+        self.assertTrue(self.builder.build(self.movies.items()))
+        self.assertEqual(self.builder.rendered, 2)
+        with open(self.output, 'r') as file:
+            page = file.read()
+        self.assertIn("Memento", page)
+        self.assertIn("A &lt;magical&gt; board game.", page)
+        self.assertNotIn("__TEMPLATE_MOVIE_GRID__", page)
+
+    def test_unchanged_build_skips_write(self):
+        self.builder.build(self.movies.items())
+        self.assertFalse(self.builder.build(self.movies.items()))
+        self.assertEqual(self.builder.rendered, 0)
+
+    def test_only_changed_movies_rerender_across_processes(self):
+        self.builder.build(self.movies.items())
+        self.movies["Jumanji"] = {**self.movies["Jumanji"], "rating": 9.0}
+        builder = SiteBuilder(os.path.join('_static', 'index_template.html'), self.output)
+        self.assertTrue(builder.build(self.movies.items()))
+        self.assertEqual(builder.rendered, 1)
+
+    def test_unchanged_movie_records_are_not_rehashed(self):
+        movies = {title: Movie.from_dict(details) for title, details in self.movies.items()}
+        with patch.object(site_builder, 'record_hash', wraps=site_builder.record_hash) as record_hash:
+            self.builder.build(movies.items())
+            self.assertEqual(record_hash.call_count, 2)
+            self.assertFalse(self.builder.build(movies.items()))
+            self.assertEqual(record_hash.call_count, 2)
+            movies["Jumanji"] = movies["Jumanji"].replace(rating=9.0)
+            self.assertTrue(self.builder.build(movies.items()))
+            self.assertEqual((record_hash.call_count, self.builder.rendered), (3, 1))
+        with open(self.output, 'r') as file:
+            page = file.read()
+        self.assertIn("9.0", page)
+        self.assertEqual(page.count("<li "), 2)
+
+    def test_delete_triggers_rebuild(self):
+        self.builder.build(self.movies.items())
+        del self.movies["Memento"]
+        self.assertTrue(self.builder.build(self.movies.items()))
+        with open(self.output, 'r') as file:
+            self.assertNotIn("Memento", file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from storage.stats import RatingStats
+
+
+class TestRatingStats(unittest.TestCase):
+    def setUp(self):
+        self.stats = RatingStats(capacity=2)
+        self.stats.rebuild([
+            ("Jumanji", {"year": "1995", "rating": "7.1"}),
+            ("Memento", {"year": "2000", "rating": "8.4"}),
+            ("Magnolia", {"year": "1999", "rating": 8.0}),
+            ("Alien", {"year": "1979", "rating": "N/A"}),
+        ])
+
+    def test_summary(self):
+        summary = self.stats.summary()
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['unrated'], 1)
+        self.assertAlmostEqual(summary['mean'], 7.8333333)
+        self.assertAlmostEqual(summary['median'], 8.0)
+        self.assertEqual(summary['best'], ("Memento", 8.4))
+        self.assertEqual(summary['worst'], ("Jumanji", 7.1))
+        self.assertEqual(summary['decades'][1990]['count'], 2)
+        self.assertAlmostEqual(summary['decades'][1990]['mean'], 7.55)
+        self.assertEqual(sum(n for _, _, n in summary['histogram']), 3)
+
+    def test_incremental_updates_invalidate_cache(self):
+        first = self.stats.summary()
+        self.assertIs(self.stats.summary(), first)
+        self.stats.remove("Memento")
+        self.stats.add("Jumanji", {"year": "1995", "rating": "9.0"})
+        summary = self.stats.summary()
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['best'], ("Jumanji", 9.0))
+        self.assertNotIn(2000, summary['decades'])
+
+    def test_rebuild_keeps_capacity(self):
+        stats = RatingStats(capacity=4096)
+        stats.rebuild([("Jumanji", {"year": "1995", "rating": "7.1"})])
+        self.assertEqual(len(stats._ratings), 4096)
+
+    def test_out_of_range_ratings_are_clamped_in_histogram(self):
+        self.stats.add("Overrated", {"year": "2001", "rating": "12"})
+        self.stats.add("Broken", {"year": "2002", "rating": "-1"})
+        summary = self.stats.summary()
+        self.assertEqual(summary['count'], 5)
+        self.assertEqual(sum(n for _, _, n in summary['histogram']), 5)
+        self.assertEqual((summary['histogram'][0][2], summary['histogram'][-1][2]), (1, 1))
+        self.assertEqual(summary['best'], ("Overrated", 12.0))
+
+    def test_no_ratings(self):
+        self.assertIsNone(RatingStats().summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from storage.storage_csv import StorageCsv
+
+
+class TestStorageCsv(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'movies.csv')
+        self.storage = StorageCsv(self.path, compact_threshold=3)
+        self.storage.add_movie("Memento", "2000", "8.4", "N/A")
+        self.storage.add_movie("Jumanji", "1995", "7.1", "N/A")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _reopen(self):
+        return StorageCsv(self.path).movies
+
+    def test_add_appends_rows(self):
+        with open(self.path, 'r') as file:
+            self.assertEqual(file.read().splitlines(),
+                             ["title,year,rating,poster", "Memento,2000,8.4,N/A", "Jumanji,1995,7.1,N/A"])
+
+    def test_tombstones_apply_on_reload(self):
+        self.storage.update_movie("Jumanji", "9.5")
+        self.storage.delete_movie("Memento")
+        self.assertTrue(os.path.exists(self.storage.tombstone_path))
+        self.assertEqual(self._reopen(), {"Jumanji": {"year": "1995", "rating": 9.5, "poster": "N/A"}})
+
+    def test_compaction(self):
+        self.storage.update_movie("Jumanji", "9.5")
+        self.storage.delete_movie("Memento")
+        self.storage.update_movie("Jumanji", "9.6")
+        self.assertFalse(os.path.exists(self.storage.tombstone_path))
+        self.assertEqual(self._reopen(), {"Jumanji": {"year": "1995", "rating": 9.6, "poster": "N/A"}})
+
+    def test_re_add_after_delete(self):
+        self.storage.delete_movie("Memento")
+        self.storage.add_movie("Memento", "2000", "8.5", "N/A")
+        self.assertEqual(self._reopen()["Memento"]["rating"], 8.5)
+
+    def test_cache_invalidated_by_other_writer(self):
+        movies = self.storage.movies
+        self.assertIs(self.storage.movies, movies)
+        StorageCsv(self.path).add_movie("Alien", "1979", "8.5", "N/A")
+        self.assertIn("Alien", self.storage.movies)
+
+    def test_concurrent_writer_is_not_hidden_by_own_append(self):
+        first, second = StorageCsv(self.path), StorageCsv(self.path)
+        first.movies, second.movies
+        other = threading.Thread(target=second.add_movie, args=("Alien", "1979", "8.5", "N/A"))
+        load_movies = first._load_movies
+
+        def load_then_let_other_write():
+            movies = load_movies()
+            if not other.is_alive():
+                other.start()
+                time.sleep(0.2)  # Without the lock, the other writer appends before our row
+            return movies
+
+        first._load_movies = load_then_let_other_write
+        first.add_movie("Heat", "1995", "8.3", "N/A")
+        other.join()
+        del first._load_movies
+        self.assertEqual(set(first.movies), {"Memento", "Jumanji", "Heat", "Alien"})
+        self.assertEqual(set(second.movies), {"Memento", "Jumanji", "Heat", "Alien"})
+        self.assertEqual(set(self._reopen()), {"Memento", "Jumanji", "Heat", "Alien"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,24 @@
 import unittest
 import json
+import multiprocessing
 import os
+from benchmarks.omdb_stub import OmdbStubServer
 from storage.storage_json import StorageJson
 from dotenv import load_dotenv
 
 class TestStorageJson(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.omdb = OmdbStubServer().start()  # Local stand-in for the OMDb API
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.omdb.stop()
+
     def setUp(self):
         load_dotenv()  # Load environment variables from .env file
         self.test_file = 'test_data.json'
-        self.storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=os.getenv('API_KEY'), file_path=self.test_file)
+        self.storage = StorageJson(api_url=self.omdb.url, api_key=os.getenv('API_KEY'), file_path=self.test_file)
         self.data = {
             "title": "Inception",
             "year": "2010",
@@ -19,8 +29,9 @@ class TestStorageJson(unittest.TestCase):
         self.storage.add_movie(**self.data)
 
     def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        for path in (self.test_file, f"{self.test_file}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_fetch_movie_details(self):
         movie_details = self.storage._fetch_movie_details(self.data['title'])
@@ -66,5 +77,249 @@ class TestStorageJson(unittest.TestCase):
         with self.assertRaises(Exception):
             self.storage.update_movie("Nonexistent Movie", "9.0")
 
+class TestStorageJsonJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_file = 'test_journal_data.json'
+        self.journal_file = f"{self.test_file}.journal"
+        self.storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file,
+                                   journal=True, compact_threshold=3)
+        self.data = {
+            "title": "Inception",
+            "year": "2010",
+            "rating": "8.8",
+            "poster": "N/A",
+            "description": "A thief who steals corporate secrets through the use of dream-sharing technology."
+        }
+        self.storage.add_movie(**self.data)
+
+    def tearDown(self):
+        self.storage.close()
+        for path in (self.test_file, self.journal_file, f"{self.test_file}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_mutation_goes_to_journal(self):
+        self.assertFalse(os.path.exists(self.test_file))
+        with open(self.journal_file, 'r') as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(records[0]['op'], 'put')
+        self.assertEqual(records[0]['key'], self.data['title'])
+
+    def test_replay_on_load(self):
+        self.storage.update_movie(self.data['title'], "9.0")
+        self.storage._journal.sync()
+        reloaded = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file, journal=True)
+        self.assertEqual(reloaded.movies[self.data['title']]['rating'], 9.0)
+
+    def test_append_after_torn_record(self):
+        self.storage.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        self.storage._journal.close()
+        with open(self.journal_file, 'a') as file:
+            file.write('{"op":"put","key":"Torn","mo')  # Crash in the middle of an append
+        reloaded = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file, journal=True)
+        reloaded.add_movie("Heat", "1995", "8.3", "N/A", "A heist.")
+        reloaded._journal.close()
+        again = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file, journal=True)
+        self.assertEqual(sorted(again.movies), ["Heat", "Inception", "Memento"])
+
+    def test_threshold_compaction(self):
+        self.storage.update_movie(self.data['title'], "9.0")
+        self.storage.delete_movie(self.data['title'])
+        self.assertFalse(os.path.exists(self.journal_file))
+        with open(self.test_file, 'r') as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_close_compacts(self):
+        self.storage.close()
+        self.assertFalse(os.path.exists(self.journal_file))
+        with open(self.test_file, 'r') as file:
+            self.assertIn(self.data['title'], json.load(file))
+
+
+class TestStorageJsonSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.paths = []
+
+    def tearDown(self):
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _storage(self, file_path):
+        self.paths.extend([file_path, f"{file_path}.corrupt", f"{file_path}.lock"])
+        return StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=file_path)
+
+    def test_binary_snapshot_round_trip(self):
+        storage = self._storage('test_snapshot.msgpack.zst')
+        storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        with open('test_snapshot.msgpack.zst', 'rb') as file:
+            self.assertNotEqual(file.read(1), b'{')
+        reloaded = self._storage('test_snapshot.msgpack.zst')
+        self.assertEqual(reloaded.movies, storage.movies)
+
+    def test_save_leaves_no_temp_files(self):
+        storage = self._storage('test_snapshot.json')
+        storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        self.assertEqual([name for name in os.listdir('.') if name.startswith('.test_snapshot.json.')], [])
+
+    @unittest.skipUnless(hasattr(os, 'fchmod'), "file modes are POSIX only")
+    def test_save_keeps_file_mode(self):
+        storage = self._storage('test_snapshot.json')
+        storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(os.stat('test_snapshot.json').st_mode & 0o777, 0o666 & ~umask)
+        os.chmod('test_snapshot.json', 0o640)
+        storage.add_movie("Heat", "1995", "8.3", "N/A", "A heist.")
+        self.assertEqual(os.stat('test_snapshot.json').st_mode & 0o777, 0o640)
+
+    def test_corrupt_snapshot_is_preserved(self):
+        with open('test_snapshot.json', 'w') as file:
+            file.write('{"Inception": {')
+        storage = self._storage('test_snapshot.json')
+        self.assertEqual(storage.movies, {})
+        self.assertTrue(os.path.exists('test_snapshot.json.corrupt'))
+
+
+class TestStorageJsonIndexes(unittest.TestCase):
+    def setUp(self):
+        self.test_file = 'test_index_data.json'
+        self.storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file)
+        self.storage.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        self.storage.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        self.storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+
+    def tearDown(self):
+        for path in (self.test_file, f"{self.test_file}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_find_movie_is_case_insensitive(self):
+        self.assertEqual(self.storage.find_movie("mEmEnTo"), "Memento")
+        self.assertIsNone(self.storage.find_movie("Nonexistent Movie"))
+
+    def test_sorted_by_rating_follows_updates(self):
+        self.storage.update_movie("jumanji", "9.5")
+        self.assertEqual([title for title, _ in self.storage.movies_sorted_by_rating()],
+                         ["Jumanji", "Inception", "Memento"])
+        self.assertEqual([title for title, _ in self.storage.movies_sorted_by_rating(limit=1)], ["Jumanji"])
+
+    def test_random_picks_follow_deletes(self):
+        self.storage.delete_movie("Memento")
+        picks = {self.storage.random_movie()[0] for _ in range(50)}
+        self.assertEqual(picks, {"Jumanji", "Inception"})
+        self.assertEqual(sorted(title for title, _ in self.storage.sample_movies(5, weighted=True)),
+                         ["Inception", "Jumanji"])
+
+    def test_batch_writes_once(self):
+        saves = []
+        original_save = self.storage._save_movies
+        self.storage._save_movies = lambda: saves.append(original_save())
+        with self.storage.batch():
+            self.storage.delete_movie("Memento")
+            self.storage.update_movie("Jumanji", "9.5")
+        self.assertEqual(len(saves), 1)
+        with open(self.test_file, 'r') as file:
+            self.assertEqual(sorted(json.load(file)), ["Inception", "Jumanji"])
+
+    def test_movies_in_years_follows_deletes(self):
+        self.assertEqual([title for title, _ in self.storage.movies_in_years(1995, 2005)], ["Jumanji", "Memento"])
+        self.storage.delete_movie("Memento")
+        self.assertEqual([title for title, _ in self.storage.movies_in_years(start=1996)], ["Inception"])
+
+
+def _add_movies(file_path, journal, prefix, count):
+    storage = StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=file_path, journal=journal)
+    for number in range(count):
+        storage.add_movie(f"{prefix} {number}", "2000", "7.0", "N/A", "Concurrent add.")
+    storage.close()
+
+
+class TestStorageJsonConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.test_file = 'test_shared_data.json'
+
+    def tearDown(self):
+        for suffix in ('', '.journal', '.lock'):
+            if os.path.exists(self.test_file + suffix):
+                os.remove(self.test_file + suffix)
+
+    def _storage(self, journal=False):
+        return StorageJson(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.test_file, journal=journal)
+
+    def test_stale_writer_merges_instead_of_overwriting(self):
+        first, second = self._storage(), self._storage()
+        first.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        second.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        with open(self.test_file, 'r') as file:
+            self.assertEqual(set(json.load(file)), {"Memento", "Jumanji"})
+        self.assertTrue(first.refresh())
+        self.assertFalse(first.refresh())
+        self.assertEqual(first.find_movie("jumanji"), "Jumanji")
+
+    def test_search_index_follows_other_writers(self):
+        first, second = self._storage(), self._storage()
+        first.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        self.assertIsNone(first._search)  # Only built when first searched
+        self.assertEqual([title for title, _ in first.search_movies("memento")], ["Memento"])
+        search = first._search
+        second.refresh()
+        second.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        second.delete_movie("Memento")
+        self.assertTrue(first.refresh())
+        self.assertIs(first._search, search)  # Updated in place, not rebuilt
+        self.assertEqual([title for title, _ in first.search_movies("board game")], ["Jumanji"])
+        self.assertEqual(first.search_movies("memento"), [])
+
+    def test_indexes_follow_other_writers_without_rebuild(self):
+        first, second = self._storage(journal=True), self._storage(journal=True)
+        with first.batch():
+            for number in range(10):
+                first.add_movie(f"Movie {number}", str(1990 + number), "5.0", "N/A", "Filler.")
+        indexes = (first._index, first._stats, first._sampler)
+        second.refresh()
+        second.update_movie("Movie 3", "9.5")
+        second.delete_movie("Movie 0")
+        second.add_movie("Heat", "1995", "8.3", "N/A", "A heist.")
+        self.assertTrue(first.refresh())
+        self.assertEqual((first._index, first._stats, first._sampler), indexes)
+        self.assertEqual([title for title, _ in first.movies_sorted_by_rating(2)], ["Movie 3", "Heat"])
+        self.assertIsNone(first.find_movie("movie 0"))
+        self.assertEqual(first.movie_stats()['count'], 10)
+        self.assertEqual(len(first._sampler), 10)
+        self.assertEqual([title for title, _ in first.movies_in_years(1995, 1995)], ["Heat", "Movie 5"])
+        second.close()
+        first.close()
+
+    def test_journal_writers_survive_compaction(self):
+        first, second = self._storage(journal=True), self._storage(journal=True)
+        first.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        second.add_movie("Jumanji", "1995", "7.1", "N/A", "A board game.")
+        first.compact()
+        second.delete_movie("Memento")
+        second.close()
+        first.close()
+        self.assertEqual(list(self._storage(journal=True).movies), ["Jumanji"])
+
+    def test_closing_a_reader_does_not_compact(self):
+        writer = self._storage(journal=True)
+        writer.add_movie("Memento", "2000", "8.4", "N/A", "Memory loss.")
+        self._storage(journal=True).close()
+        self.assertTrue(os.path.exists(f"{self.test_file}.journal"))
+        writer.close()
+        self.assertFalse(os.path.exists(f"{self.test_file}.journal"))
+
+    def test_concurrent_processes(self):
+        for journal in (False, True):
+            processes = [multiprocessing.Process(target=_add_movies, args=(self.test_file, journal, prefix, 20))
+                         for prefix in ("Alpha", "Beta", "Gamma")]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            self.assertEqual(len(self._storage(journal).movies), 60)
+            self.tearDown()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
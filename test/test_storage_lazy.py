@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from storage.storage_lazy import LazyStorageJson
+
+
+class TestLazyStorageJson(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.temp_dir.name, 'movies.json')
+        self.records = os.path.join(self.temp_dir.name, 'movies.jsonl')
+        with open(self.snapshot, 'w') as file:
+            json.dump({
+                "Memento": {"title": "Memento", "year": "2000", "rating": "8.4", "poster": "N/A",
+                            "description": "Memory\tloss."},
+                "Jumanji": {"title": "Jumanji", "year": "1995", "rating": "7.1", "poster": "N/A",
+                            "description": "A board game.\nWith a hunter."},
+            }, file)
+        self.storage = self._open(snapshot=True)
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def _open(self, snapshot=False):
+        kwargs = {'api_url': 'http://www.omdbapi.com/', 'api_key': None}
+        if snapshot:
+            return LazyStorageJson.from_snapshot(self.snapshot, self.records, **kwargs)
+        return LazyStorageJson(file_path=self.records, **kwargs)
+
+    def test_records_decoded_on_demand(self):
+        self.assertEqual(len(self.storage.movies), 2)
+        self.assertEqual(self.storage._decoded, {})
+        self.assertEqual(self.storage.movies["Memento"]["description"], "Memory\tloss.")
+
+    def test_mutations_survive_reopen(self):
+        self.storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        self.storage.update_movie("jumanji", "9.5")
+        self.storage.delete_movie("Memento")
+        self.storage.close()
+        self.storage = self._open()
+        self.assertEqual([title for title, _ in self.storage.iter_movies()], ["Jumanji", "Inception"])
+        self.assertEqual(self.storage.movies["Jumanji"]["rating"], 9.5)
+
+    def test_compaction_drops_superseded_records(self):
+        for rating in range(1, 10):
+            self.storage.update_movie("Jumanji", str(rating))
+        self.assertLessEqual(self.storage._garbage, os.path.getsize(self.records) // 2)
+        self.assertEqual(self.storage.movies["Jumanji"]["rating"], 9.0)
+        self.assertEqual(self.storage.movies["Memento"]["rating"], "8.4")
+
+    def test_torn_line_is_ignored(self):
+        self.storage.close()
+        with open(self.records, 'ab') as file:
+            file.write(b'"Alien"\t{"title": "Al')
+        self.storage = self._open()
+        self.assertNotIn("Alien", self.storage.movies)
+        self.storage.add_movie("Alien", "1979", "8.5", "N/A", "In space.")
+        self.storage.close()
+        self.storage = self._open()
+        self.assertEqual(self.storage.movies["Alien"]["year"], "1979")
+
+    def test_queries(self):
+        self.assertEqual([title for title, _ in self.storage.movies_sorted_by_rating(limit=1)], ["Memento"])
+        self.assertEqual([title for title, _ in self.storage.search_movies("jumaji")], ["Jumanji"])
+
+
+if __name__ == '__main__':
+    unittest.main()
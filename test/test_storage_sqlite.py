@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from storage.stats import RatingStats
+from storage.storage_sqlite import StorageSqlite
+
+
+class TestStorageSqlite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'movies.sqlite')
+        self.storage = StorageSqlite(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.path)
+        self.storage.import_movies([
+            ("Memento", {"title": "Memento", "year": "2000", "rating": "8.4", "poster": "N/A",
+                         "imdb_id": "tt0209144", "description": "Memory loss."}),
+            ("Jumanji", {"title": "Jumanji", "year": "1995", "rating": "7.1", "poster": "N/A",
+                         "imdb_id": "tt0113497", "description": "A magical board game."}),
+            ("Alien", {"title": "Alien", "year": "1979", "rating": "N/A", "poster": "N/A",
+                       "imdb_id": "tt0078748", "description": "In space."}),
+        ])
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_round_trip_and_case_insensitive_lookup(self):
+        self.assertEqual(self.storage.find_movie("MEMENTO"), "Memento")
+        self.assertEqual(self.storage.movies["Jumanji"]["rating"], 7.1)
+        self.assertEqual(self.storage.movies["Alien"]["rating"], "N/A")
+        self.assertEqual(len(self.storage.movies), 3)
+
+    def test_mutations(self):
+        self.storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        self.storage.update_movie("jumanji", "9.5")
+        self.storage.delete_movie("memento")
+        with self.assertRaises(Exception):
+            self.storage.add_movie("inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        with self.assertRaises(Exception):
+            self.storage.delete_movie("Nonexistent Movie")
+        self.assertEqual([title for title, _ in self.storage.movies_sorted_by_rating()],
+                         ["Jumanji", "Inception", "Alien"])
+
+    def test_batch_rolls_back_on_error(self):
+        with self.assertRaises(Exception):
+            with self.storage.batch():
+                self.storage.delete_movie("Memento")
+                self.storage.delete_movie("Nonexistent Movie")
+        self.assertEqual(self.storage.find_movie("Memento"), "Memento")
+
+    def test_queries(self):
+        self.assertEqual([title for title, _ in self.storage.search_movies("board")], ["Jumanji"])
+        self.assertEqual([title for title, _ in self.storage.search_movies("m")][:2], ["Memento", "Jumanji"])
+        self.assertEqual([title for title, _ in self.storage.movies_in_years(1990, 2000)], ["Jumanji", "Memento"])
+        self.assertEqual([title for title, _ in self.storage.search_movies("MAGICAL")], ["Jumanji"])
+        self.assertEqual(self.storage.search_movies("spaceship"), [])
+        stats = self.storage.movie_stats()
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['unrated'], 1)
+        self.assertAlmostEqual(stats['median'], 7.75)
+        self.assertEqual(stats['best'], ("Memento", 8.4))
+        self.assertIn(self.storage.random_movie()[0], ["Memento", "Jumanji", "Alien"])
+
+    def test_stats_match_rating_stats(self):
+        self.storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        self.storage.add_movie("Perfect", "1999", "10", "N/A", "Top marks.")
+        self.storage.add_movie("Overrated", "2001", "12", "N/A", "Off the scale.")
+        expected = RatingStats()
+        expected.rebuild(self.storage.iter_movies())
+        stats, summary = self.storage.movie_stats(), expected.summary()
+        self.assertEqual(set(stats), set(summary))
+        for percent, value in summary['percentiles'].items():
+            self.assertAlmostEqual(stats['percentiles'][percent], value)
+        self.assertEqual(stats['histogram'], summary['histogram'])
+        self.assertEqual(set(stats['decades']), set(summary['decades']))
+        for decade, values in summary['decades'].items():
+            self.assertEqual(stats['decades'][decade]['count'], values['count'])
+            self.assertAlmostEqual(stats['decades'][decade]['mean'], values['mean'])
+
+    def test_search_index_follows_writes(self):
+        self.storage.update_movie("Jumanji", "7.5")
+        self.storage.import_movies([("Jumanji", {"title": "Jumanji", "year": "1995", "rating": "7.1",
+                                                 "poster": "N/A", "description": "Jungle drums."})])
+        self.storage.delete_movie("Memento")
+        self.assertEqual([title for title, _ in self.storage.search_movies("jungle")], ["Jumanji"])
+        self.assertEqual(self.storage.search_movies("magical"), [])
+        self.assertEqual(self.storage.search_movies("memory"), [])
+
+    def test_weighted_random_follows_writes(self):
+        self.assertIn(self.storage.random_movie(weighted=True)[0], ["Memento", "Jumanji"])
+        sampler = self.storage._sampler
+        self.storage.delete_movie("memento")
+        self.storage.update_movie("jumanji", "0")
+        self.assertIsNone(self.storage.random_movie(weighted=True))
+        self.storage.add_movie("Inception", "2010", "8.8", "N/A", "Dreams within dreams.")
+        self.assertEqual(self.storage.random_movie(weighted=True)[0], "Inception")
+        self.assertIs(self.storage._sampler, sampler)  # Kept in sync, not rebuilt
+
+        other = StorageSqlite(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.path)
+        other.delete_movie("Inception")
+        other.update_movie("Alien", "8.5")
+        other.close()
+        self.assertEqual(self.storage.random_movie(weighted=True)[0], "Alien")
+
+        with self.assertRaises(Exception):
+            with self.storage.batch():
+                self.storage.update_movie("Jumanji", "9.0")
+                self.storage.delete_movie("Nonexistent Movie")
+        self.assertEqual({self.storage.random_movie(weighted=True)[0] for _ in range(20)}, {"Alien"})
+
+    def test_migrates_text_ratings(self):
+        self.storage._connection.execute("UPDATE movies SET rating = '8.4' WHERE title = 'Memento'")
+        self.storage._connection.execute("PRAGMA user_version = 0")
+        self.storage.close()
+        self.storage = StorageSqlite(api_url='http://www.omdbapi.com/', api_key=None, file_path=self.path)
+        self.assertEqual(self.storage.movies["Memento"]["rating"], 8.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import html
+import itertools
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from website.site_builder import GRID_PLACEHOLDER, NAV_PLACEHOLDER, poster_src, write_streamed
+
+STATIC_FILES = ('style.css', 'pop.webp', 'search.js', 'poster_placeholder.svg')
+POSTERS_DIR = 'posters'
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def page_name(number):
+    """
+    File name of a 1-based page number; the first page is the site's index.html.
+    """
+    return 'index.html' if number == 1 else f'page-{number}.html'
+
+
+def shard_name(title, prefix_length):
+    """
+    Name of the search shard holding a title: its lowercased prefix with non-alphanumerics replaced by '_'.
+    """
+    return _NON_ALNUM.sub('_', title.lower()[:prefix_length]) or '_'
+
+
+def render_movie_item(anchor, title, details):
+    """
+    Render the <li> fragment of one movie, styled by class from style.css instead of inline styles.
+    """
+    title = html.escape(title)
+    return f"""
+                <li id="{anchor}">
+                    <h2>{title}</h2>
+                    <div class="movie-details">
+                        <a href="https://www.imdb.com/title/{html.escape(str(details.get('imdb_id', '')))}" target="_blank">
+                            <img src="{html.escape(poster_src(details['poster']))}" alt="{title} poster" loading="lazy" decoding="async">
+                        </a>
+                        <div class="movie-info">
+                            <p><strong>Description:</strong> {html.escape(str(details.get('description', '')))}</p>
+                            <p><strong>Year:</strong> {html.escape(str(details['year']))}</p>
+                            <p><strong>Rating:</strong> {html.escape(str(details['rating']))}</p>
+                        </div>
+                    </div>
+                </li>
+                """
+
+
+def render_nav(number, page_count, prefix_length):
+    """
+    Render the previous/next navigation and the search box of one page.
+    """
+    previous_link = f'<a href="{page_name(number - 1)}">&laquo; Previous</a>' if number > 1 else '<span></span>'
+    next_link = f'<a href="{page_name(number + 1)}">Next &raquo;</a>' if number < page_count else '<span></span>'
+    return f"""<nav class="page-nav">
+    {previous_link}
+    <div class="movie-search">
+        <input type="search" placeholder="Search titles" data-prefix-length="{prefix_length}">
+        <ol class="movie-search-results"></ol>
+    </div>
+    <span>Page {number} of {page_count}</span>
+    {next_link}
+</nav>
+<script src="_static/search.js" defer></script>"""
+
+
+def _write_shard(path, entries):
+    """
+    Write one search shard. Runs in a worker process.
+    """
+    entries.sort(key=lambda entry: entry['k'])
+    write_streamed(path, [json.dumps(entries, separators=(',', ':'))])
+    return len(entries)
+
+
+class PaginatedSiteBuilder:
+    """
+    Website output for large catalogs: per_page movies per page under output_dir with
+    previous/next navigation, plus a JSON search index sharded by title prefix so the
+    browser only loads the shard matching what is typed. Shards are written in parallel
+    across a process pool.
+    """
+
+    def __init__(self, template_path, output_dir='site', per_page=100, prefix_length=1,
+                 static_dir='_static', workers=None):
+        """
+        Initialize with the template path, the output directory, the number of movies per page,
+        the title prefix length used to shard the search index, and the worker process count.
+        """
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.per_page = per_page
+        self.prefix_length = prefix_length
+        self.static_dir = static_dir
+        self.workers = workers
+
+    def _copy_static(self):
+        """
+        Copy the stylesheet, images and search script next to the pages, and the locally
+        cached posters that are new or changed since the last build.
+        """
+        target = os.path.join(self.output_dir, '_static')
+        os.makedirs(target, exist_ok=True)
+        for name in STATIC_FILES:
+            source = os.path.join(self.static_dir, name)
+            if os.path.exists(source):
+                shutil.copy2(source, os.path.join(target, name))
+        posters = os.path.join(self.static_dir, POSTERS_DIR)
+        if not os.path.isdir(posters):
+            return
+        os.makedirs(os.path.join(target, POSTERS_DIR), exist_ok=True)
+        for entry in os.scandir(posters):
+            destination = os.path.join(target, POSTERS_DIR, entry.name)
+            try:
+                if os.stat(destination).st_mtime_ns >= entry.stat().st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                pass
+            shutil.copy2(entry.path, destination)
+
+    def _remove_stale(self, page_count, shard_names):
+        """
+        Remove pages and shards left over from a previous, larger build.
+        """
+        for name in os.listdir(self.output_dir):
+            match = re.fullmatch(r'page-(\d+)\.html', name)
+            if match and int(match.group(1)) > page_count:
+                os.remove(os.path.join(self.output_dir, name))
+        search_dir = os.path.join(self.output_dir, 'search')
+        for name in os.listdir(search_dir):
+            if name != 'manifest.json' and name.endswith('.json') and name[:-5] not in shard_names:
+                os.remove(os.path.join(search_dir, name))
+
+    def build(self, movies, total=None):
+        """
+        Build every page and search shard from (title, details) pairs.
+        When the number of movies is given as total, movies are streamed one page at a time.
+        Returns the number of pages written.
+        """
+        with open(self.template_path, 'r') as file:
+            template = file.read()
+        head, _, tail = template.partition(GRID_PLACEHOLDER)
+        os.makedirs(os.path.join(self.output_dir, 'search'), exist_ok=True)
+        self._copy_static()
+
+        if total is None:
+            movies = list(movies)
+            total = len(movies)
+        movies = iter(movies)
+        page_count = max(1, -(-total // self.per_page))
+        shards = {}
+        for number in range(1, page_count + 1):
+            page = itertools.islice(movies, self.per_page)
+            nav = render_nav(number, page_count, self.prefix_length)
+            items = []
+            for offset, (title, details) in enumerate(page):
+                anchor = f'm{(number - 1) * self.per_page + offset}'
+                items.append(render_movie_item(anchor, title, details))
+                shards.setdefault(shard_name(title, self.prefix_length), []).append({
+                    'k': title.lower(), 't': title, 'y': details['year'], 'r': details['rating'],
+                    'u': page_name(number), 'a': anchor,
+                })
+            write_streamed(os.path.join(self.output_dir, page_name(number)), [
+                head.replace(NAV_PLACEHOLDER, nav), "\n".join(items), tail.replace(NAV_PLACEHOLDER, nav)
+            ])
+
+        search_dir = os.path.join(self.output_dir, 'search')
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            counts = pool.map(_write_shard, [os.path.join(search_dir, f'{name}.json') for name in shards],
+                              shards.values())
+            manifest = dict(zip(shards, counts))
+        write_streamed(os.path.join(search_dir, 'manifest.json'), [json.dumps({
+            'prefix_length': self.prefix_length, 'pages': page_count, 'shards': manifest
+        }, separators=(',', ':'))])
+        self._remove_stale(page_count, shards)
+        return page_count
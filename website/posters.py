@@ -0,0 +1,181 @@
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from storage.movie import Movie
+from storage.snapshot import write_atomic
+
+POSTER_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+
+def is_remote_poster(poster):
+    """
+    Whether a poster field holds a downloadable http(s) URL (and not 'N/A' or a local path).
+    """
+    return isinstance(poster, str) and poster.startswith(('http://', 'https://'))
+
+
+class PosterCache:
+    """
+    Local copies of the movie posters under directory, so the generated site serves its
+    own downsized thumbnails instead of hot-linking every poster from OMDb's image host.
+
+    Posters are downloaded by a bounded thread pool. The manifest records the ETag and
+    SHA-256 of each poster: cached posters are not requested again unless revalidated,
+    revalidation is a conditional request, and a re-sent but unchanged image is neither
+    rewritten nor re-thumbnailed.
+    """
+
+    def __init__(self, directory=os.path.join('_static', 'posters'), url_prefix='_static/posters', workers=8,
+                 thumbnail_size=(300, 450), connect_timeout=3.05, read_timeout=10.0, session=None):
+        """
+        Initialize with the cache directory, the URL prefix the pages use to reach it, the number of
+        download threads, the bounding box of the thumbnails and the request timeouts in seconds.
+        """
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.workers = workers
+        self.thumbnail_size = thumbnail_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        self._manifest = None
+        self._localized = {}  # Title: (Movie, its localized copy) from the last localize()
+
+    def _load_manifest(self):
+        """
+        Load the manifest ({url: {'file', 'thumbnail', 'etag', 'sha256'}}) on first use.
+        """
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                    self._manifest = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        payload = json.dumps(self._manifest, indent=1, sort_keys=True).encode('utf-8')
+        write_atomic(self.manifest_path, payload)
+
+    @staticmethod
+    def _file_name(url):
+        """
+        Cache file name of a poster URL: a hash of the URL, keeping the image extension.
+        """
+        extension = os.path.splitext(urlsplit(url).path)[1].lower()
+        if extension not in POSTER_EXTENSIONS:
+            extension = '.jpg'
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:20] + extension
+
+    def is_cached(self, url):
+        """
+        Whether the thumbnail of url is on disk.
+        """
+        entry = self._load_manifest().get(url)
+        return entry is not None and os.path.exists(os.path.join(self.directory, entry['thumbnail']))
+
+    def _thumbnail(self, name, content):
+        """
+        Write a thumbnail fitting thumbnail_size and return its file name.
+        Falls back to the full-size poster when the image cannot be decoded.
+        """
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                image.thumbnail(self.thumbnail_size)
+                output = io.BytesIO()
+                image.convert('RGB').save(output, 'JPEG', quality=85, optimize=True)
+        except (OSError, ValueError):
+            return name
+        thumbnail = f"{os.path.splitext(name)[0]}.thumb.jpg"
+        write_atomic(os.path.join(self.directory, thumbnail), output.getvalue())
+        return thumbnail
+
+    def _fetch(self, url, entry):
+        """
+        Download one poster. Returns (outcome, new manifest entry or None); outcome is 'downloaded',
+        'not_modified' (304), 'unchanged' (same content hash) or 'failed'.
+        """
+        headers = {'If-None-Match': entry['etag']} if entry and entry.get('etag') else {}
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and entry:
+                return 'not_modified', None
+            response.raise_for_status()
+            content = response.content
+            digest = hashlib.sha256(content).hexdigest()
+            etag = response.headers.get('ETag')
+            if entry and entry['sha256'] == digest:  # entry is only passed for posters still on disk
+                return 'unchanged', {**entry, 'etag': etag}
+            name = self._file_name(url)
+            write_atomic(os.path.join(self.directory, name), content)
+            return 'downloaded', {'file': name, 'thumbnail': self._thumbnail(name, content),
+                                  'etag': etag, 'sha256': digest}
+        except (requests.exceptions.RequestException, OSError):
+            return 'failed', None
+
+    def prefetch(self, posters, revalidate=False):
+        """
+        Download the posters (URLs; 'N/A' and local paths are ignored) that are not cached yet,
+        or, with revalidate, check every poster against the server with its ETag.
+        Returns a dict counting the posters by outcome, plus 'cached' for those not requested.
+        """
+        manifest = self._load_manifest()
+        urls = list(dict.fromkeys(poster for poster in posters if is_remote_poster(poster)))
+        pending = {}
+        for url in urls:
+            cached = self.is_cached(url)
+            if revalidate or not cached:
+                pending[url] = manifest[url] if cached else None
+        counts = {'cached': len(urls) - len(pending), 'downloaded': 0, 'not_modified': 0, 'unchanged': 0,
+                  'failed': 0}
+        if not pending:
+            return counts
+        os.makedirs(self.directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for url, (outcome, entry) in zip(pending, pool.map(self._fetch, pending, pending.values())):
+                counts[outcome] += 1
+                if entry is not None:
+                    manifest[url] = entry
+        if counts['downloaded'] or counts['unchanged']:
+            self._save_manifest()
+        return counts
+
+    def src(self, poster):
+        """
+        Image source for a poster field: the cached thumbnail if there is one, otherwise the field unchanged.
+        """
+        entry = self._load_manifest().get(poster) if is_remote_poster(poster) else None
+        return f"{self.url_prefix}/{entry['thumbnail']}" if entry else poster
+
+    def localize(self, movies):
+        """
+        Yield (title, details) pairs with the poster of every cached movie pointing at its local thumbnail.
+        A Movie yields a Movie, the same object as last time while the movie is unchanged, so the
+        site builder can still tell unchanged records apart by identity.
+        """
+        localized = {}
+        for title, details in movies:
+            poster = details.get('poster')
+            local = self.src(poster)
+            if local != poster:
+                if isinstance(details, Movie):
+                    source, copy = self._localized.get(title, (None, None))
+                    if source is not details or copy.poster != local:
+                        source, copy = details, details.replace(poster=local)
+                    localized[title] = (source, copy)
+                    details = copy
+                else:
+                    details = {**details, 'poster': local}
+            yield title, details
+        self._localized = localized
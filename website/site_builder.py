@@ -0,0 +1,166 @@
+import hashlib
+import html
+import json
+import os
+import tempfile
+from itertools import chain
+from storage.movie import Movie
+
+GRID_PLACEHOLDER = "__TEMPLATE_MOVIE_GRID__"
+NAV_PLACEHOLDER = "__TEMPLATE_PAGE_NAV__"
+PLACEHOLDER_POSTER = "_static/poster_placeholder.svg"
+# Bumped whenever the rendered markup changes, so cached fragments from older builds are re-rendered
+FRAGMENT_VERSION = 2
+
+
+def record_hash(title, details):
+    """
+    Content hash of one movie record, used as its fragment cache key.
+    """
+    if hasattr(details, 'to_dict'):
+        details = details.to_dict()
+    payload = json.dumps([FRAGMENT_VERSION, title, details], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def poster_src(poster):
+    """
+    Image source of a poster: the local placeholder for movies without one ('N/A').
+    """
+    return PLACEHOLDER_POSTER if not poster or poster == 'N/A' else str(poster)
+
+
+def render_movie(title, details):
+    """
+    Render the <li> fragment of one movie.
+    """
+    title = html.escape(title)
+    return f"""
+                <li style="list-style-type: none; margin-bottom: 20px;">
+                    <h2 style="text-align: center;">{title}</h2>
+                    <div style="display: flex; align-items: center;">
+                        <a href="https://www.imdb.com/title/{html.escape(str(details.get('imdb_id', '')))}" target="_blank">
+                            <img src="{html.escape(poster_src(details['poster']))}" alt="{title} poster" loading="lazy" decoding="async" style="width: 150px; height: auto; margin-right: 20px;">
+                        </a>                        <div>
+                            <p><strong>Description:</strong> {html.escape(str(details.get('description', '')))}</p>
+                            <p><strong>Year:</strong> {html.escape(str(details['year']))}</p>
+                            <p><strong>Rating:</strong> {html.escape(str(details['rating']))}</p>
+                        </div>
+                    </div>
+                </li>
+                """
+
+
+def separated(fragments, separator="\n"):
+    """
+    Yield fragments with separator between them, so a page can be written without joining it in memory.
+    """
+    for number, fragment in enumerate(fragments):
+        if number:
+            yield separator
+        yield fragment
+
+
+def write_streamed(path, chunks):
+    """
+    Stream chunks of text into a temp file next to path and rename it into place.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.writelines(chunks)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class SiteBuilder:
+    """
+    Incremental builder of the single-page website.
+
+    Rendered movie fragments are cached (in memory and in cache_path) under the content
+    hash of their record, so only new or changed movies are re-rendered. Movie records
+    are immutable, so one that is the very object of the previous build keeps its hash
+    without being hashed again; plain dicts are hashed on every build. The page is
+    written fragment by fragment, and not at all if nothing changed since the last build.
+    """
+
+    def __init__(self, template_path, output_path='index.html', cache_path=None, renderer=render_movie):
+        """
+        Initialize with the template path, the output page and the fragment cache file
+        (defaults to '.site_cache.json' next to the output).
+        """
+        self.template_path = template_path
+        self.output_path = output_path
+        self.cache_path = cache_path or os.path.join(os.path.dirname(output_path), '.site_cache.json')
+        self.renderer = renderer
+        self.rendered = 0
+        self._fragments = None
+        self._build_hash = None
+        self._sources = {}  # Title: Movie record the cached fragment was built from in this process
+
+    def _load_cache(self):
+        """
+        Load the fragment cache from disk on first use.
+        """
+        if self._fragments is not None:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            self._fragments = cache['fragments']
+            self._build_hash = cache['build_hash']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self._fragments = {}
+            self._build_hash = None
+
+    def _save_cache(self):
+        """
+        Persist the fragment cache so the next process can reuse it.
+        """
+        payload = json.dumps({'build_hash': self._build_hash, 'fragments': self._fragments}, separators=(',', ':'))
+        write_streamed(self.cache_path, [payload])
+
+    def build(self, movies):
+        """
+        Build the page from (title, details) pairs.
+        Returns True if the page was written, False if it was already up to date.
+        """
+        with open(self.template_path, 'r') as file:
+            template = file.read().replace(NAV_PLACEHOLDER, '')
+        head, _, tail = template.partition(GRID_PLACEHOLDER)
+        self._load_cache()
+
+        build_hash = hashlib.sha1(template.encode('utf-8'))
+        fragments = {}
+        sources = {}
+        order = []
+        self.rendered = 0
+        for title, details in movies:
+            cached = self._fragments.get(title)
+            if cached is None or self._sources.get(title) is not details:
+                digest = record_hash(title, details)
+                if cached is None or cached[0] != digest:
+                    cached = [digest, self.renderer(title, details)]
+                    self.rendered += 1
+            if isinstance(details, Movie):
+                sources[title] = details
+            fragments[title] = cached
+            order.append(cached[1])
+            build_hash.update(cached[0].encode('ascii'))
+        build_hash = build_hash.hexdigest()
+
+        # Fragments of deleted movies are dropped here, so deletes also change the build.
+        self._fragments = fragments
+        self._sources = sources
+        if build_hash == self._build_hash and os.path.exists(self.output_path):
+            return False
+        write_streamed(self.output_path, chain([head], separated(order), [tail]))
+        self._build_hash = build_hash
+        self._save_cache()
+        return True